@@ -1,18 +1,33 @@
+import os
+import time
+
 import streamlit as st
-import pandas as pd
 import streamlit.components.v1 as components
-import altair as alt
-import os
+
+from cbti import (assets, content_store, fonts, links, metrics, persistence, render, scoring, sessions, sharecards,
+                  similarity, stats)
+
+RUN_STARTED = time.perf_counter()
+metrics.RERUNS.inc()
 
 # -----------------------------------------------------------------------------
 # 1. 페이지 설정 및 스타일
 # -----------------------------------------------------------------------------
 st.set_page_config(page_title="C-BTI: 기독교 영성 유형 진단", page_icon="⛪", layout="centered")
 
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;700&display=swap');
-    html, body, [class*="css"] { font-family: 'Noto Sans KR', sans-serif; }
+# 웹폰트: 화면에 쓰는 글자만 남긴 Noto Sans KR woff2 를 static/fonts/ 에서 제공한다 (배포 전에 빌드해서 커밋).
+# 앱은 manifest 만 읽고, 서브셋이 없으면 Google Fonts 를 불러온다 (cbti/fonts.py)
+@st.cache_resource(show_spinner=False)
+def get_font_css():
+    font_faces, font_family = fonts.font_face_css(fonts.load_for_app())
+    return f"""
+    {font_faces}
+    html, body, [class*="css"] {{ font-family: {font_family}; }}
+"""
+
+with metrics.phase("css"):
+    st.markdown("""
+<style>""" + get_font_css() + """
     
     /* 헤더 스타일 */
     h1 { color: #333; font-weight: 700; letter-spacing: -1px; margin-bottom: 20px; }
@@ -36,11 +51,11 @@ st.markdown("""
     }
 
     /* 버튼 스타일 */
-    button[kind="primary"] {
+    button[kind="primary"], button[kind="primaryFormSubmit"] {
         width: 100%; padding: 0.5rem 1rem; font-weight: bold;
         background-color: #4B89DC; border: none;
     }
-    button[kind="secondary"] { width: 100%; }
+    button[kind="secondary"], button[kind="secondaryFormSubmit"] { width: 100%; }
 
     /* 결과 카드 스타일 */
     .result-card {
@@ -52,434 +67,385 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
-# 2. 데이터: 16가지 유형 정의 (TDSM 수정 완료)
+# 2. 세션 초기화 및 로직
 # -----------------------------------------------------------------------------
-TYPE_DETAILS = {
-    "TDPL": {
-        "title": "엄격한 신학자형",
-        "slogan": "오직 성경, 오직 거룩",
-        "desc": "철저한 말씀 연구와 개인의 경건을 최우선으로 여기며, 타협하지 않는 진리를 수호합니다.",
-        "people_data": [
-            {"name": "에즈라", "type": "Bible", "text": "에스라 7:10 - 여호와의 율법을 연구하여 준행하며 가르치기로 결심하였더라"},
-            {"name": "장 칼뱅", "type": "Book", "text": "저서: 《기독교 강요》 (Institutes of the Christian Religion)"},
-            {"name": "마틴 로이드 존스", "type": "Book", "text": "저서: 《산상수훈》 (Studies in the Sermon on the Mount)"},
-            {"name": "박형룡 박사", "type": "Book", "text": "저서: 《교의신학》"}
-        ]
-    },
-    "TDPM": {
-        "title": "지성적 변증가형",
-        "slogan": "믿음은 생각하는 것이다",
-        "desc": "이성과 논리를 통해 기독교 진리를 변증하며, 세상 문화 속에서 복음의 합리성을 증명합니다.",
-        "people_data": [
-            {"name": "아볼로", "type": "Bible", "text": "사도행전 18:24 - 성경에 능통한 자라"},
-            {"name": "C.S. 루이스", "type": "Book", "text": "저서: 《순전한 기독교》 (Mere Christianity)"},
-            {"name": "팀 켈러", "type": "Book", "text": "저서: 《하나님을 말하다》 (The Reason for God)"},
-            {"name": "이어령 교수", "type": "Book", "text": "저서: 《지성에서 영성으로》"}
-        ]
-    },
-    "TDSL": {
-        "title": "정의로운 개혁가형",
-        "slogan": "하나님의 법대로 세상을 개혁하라",
-        "desc": "불의와 타협하지 않는 원칙을 가지고, 사회의 도덕적 타락과 부조리에 맞서 싸웁니다.",
-        "people_data": [
-            {"name": "느헤미야", "type": "Bible", "text": "느헤미야 2:17 - 예루살렘 성을 건축하여 다시 수치를 당하지 말자"},
-            {"name": "마틴 루터", "type": "Book", "text": "저서: 《노예 의지론》 (On the Bondage of the Will)"},
-            {"name": "윌리엄 윌버포스", "type": "Quote", "text": "\"노예 무역을 끝내기 전까지 나는 결코 쉬지 않으리라.\""},
-            {"name": "안창호 선생", "type": "Quote", "text": "\"낙망은 청년의 죽음이요, 청년이 죽으면 민족이 죽는다.\""}
-        ]
-    },
-    "TDSM": {
-        "title": "신념의 순교자형", # [수정] 실용적 전략가 -> 신념의 저항가
-        "slogan": "악을 보고 침묵하는 것은 그 자체로 악이다", # [수정] 웨슬리 명언 -> 본회퍼/저항 정신
-        "desc": "불의한 시대적 상황 속에서도 타협하지 않고, 자신의 생명을 걸고 진리와 원칙을 지켜내는 저항가입니다.",
-        "people_data": [
-            {"name": "다니엘", "type": "Bible", "text": "다니엘 1:8 - 뜻을 정하여 왕의 음식으로 자기를 더럽히지 아니하고"},
-            {"name": "얀 후스", "type": "Quote", "text": "\"진리를 사랑하고, 진리를 말하고, 진리를 지켜라.\""},
-            {"name": "주기철 목사", "type": "Quote", "text": "\"일사각오(一死覺悟), 한 번 죽음으로 주님을 지킨다.\""},
-            {"name": "디트리히 본회퍼", "type": "Book", "text": "저서: 《나를 따르라》 (The Cost of Discipleship)"}
-        ]
-    },
-    "TGPL": {
-        "title": "뜨거운 경건주의자형",
-        "slogan": "기도는 하나님과 대화하는 것이다",
-        "desc": "깊은 기도를 통해 하나님과 독대하며, 영적인 순수함과 내면의 거룩함을 추구합니다.",
-        "people_data": [
-            {"name": "이사야", "type": "Bible", "text": "이사야 6:8 - 내가 여기 있나이다 나를 보내소서"},
-            {"name": "성 아우구스티누스", "type": "Book", "text": "저서: 《고백록》 (Confessions)"},
-            {"name": "블레즈 파스칼", "type": "Book", "text": "저서: 《팡세》 (Pensées)"},
-            {"name": "한경직 목사", "type": "Quote", "text": "\"템플턴상 상금은 내 것이 아닙니다. 나는 죄인입니다.\""}
-        ]
-    },
-    "TGPM": {
-        "title": "열정적 부흥사형",
-        "slogan": "우리가 보고 들은 것을 말하지 않을 수 없다",
-        "desc": "복잡한 논리보다는 직관적이고 뜨거운 열정으로 영혼을 구원하는 데 앞장섭니다.",
-        "people_data": [
-            {"name": "베드로", "type": "Bible", "text": "사도행전 4:12 - 다른 이로써는 구원을 받을 수 없나니"},
-            {"name": "D.L. 무디", "type": "Quote", "text": "\"세상은 헌신된 한 사람을 통해 하나님이 하실 일을 보게 될 것이다.\""},
-            {"name": "빌리 그래함", "type": "Quote", "text": "\"나의 집은 천국입니다. 나는 단지 여행 중일 뿐입니다.\""},
-            {"name": "김익두 목사", "type": "Quote", "text": "\"벙어리가 말하고 앉은뱅이가 일어나는 역사를 보라!\""}
-        ]
-    },
-    "TGSL": {
-        "title": "빈민가의 성자형",
-        "slogan": "가장 작은 자에게 한 것이 내게 한 것이다",
-        "desc": "가장 낮은 곳에서 소외된 이웃을 조건 없이 사랑하며, 청빈과 나눔을 실천합니다.",
-        "people_data": [
-            {"name": "도르가", "type": "Bible", "text": "사도행전 9:36 - 선행과 구제하는 일이 심히 많더니"},
-            {"name": "성 프란치스코", "type": "Quote", "text": "\"주여, 나를 평화의 도구로 써 주소서.\""},
-            {"name": "윌리엄 부스", "type": "Quote", "text": "\"한국은 국, 비누, 구원(Soup, Soap, Salvation)이 필요하다.\""},
-            {"name": "장기려 박사", "type": "Quote", "text": "\"돈이 없어서 치료받지 못하는 환자는 이 땅에 없어야 한다.\""}
-        ]
-    },
-    "TGSM": {
-        "title": "사랑의 혁명가형",
-        "slogan": "나를 따르려거든 자기를 부인하라",
-        "desc": "민족과 공동체를 위해 자신의 모든 기득권을 내려놓고 희생하며 앞장서는 리더입니다.",
-        "people_data": [
-            {"name": "모세", "type": "Bible", "text": "출애굽기 32:32 - 내 이름을 생명책에서 지워버려 주옵소서"},
-            {"name": "에이브러햄 링컨", "type": "Quote", "text": "\"하나님이 우리 편인가보다, 우리가 하나님 편인가를 물으라.\""},
-            {"name": "마틴 루터 킹", "type": "Quote", "text": "\"나에게는 꿈이 있습니다 (I have a dream).\""},
-            {"name": "조만식 선생", "type": "Quote", "text": "\"나는 3천만 동포와 함께 죽겠노라.\""}
-        ]
-    },
-    "CDPL": {
-        "title": "고독한 수도사형",
-        "slogan": "침묵은 영혼의 호흡이다",
-        "desc": "세상의 소음에서 벗어나 깊은 침묵과 묵상 속에서 하나님의 세미한 음성을 듣습니다.",
-        "people_data": [
-            {"name": "시므온", "type": "Bible", "text": "누가복음 2:30 - 내 눈이 주의 구원을 보았사오니"},
-            {"name": "토마스 아 켐피스", "type": "Book", "text": "저서: 《그리스도를 본받아》 (The Imitation of Christ)"},
-            {"name": "토마스 머튼", "type": "Book", "text": "저서: 《칠층산》 (The Seven Storey Mountain)"},
-            {"name": "헨리 나우웬", "type": "Book", "text": "저서: 《상처 입은 치유자》 (The Wounded Healer)"}
-        ]
-    },
-    "CDPM": {
-        "title": "문화적 사색가형",
-        "slogan": "신앙은 궁극적 관심이다",
-        "desc": "철학, 예술, 인문학을 통해 성경을 깊이 있게 해석하며 현대인에게 진리를 재해석합니다.",
-        "people_data": [
-            {"name": "솔로몬", "type": "Bible", "text": "전도서 1:2 - 헛되고 헛되니 모든 것이 헛되도다"},
-            {"name": "쇠렌 키르케고르", "type": "Book", "text": "저서: 《공포와 전율》 (Fear and Trembling)"},
-            {"name": "폴 틸리히", "type": "Book", "text": "저서: 《존재의 용기》 (The Courage to Be)"},
-            {"name": "프란시스 쉐퍼", "type": "Book", "text": "저서: 《그러면 우리는 어떻게 살 것인가》"}
-        ]
-    },
-    "CDSL": {
-        "title": "현실적 예언자형",
-        "slogan": "정의를 물 같이 흐르게 하라",
-        "desc": "성경적 세계관으로 시대를 날카롭게 분석하고, 기술 사회와 권력의 문제를 비판합니다.",
-        "people_data": [
-            {"name": "아모스", "type": "Bible", "text": "아모스 5:24 - 오직 정의를 물 같이, 공의를 마르지 않는 강 같이"},
-            {"name": "라인홀드 니버", "type": "Book", "text": "저서: 《도덕적 인간과 비도덕적 사회》"},
-            {"name": "자크 엘륄", "type": "Book", "text": "저서: 《기술 사회》 (The Technological Society)"},
-            {"name": "함석헌 선생", "type": "Book", "text": "저서: 《뜻으로 본 한국역사》"}
-        ]
-    },
-    "CDSM": {
-        "title": "사회적 실천가형",
-        "slogan": "모든 영역에 그리스도의 주권을",
-        "desc": "체계적인 훈련과 시스템을 구축하여 정치, 경제, 교육 등 사회 각 영역을 변혁합니다.",
-        "people_data": [
-            {"name": "사도 바울", "type": "Bible", "text": "사도행전 19:10 - 두란노 서원에서 날마다 강론하니라"},
-            {"name": "아브라함 카이퍼", "type": "Book", "text": "저서: 《칼빈주의 강연》 (Lectures on Calvinism)"},
-            {"name": "존 스토트", "type": "Book", "text": "저서: 《현대 사회와 기독교적 소명》"},
-            {"name": "로렌 커닝햄", "type": "Book", "text": "저서: 《하나님, 정말 당신이십니까?》"}
-        ]
-    },
-    "CGPL": {
-        "title": "자연 속 신비가형",
-        "slogan": "하늘이 하나님의 영광을 노래하고",
-        "desc": "자연 만물과 일상의 아름다움 속에서 하나님의 신비를 발견하며 시적으로 노래합니다.",
-        "people_data": [
-            {"name": "아삽", "type": "Bible", "text": "시편 73:25 - 하늘에서는 주 외에 누가 내게 있으리요"},
-            {"name": "성 패트릭", "type": "Quote", "text": "\"그리스도는 내 앞에도, 뒤에도, 안에도 계십니다.\""},
-            {"name": "로제 수사", "type": "Quote", "text": "\"오 주여, 우리의 어둠을 밝히소서.\""},
-            {"name": "이현주 목사", "type": "Book", "text": "저서: 《관옥 이현주 산문집》"}
-        ]
-    },
-    "CGPM": {
-        "title": "자유 보헤미안형",
-        "slogan": "한 알의 모래에서 천국을 본다",
-        "desc": "형식에 얽매이지 않는 자유로운 영혼으로, 예술적 상상력을 통해 하나님을 표현합니다.",
-        "people_data": [
-            {"name": "막달라 마리아", "type": "Bible", "text": "요한복음 20:18 - 내가 주를 보았다 하고"},
-            {"name": "단테 알리기에리", "type": "Book", "text": "저서: 《신곡》 (The Divine Comedy)"},
-            {"name": "윌리엄 블레이크", "type": "Book", "text": "저서: 《순수의 노래와 경험의 노래》"},
-            {"name": "윤동주 시인", "type": "Book", "text": "저서: 《하늘과 바람과 별과 시》"}
-        ]
-    },
-    "CGSL": {
-        "title": "저항하는 평화주의자형",
-        "slogan": "평화가 곧 길이다",
-        "desc": "폭력과 혐오가 가득한 세상에서 기도와 비폭력, 화해의 메시지로 평화를 심습니다.",
-        "people_data": [
-            {"name": "예레미야", "type": "Bible", "text": "예레미야애가 3:49 - 내 눈에 흐르는 눈물이 그치지 아니하고"},
-            {"name": "레오 톨스토이", "type": "Book", "text": "저서: 《하나님의 나라는 너희 안에 있다》"},
-            {"name": "데스몬드 투투", "type": "Book", "text": "저서: 《용서 없이 미래 없다》"},
-            {"name": "스탠리 하우어워스", "type": "Book", "text": "저서: 《나그네 된 백성》 (Resident Aliens)"}
-        ]
-    },
-    "CGSM": {
-        "title": "꿈꾸는 혁명가형",
-        "slogan": "행함이 없는 믿음은 죽은 것이다",
-        "desc": "불의를 참지 못하는 거룩한 분노로, 억압받는 자들의 해방을 위해 온몸을 던집니다.",
-        "people_data": [
-            {"name": "야고보", "type": "Bible", "text": "야고보서 2:17 - 행함이 없는 믿음은 그 자체가 죽은 것이라"},
-            {"name": "오스카 로메로", "type": "Quote", "text": "\"정의는 억압받는 자들의 편이다.\""},
-            {"name": "구스타보 구티에레즈", "type": "Book", "text": "저서: 《해방신학》 (A Theology of Liberation)"},
-            {"name": "전태일 열사", "type": "Quote", "text": "\"내 죽음을 헛되이 하지 말라. 우리는 기계가 아니다.\""}
-        ]
-    }
-}
+# 질문지(data/content.json)는 버전(내용 해시)별로 한 번 컴파일해서 모든 세션이 공유한다.
+# 파일을 고치면 재시작 없이 백그라운드에서 새 버전으로 바뀌고, 진행 중인 세션은 시작한 버전을 계속 쓴다.
+@st.cache_resource(show_spinner=False)
+def get_content_store():
+    return content_store.default_store()
 
-# -----------------------------------------------------------------------------
-# 3. 데이터: 질문지 (총 45문항 - 100% 반영)
-# -----------------------------------------------------------------------------
-questions_data = [
-    # 🏛️ Part 1. 신학 (Theology) - 15문항
-    {"text": "성경에 기록된 기적(홍해 가름, 오병이어 등)은 과학적으로 설명되지 않아도 문자 그대로 일어난 역사적 사실이다.", "part": "Theology", "reverse": True},
-    {"text": "술, 담배 문제는 구원이나 신앙의 본질과 무관하므로, 무조건 금지하기보다 개인의 양심과 자율에 맡겨야 한다.", "part": "Theology", "reverse": False},
-    {"text": "여성이 목사 안수를 받고 강단에서 설교하는 것은 성경적 창조 질서에 어긋난다고 생각한다.", "part": "Theology", "reverse": True},
-    {"text": "동성애는 인권 문제가 아니라 성경이 금지하는 치유받아야 할 죄의 문제다.", "part": "Theology", "reverse": True},
-    {"text": "예수 천국, 불신 지옥 구호는 기독교 진리를 너무 단순화시킨 것이라 거부감이 든다.", "part": "Theology", "reverse": False},
-    {"text": "진화론은 성경의 창조 신앙과 양립하기 어려우므로, 기독교인이라면 이를 무비판적으로 수용해서는 안 된다.", "part": "Theology", "reverse": True},
-    {"text": "목사님의 설교라도 나의 이성과 상식에 비추어 납득이 가지 않으면 무조건 믿기보다 비판적으로 수용해야 한다.", "part": "Theology", "reverse": False},
-    {"text": "교회는 세상 문화가 침투하지 못하도록 거룩하게 구별된 방파제 역할을 해야 한다.", "part": "Theology", "reverse": True},
-    {"text": "지진이나 전염병 같은 대형 재난을 특정 죄에 대한 하나님의 심판으로 해석하는 것은 위험하다고 생각한다.", "part": "Theology", "reverse": False},
-    {"text": "타종교에도 구원의 가능성이 있거나 배울 점이 있다고 인정하는 것은 위험하다.", "part": "Theology", "reverse": True},
-    {"text": "설교 시간에 인문학, 철학, 영화 이야기 등 세상의 학문이 자주 인용되는 것이 자연스럽고 유익하다.", "part": "Theology", "reverse": False},
-    {"text": "정신의학적 상담과 치료보다 기도가 우울증 같은 마음의 병을 해결하는 근본 열쇠라고 믿는다.", "part": "Theology", "reverse": True},
-    {"text": "사랑의 하나님이 불신자와 다른 종교를 믿는 사람들을 지옥에 던지신다는 교리에 감정적 어려움을 느낀다.", "part": "Theology", "reverse": False},
-    {"text": "사도신경이나 주기도문 형식을 생략하는 것은 예배의 거룩함을 해친다.", "part": "Theology", "reverse": True},
-    {"text": "하나님의 공의와 심판을 강조하는 설교보다, 조건 없는 사랑과 용서를 강조하는 설교가 더 복음적이다.", "part": "Theology", "reverse": False},
-
-    # 🔥 Part 2. 동력 (Drive) - 10문항
-    {"text": "다 같이 주여!를 크게 외치고 통성 기도할 때 영적인 시원함을 느낀다.", "part": "Drive", "reverse": False},
-    {"text": "신앙생활의 본질은 현실의 복을 누리는 것보다, 자기를 부인하고 십자가의 길(고난과 절제)을 걷는 훈련이다.", "part": "Drive", "reverse": True},
-    {"text": "목사님이 논리적이고 치밀한 분보다는, 조금 투박하더라도 강력한 영적 카리스마와 열정으로 선포하시는 분이 좋다.", "part": "Drive", "reverse": False},
-    {"text": "뜨거운 예배 같은 일시적이고 감정적인 체험보다는, 말씀을 체계적으로 깊이 있게 공부하고 삶에 적용하는 제자 훈련이 신앙의 뼈대라고 생각한다.", "part": "Drive", "reverse": True},
-    {"text": "목사님의 설교가 나를 꾸짖는 내용보다는, 지친 마음을 따뜻하게 위로해 주시는 내용이면 좋겠다.", "part": "Drive", "reverse": False},
-    {"text": "신앙 성장은 종교적인 체험보다는, 나의 인격이 다듬어지고 일상의 삶이 거룩해지는 것(성화)에서 증명된다.", "part": "Drive", "reverse": True},
-    {"text": "복잡한 신학적 지식이나 논리보다는, 단순하더라도 하나님을 향한 순수한 열정과 가슴 뜨거운 은혜가 더 중요하다.", "part": "Drive", "reverse": False},
-    {"text": "예배는 감정을 표출하기보다, 빈틈없이 진행되는 엄숙하고 질서 있는 분위기 속에서 경건함을 유지해야 한다.", "part": "Drive", "reverse": True},
-    {"text": "방언, 신유(병 고침) 같은 성령의 초자연적인 은사는 오늘날에도 동일하게 나타나며, 이는 성령이 일하시는 강력한 증거다.", "part": "Drive", "reverse": False},
-    {"text": "예화가 많은 설교보다는, 성경 본문의 원어적 의미와 배경을 논리적으로 풀어주는 강해 설교를 선호한다.", "part": "Drive", "reverse": True},
-
-    # 🌍 Part 3. 사회 (Society) - 10문항
-    {"text": "교회의 최우선 사명은 사회 개혁보다 한 영혼을 전도하여 구원받게 하는 것이다.", "part": "Society", "reverse": True},
-    {"text": "성경이 '위에 있는 권세들에게 복종하라'고 했으므로, 정권이 마음에 들지 않더라도 일단 선거로 뽑혔다면 믿고 순응해야 한다.", "part": "Society", "reverse": True},
-    {"text": "개인의 죄를 회개하는 것보다, 가난과 차별을 만들어내는 사회의 구조적 악과 모순에 관심을 갖는 것이 더 중요하다.", "part": "Society", "reverse": False},
-    {"text": "거리에서 시위나 집회를 하는 것보다는, 열심히 공부하고 자기계발을 통해 사회적 영향력을 갖추는 것이 하나님께 더 영광이 된다.", "part": "Society", "reverse": True},
-    {"text": "사회적 현장(집회, 시위 등)에 기독교인이 깃발을 들고 참여하는 것은 자연스러운 일이다.", "part": "Society", "reverse": False},
-    {"text": "예수님의 사역은 인류 구원과 죄의 대속만큼이나 가난하고 소외된 사람들을 해방하는 데 있었다.", "part": "Society", "reverse": False},
-    {"text": "강단에서 특정 정당을 지지하거나 민감한 정치적 이슈를 언급하는 것은 교회의 본질을 흐리는 일이다.", "part": "Society", "reverse": True},
-    {"text": "진정한 이웃 사랑은 단순한 기부나 봉사를 넘어, 억울하고 소외된 자들의 편에 서서 목소리를 내주는 것이다.", "part": "Society", "reverse": False},
-    {"text": "포괄적 차별금지법 제정을 반대하는 것은 교회가 거룩함을 지키기 위해 반드시 해야 할 일이다.", "part": "Society", "reverse": True},
-    {"text": "세상과 구별됨은 교회 안에 머무는 것이 아니라, 세상 속으로 들어가 정의를 실천하는 것이다.", "part": "Society", "reverse": False},
-
-    # 🎸 Part 4. 문화 (Culture) - 10문항
-    {"text": "찬양 시간에 드럼이나 일렉기타 소리가 너무 크면 경건함이 깨진다고 느낀다.", "part": "Culture", "reverse": True},
-    {"text": "교독문이나 송영 같은 전통적 형식보다는, 찬양과 기도, 설교에만 집중하는 단순한 예배 순서가 더 편하다.", "part": "Culture", "reverse": False},
-    {"text": "교회 건물은 여건상 빌려 쓸 수도 있겠지만, 그래도 언젠가는 하나님께 드려진 구별된 성전이 반드시 있어야 한다.", "part": "Culture", "reverse": True},
-    {"text": "주일 성수도 여행이나 출장, 가족행사 등의 부득이한 사유가 있다면 가끔은 건너뛸 수 있다.", "part": "Culture", "reverse": False},
-    {"text": "교회 안에서 서로를 부를 때 형제, 자매님보다 장로, 권사, 집사님 같은 직분으로 부르는 것이 질서 있어 보인다.", "part": "Culture", "reverse": True},
-    {"text": "목사님이 정장 대신 청바지나 티셔츠 같은 편안한 복장으로 설교하는 것도 괜찮다.", "part": "Culture", "reverse": False},
-    {"text": "아무리 시대가 변해도 주일 예배는 온라인보다는 내가 등록한 교회의 현장에 직접 가서 드리는 것이 원칙이다.", "part": "Culture", "reverse": True},
-    {"text": "사도신경이나 주기도문을 매주 암송하기보다, 상황에 맞춰 생략하거나 찬양으로 대체해도 좋다.", "part": "Culture", "reverse": False},
-    {"text": "본당(예배당)은 거룩한 곳이므로, 평일에 대중 공연장이나 다른 용도로 빌려주는 건 조심스럽다.", "part": "Culture", "reverse": True},
-    {"text": "불신자들도 거부감 없이 올 수 있는 카페 같은 분위기의 편안하고 열린 예배를 선호한다.", "part": "Culture", "reverse": False},
-]
-
-OPTIONS = ["매우 그렇다", "조금 그렇다", "조금 아니다", "매우 아니다"]
-SCORE_MAP = {"매우 그렇다": 10, "조금 그렇다": 6.7, "조금 아니다": 3.3, "매우 아니다": 0}
+def get_questionnaire(content_version):
+    """버전별 캐시가 쓰는 질문지. 그 버전을 찾을 수 없으면(아카이브 정리, 다른 호스트의 버전) 최신 버전"""
+    return get_content_store().get(content_version) or get_content_store().current()
 
-# -----------------------------------------------------------------------------
-# 4. 세션 초기화 및 로직
-# -----------------------------------------------------------------------------
 if "step" not in st.session_state:
     st.session_state.step = 1
-if "answers" not in st.session_state:
-    st.session_state.answers = {}
+if "block" not in st.session_state:
+    st.session_state.block = 0  # 적응형 진행에서 파트 안의 페이지 (0부터)
+    st.session_state.last_block = {}  # 파트별로 마지막에 본 페이지 (이전 버튼용)
+if "reruns" not in st.session_state:
+    st.session_state.reruns = 0
+st.session_state.reruns += 1
+
+# 진행 상태 저장소 (cbti/sessions.py): 페이지를 넘길 때마다 한 번 저장하고, URL 의 ?t=<재개 토큰> 으로
+# 재시작 후나 다른 워커에서도 이어서 진행한다 (sticky session 불필요)
+#   [sessions]
+#   store = "sqlite"            # 또는 "memory"(기본, 프로세스 내) / "redis" (url = "redis://...")
+#   ttl = 604800                # 마지막 저장 후 이 시간(초)이 지나면 버려진 세션으로 보고 지움
+@st.cache_resource(show_spinner=False)
+def get_session_store():
+    try:
+        config = dict(st.secrets.get("sessions", {}))
+    except FileNotFoundError:
+        config = {}
+    try:
+        return sessions.make_store(config)
+    except Exception:
+        sessions.logger.exception("session store %r unavailable, keeping progress in memory", config.get("store"))
+        return sessions.MemoryStore()
+
+SESSION_KEYS = ("content_version", "step", "block", "last_block", "answers")
+
+def save_progress():
+    """현재 진행 상태를 저장소에 쓰고 URL 에 재개 토큰을 단다 (저장소 오류는 진행을 막지 않음)"""
+    token = st.session_state.resume_token or sessions.new_token()
+    try:
+        get_session_store().save(token, sessions.dump_state(st.session_state, SESSION_KEYS))
+    except Exception:
+        sessions.logger.exception("could not save session progress")
+        return
+    st.session_state.resume_token = token
+    st.query_params["t"] = token
+
+def forget_progress():
+    if st.session_state.resume_token:
+        try:
+            get_session_store().delete(st.session_state.resume_token)
+        except Exception:
+            sessions.logger.exception("could not delete session progress")
+        st.session_state.resume_token = None
+
+if "resume_token" not in st.session_state:
+    st.session_state.resume_token = None
+    token = st.query_params.get("t")
+    try:
+        raw = get_session_store().load(token) if token and len(token) <= 64 else None
+    except Exception:
+        sessions.logger.exception("could not load session progress")
+        raw = None
+    saved = sessions.load_state(raw) if raw else {}
+    if "answers" in saved:
+        for key in SESSION_KEYS:
+            if key in saved:
+                st.session_state[key] = saved[key]
+        st.session_state.resume_token = token
+
+# 세션은 시작할 때의 콘텐츠 버전에 고정된다 (답안 인덱스가 그 버전의 문항 순서를 가리키므로)
+if "content_version" not in st.session_state:
+    st.session_state.content_version = get_content_store().current().version
+QN = get_content_store().get(st.session_state.content_version)
+if QN is None:  # 버전을 찾을 수 없으면(다른 호스트에서 만든 버전 등) 최신 버전으로 처음부터
+    QN = get_content_store().current()
+    st.session_state.content_version = QN.version
+    st.session_state.pop("answers", None)
+if "answers" not in st.session_state or len(st.session_state.answers) != QN.n_questions:
+    # 답안은 문항당 1바이트(선택지 인덱스)의 고정 길이 배열. 점수/역채점/파트는 공용 질문표에서 조회
+    st.session_state.answers = scoring.new_answer_sheet(QN.n_questions)
+    st.session_state.step, st.session_state.block, st.session_state.last_block = 1, 0, {}
+TYPE_DETAILS = QN.type_details
+N_STEPS = len(QN.parts)
 
-# 스크롤 초기화 함수
+# 계측 값 노출 (cbti/metrics.py): 포트를 설정하면 /metrics (Prometheus), /metrics.json 을 제공
+#   [metrics]
+#   port = 9108                 # 또는 환경 변수 CBTI_METRICS_PORT
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    try:
+        port = st.secrets.get("metrics", {}).get("port")
+    except FileNotFoundError:
+        port = None
+    port = port or os.environ.get("CBTI_METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return metrics.serve(int(port))
+    except OSError:
+        metrics.logger.exception("could not start metrics server on port %s", port)
+        return None
+
+start_metrics_server()
+
+# 적응형 진행: 파트를 block_size 문항씩 나눠 보여주고, 남은 문항을 어떻게 답해도 그 축의 글자가
+# 바뀌지 않으면(Scorer.decided) 파트의 나머지 문항을 건너뛴다. 정확한 점수가 필요하면 끈다 (기본: 끔)
+#   [questionnaire]
+#   adaptive = true             # 또는 환경 변수 CBTI_ADAPTIVE=1
+#   block_size = 5
+def get_block_size():
+    try:
+        config = dict(st.secrets.get("questionnaire", {}))
+    except FileNotFoundError:
+        config = {}
+    adaptive = config.get("adaptive", os.environ.get("CBTI_ADAPTIVE", "") in ("1", "true"))
+    return int(config.get("block_size", 5)) if adaptive else None
+
+BLOCK_SIZE = get_block_size()
+
+# 스크롤 초기화 함수 (화면이 바뀐 첫 렌더링에서만 iframe 생성)
 def scroll_to_top():
+    page = (st.session_state.step, st.session_state.block)
+    if st.session_state.get("scrolled_page") == page:
+        return
+    st.session_state.scrolled_page = page
     js = '''<script>window.scrollTo(0,0);</script>'''
     components.html(js, height=0)
 
+# 롤모델 이미지: 16개 유형의 존재 여부를 한 번만 확인하고, 미리 빌드해 커밋한 썸네일(static/images/)을
+# URL 로 보여준다 (python -m cbti.assets). 콘텐츠 버전별로 이름(alt)이 다를 수 있어 버전별로 만든다.
+@st.cache_resource(show_spinner=False, max_entries=content_store.KEEP_VERSIONS)
+def get_role_model_images(content_version):
+    type_details = get_questionnaire(content_version).type_details
+    images = assets.role_model_images(type_details.keys())
+    return {
+        code: [assets.to_img_tag(*image, alt=person["name"]) if image else None
+               for image, person in zip(row, type_details[code]["people_data"])]
+        for code, row in images.items()
+    }
+
+# 완료된 결과 저장: 큐에 넣기만 하고, Sheets 쓰기는 백그라운드 스레드가 모아서 처리 (.streamlit/secrets.toml)
+#   [results]
+#   sink = "gsheets"            # 또는 "sqlite" / "jsonl" (설정이 없으면 data/results.sqlite3)
+#   spreadsheet = "<시트 key 또는 URL>"
+#   [gcp_service_account]       # 서비스 계정 JSON
+@st.cache_resource(show_spinner=False)
+def get_result_writer():
+    try:
+        config = dict(st.secrets.get("results", {}))
+        if config.get("sink") == "gsheets" and "gcp_service_account" in st.secrets:
+            config["service_account"] = dict(st.secrets["gcp_service_account"])
+    except FileNotFoundError:
+        config = {}
+    try:
+        sink = persistence.make_sink(config)
+    except Exception:
+        persistence.logger.exception("result sink %r unavailable, using local SQLite", config.get("sink"))
+        sink = persistence.SQLiteSink()
+    return persistence.WriteBehindWriter(sink)
+
+# 결과 화면 조각(카드 HTML, 롤모델 카드, 차트 스펙)의 LRU 캐시. 공유 링크로 들어오는 16개 유형 페이지는 미리 만든다.
+@st.cache_resource(show_spinner=False, max_entries=content_store.KEEP_VERSIONS)
+def get_result_renderer(content_version):
+    renderer = render.ResultRenderer(get_questionnaire(content_version).type_details,
+                                     get_role_model_images(content_version))
+    renderer.warm()
+    return renderer
+
+# 저장소에 커밋된 유형별 공유 카드 JPEG (python -m cbti.sharecards). 이 버전의 문구와 다른 카드는 버튼을 숨긴다.
+@st.cache_resource(show_spinner=False, max_entries=content_store.KEEP_VERSIONS)
+def get_share_cards(content_version):
+    return sharecards.load_cards(get_questionnaire(content_version).type_details)
+
+def show_result_view(view):
+    """결과 카드 + 롤모델 카드 (내 결과와 공유 링크 화면 공통)"""
+    st.markdown(view.card_html, unsafe_allow_html=True)
+    
+    st.markdown("### 👥 이 유형의 롤모델 (Role Models)")
+    st.caption("※ 아이콘 범례: 📖 성경구절 | 📚 대표저서 | 💬 명언")
+    
+    with metrics.phase("images"):
+        for col, person_html in zip(st.columns(4), view.people_html):
+            col.markdown(person_html, unsafe_allow_html=True)
+
+    st.divider()
+
+# 전체 응답자 통계: 조회는 상수 시간, 모든 세션이 공유 (data/population_stats.json 에 주기적으로 합쳐 저장)
+@st.cache_resource(show_spinner=False)
+def get_population_stats():
+    return stats.PopulationStats(QN.scorer.code_table, QN.scorer.parts, path=stats.DEFAULT_PATH)
+
+# 16개 유형 원형과의 거리/순위 (원형 행렬은 프로세스당 한 번, cbti/similarity.py)
+@st.cache_resource(show_spinner=False)
+def get_type_similarity():
+    return similarity.TypeSimilarity(QN.scorer.code_table)
+
 # -----------------------------------------------------------------------------
-# 5. UI: 질문 진행
+# 3. UI: 질문 진행
 # -----------------------------------------------------------------------------
-AXIS_NAMES = ["Theology (신학)", "Drive (동력)", "Society (사회)", "Culture (문화)"]
-PARTS_KEY = ["Theology", "Drive", "Society", "Culture"]
+OPTION_INDICES = list(range(len(QN.options)))  # 라디오 값은 선택지 인덱스 (표시는 OPTIONS 라벨)
 
-if st.session_state.step <= 4:
-    scroll_to_top()
-    current_part = PARTS_KEY[st.session_state.step - 1]
-    
-    st.markdown(f"### Step {st.session_state.step}/4 : {AXIS_NAMES[st.session_state.step - 1]}")
-    st.progress((st.session_state.step - 1) / 4)
+# 공유 링크(?type=TDPL&s=...)로 들어온 새 세션은 설문 없이 바로 결과를 보여준다 (cbti/links.py)
+# 결과를 낸 본인이 새로고침한 경우(?mine=1)는 친구용 문구 대신 내 결과로 보여 준다
+shared = links.parse_result_params(st.query_params, TYPE_DETAILS) if st.session_state.step == 1 else None
+
+if shared:
+    shared_code, shared_scores = shared
+    own_result = links.is_owner(st.query_params)
+    view = get_result_renderer(QN.version).render(shared_code, shared_scores)
+    if own_result:
+        st.success("📌 내 결과예요. 아래 링크로 친구에게 공유해 보세요!")
+    else:
+        metrics.SHARED_VIEWS.inc(res_code=shared_code)
+        st.info("💌 친구가 공유한 결과예요. 나의 유형도 확인해 보세요!")
+    show_result_view(view)
     
-    current_q_list = [q for q in questions_data if q["part"] == current_part]
+    if view.chart_spec is not None:
+        st.subheader("📊 나의 성향 분석" if own_result else "📊 성향 분석")
+        with metrics.phase("chart"):
+            st.vega_lite_chart(view.chart_spec, use_container_width=True)
     
-    # 문항 번호 계산 (이전 챕터 문항 수 합산)
-    start_idx = 0
-    for i in range(st.session_state.step - 1):
-        prev_part = PARTS_KEY[i]
-        start_idx += len([q for q in questions_data if q["part"] == prev_part])
+    if own_result:
+        share_params = {k: v for k, v in st.query_params.to_dict().items() if k != links.OWNER_PARAM}
+        st.code(links.result_url(share_params), language="none")
+    if st.button("🔄 처음부터 다시 하기" if own_result else "🙋 나도 테스트 하기", type="primary"):
+        st.query_params.clear()
+        st.rerun()
+
+elif st.session_state.step <= N_STEPS:
+    scroll_to_top()
+    part = QN.part(st.session_state.step)
+    block, n_blocks = st.session_state.block, part.n_blocks(BLOCK_SIZE)
     
-    all_answered = True 
+    page_label = f" ({block + 1}/{n_blocks})" if n_blocks > 1 else ""
+    st.markdown(f"### Step {st.session_state.step}/{N_STEPS} : {part.axis_name}{page_label}")
+    st.progress((st.session_state.step - 1 + block / n_blocks) / N_STEPS)
     
-    for idx, q in enumerate(current_q_list):
-        q_real_idx = start_idx + idx + 1
-        st.markdown(f"<div class='question-text'>Q{q_real_idx}. {q['text']}</div>", unsafe_allow_html=True)
-        
-        key_name = f"q_{current_part}_{idx}"
-        
-        # [중요] 초기화 문제 해결: answers에 저장된 값이 없으면 None (선택 안됨 상태)
-        saved_label = st.session_state.answers.get(key_name, {}).get("label")
-        saved_index = OPTIONS.index(saved_label) if saved_label in OPTIONS else None
-        
-        val = st.radio(label=f"Q{q_real_idx}", options=OPTIONS, key=key_name, 
-                       index=saved_index, label_visibility="collapsed")
+    # 한 페이지(파트 전체 또는 적응형 블록)를 하나의 폼으로: 라디오를 눌러도 rerun 하지 않고, 이전/다음을 누를 때 한 번에 제출
+    with st.form(f"step_{st.session_state.step}_{block}", border=False):
+        all_answered = True 
         
-        if val:
-            st.session_state.answers[key_name] = {
-                "score": SCORE_MAP[val],
-                "reverse": q["reverse"],
-                "part": q["part"],
-                "label": val # 라벨 저장 (상태 유지를 위해 필수)
-            }
-        else:
-            all_answered = False 
+        with metrics.phase("questions", step=st.session_state.step):
+            for q_idx, q_no, key_name, text in part.block_rows(block, BLOCK_SIZE):
+                st.markdown(f"<div class='question-text'>Q{q_no}. {text}</div>", unsafe_allow_html=True)
+            
+                # [중요] 초기화 문제 해결: answers에 저장된 값이 없으면 None (선택 안됨 상태)
+                saved = st.session_state.answers[q_idx]
+                saved_index = saved if saved != scoring.NO_ANSWER else None
             
-        st.markdown("---")
+                val = st.radio(label=f"Q{q_no}", options=OPTION_INDICES, format_func=QN.options.__getitem__,
+                               key=key_name, index=saved_index, label_visibility="collapsed")
+            
+                if val is not None:
+                    st.session_state.answers[q_idx] = val # 선택지 인덱스만 저장 (이전으로 돌아가도 유지)
+                else:
+                    all_answered = False 
+                
+                st.markdown("---")
+
+        col1, col2 = st.columns(2)
+        prev_clicked = (st.session_state.step > 1 or block > 0) and col1.form_submit_button("⬅️ 이전")
+        next_btn_text = "결과 보기 🚀" if st.session_state.step == N_STEPS and block == n_blocks - 1 else "다음 ➡️"
+        next_clicked = col2.form_submit_button(next_btn_text, type="primary")
 
-    col1, col2 = st.columns(2)
-    if st.session_state.step > 1:
-        if col1.button("⬅️ 이전"):
+    if prev_clicked:
+        metrics.STEP_TRANSITIONS.inc(step=st.session_state.step, direction="prev")
+        if block > 0:
+            st.session_state.block -= 1
+        else:
             st.session_state.step -= 1
-            st.rerun()
-    
-    next_btn_text = "결과 보기 🚀" if st.session_state.step == 4 else "다음 ➡️"
-    if col2.button(next_btn_text, type="primary"):
+            st.session_state.block = st.session_state.last_block.get(st.session_state.step, 0)
+        save_progress()
+        st.rerun()
+    if next_clicked:
         if not all_answered:
             st.warning("⚠️ 모든 질문에 답변해주세요!")
+            metrics.UNANSWERED_WARNINGS.inc(step=st.session_state.step)
         else:
-            st.session_state.step += 1
+            metrics.STEP_TRANSITIONS.inc(step=st.session_state.step, direction="next")
+            st.session_state.last_block[st.session_state.step] = block
+            if block + 1 < n_blocks and not QN.scorer.decided(st.session_state.answers)[0, st.session_state.step - 1]:
+                st.session_state.block += 1
+            else:
+                st.session_state.step += 1
+                st.session_state.block = 0
+            save_progress()
             st.rerun()
 
 # -----------------------------------------------------------------------------
-# 6. 결과 화면
+# 4. 결과 화면
 # -----------------------------------------------------------------------------
 else:
     scroll_to_top()
     
-    # 1. 점수 계산
-    scores = {k: 0 for k in PARTS_KEY}
-    counts = {k: 0 for k in PARTS_KEY}
+    # 1. 점수 계산 및 유형 도출 (cbti/scoring.py)
+    with metrics.phase("scoring"):
+        avg, res_code = QN.scorer.score_one(st.session_state.answers)
     
-    for ans in st.session_state.answers.values():
-        s = ans["score"]
-        if ans["reverse"]: s = 10 - s
-        scores[ans["part"]] += s
-        counts[ans["part"]] += 1
-        
-    avg = {k: (scores[k] / counts[k] if counts[k] > 0 else 0) for k in PARTS_KEY}
-    
-    # 2. 유형 도출
-    res_code = ""
-    res_code += "T" if avg["Theology"] <= 5 else "C"
-    res_code += "D" if avg["Drive"] <= 5 else "G"
-    res_code += "P" if avg["Society"] <= 5 else "S"
-    res_code += "L" if avg["Culture"] <= 5 else "M"
+    # 결과 저장 (세션당 한 번, 렌더링은 저장을 기다리지 않음)
+    if not st.session_state.get("result_saved"):
+        get_result_writer().submit(persistence.make_record(st.session_state.answers, avg, res_code, QN.scorer.parts))
+        get_population_stats().record(res_code, avg)
+        metrics.COMPLETIONS.inc(res_code=res_code)
+        metrics.SESSION_RERUNS.observe(st.session_state.reruns)
+        for part in QN.parts:
+            skipped = st.session_state.answers[part.start:part.stop].count(scoring.NO_ANSWER)
+            if skipped:
+                metrics.SKIPPED_QUESTIONS.inc(skipped, part=part.key)
+        st.session_state.result_saved = True
+        forget_progress()  # 끝난 세션은 재개할 필요가 없다 (주소창은 아래에서 공유 링크로 바뀜)
     
-    info = TYPE_DETAILS.get(res_code, TYPE_DETAILS["TDPL"])
+    population = get_population_stats()
+    show_population = population.total >= stats.MIN_POPULATION
+    pct = population.percentiles(avg)
     
-    # 3. 결과 표시
-    st.markdown(f"""
-    <div class="result-card">
-        <h2 style='margin-bottom:0px; color:#666; font-size:1.2em;'>당신의 영적 유형은</h2>
-        <h1 style="color: #4B89DC; font-size: 3.5em; margin-top:5px; margin-bottom:10px;">{res_code}</h1>
-        <h3 style='margin-top:0px; font-weight:700; font-size:1.8em;'>{info['title']}</h3>
-        <div style="margin: 20px 0;">
-            <span style="font-size: 1.1em; font-weight: bold; color: #555; background-color:#f1f3f5; padding:8px 20px; border-radius:30px;">
-                ❝ {info['slogan']} ❞
-            </span>
-        </div>
-        <hr style='border: 0; height: 1px; background: #e0e0e0; margin: 20px 0;'>
-        <p style='font-size:1.1em; line-height:1.7; color:#333;'>{info['desc']}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("### 👥 이 유형의 롤모델 (Role Models)")
-    st.caption("※ 아이콘 범례: 📖 성경구절 | 📚 대표저서 | 💬 명언")
+    # 주소창을 결과 링크로 바꿔 새로고침해도 결과가 남도록 한다 (본인 표시를 붙이고, 공유는 아래 링크로)
+    share_params = links.result_params(res_code, avg, QN.scorer.parts)
+    st.query_params.from_dict(links.owner_params(share_params))
     
-    cols = st.columns(4)
-    for i, person in enumerate(info['people_data']):
-        img_path = f"images/{res_code}_{i+1}.jpg"
-        
-        p_type = person.get("type", "Quote")
-        if p_type == "Bible":
-            icon = "📖"
-            bg_color = "#e3f2fd"
-        elif p_type == "Book":
-            icon = "📚"
-            bg_color = "#f3e5f5"
-        else:
-            icon = "💬"
-            bg_color = "#fff3e0"
-            
-        with cols[i]:
-            if os.path.exists(img_path):
-                 
-                st.image(img_path, use_container_width=True)
-            else:
-                st.markdown(f"""
-                <div style="background-color:#f8f9fa; height:150px; display:flex; align-items:center; justify-content:center; border-radius:8px; border:1px dashed #ced4da; color:#adb5bd; font-size:0.8em; margin-bottom:10px;">
-                    {person['name']}<br>(이미지 없음)
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div style="text-align:center;">
-                <div style="font-weight:bold; font-size:1.1em; margin-bottom:8px; color:#2c3e50;">
-                    {person['name']}
-                </div>
-                <div style="font-size:0.85em; color:#495057; background-color:{bg_color}; padding:10px; border-radius:8px; line-height:1.4; min-height:80px; display:flex; align-items:center; justify-content:center;">
-                    <span>{icon} {person['text']}</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-    st.divider()
+    # 3. 결과 표시 (유형 코드 + 반올림한 평균을 키로 미리 만든 조각 재사용, cbti/render.py)
+    view = get_result_renderer(QN.version).render(res_code, render.quantize(avg, QN.scorer.parts))
+    show_result_view(view)
 
     col_chart, col_share = st.columns([1, 1])
     with col_chart:
         st.subheader("📊 나의 성향 분석")
-        chart_data = pd.DataFrame({
-            "지표": ["신학(T vs C)", "동력(D vs G)", "사회(P vs S)", "문화(L vs M)"],
-            "점수": [avg["Theology"], avg["Drive"], avg["Society"], avg["Culture"]]
-        })
+        with metrics.phase("chart"):
+            st.vega_lite_chart(view.chart_spec, use_container_width=True)
         
-        # [수정] 차트 색상 복구 (파랑, 빨강, 초록, 노랑)
-        c = alt.Chart(chart_data).mark_bar().encode(
-            x=alt.X('지표', sort=None),
-            y=alt.Y('점수', scale=alt.Scale(domain=[0, 10])),
-            color=alt.Color('지표', scale=alt.Scale(range=["#4B89DC", "#D9534F", "#5CB85C", "#F0AD4E"]), legend=None),
-            tooltip=['지표', '점수']
-        ).properties(height=250)
-        st.altair_chart(c, use_container_width=True)
+        if show_population:
+            st.caption(f"👥 전체 응답자 {population.total:,}명 중 {population.type_share(res_code):.1%}가 {res_code} 유형입니다.")
+            st.caption(" · ".join(f"{part.axis_name} 상위 {100 - pct[part.key]:.0f}%" for part in QN.parts))
+        
+        # 가장 가까운 원형 = 내 유형, 두 번째 = 경계에 가장 가까운 축을 넘긴 유형
+        axis_avg = [avg[p] for p in QN.scorer.parts]
+        ranking = get_type_similarity().rank(axis_avg, k=2)
+        second = str(ranking.codes[0, 1])
+        st.caption(f"🧭 두 번째로 가까운 유형: {second} ({TYPE_DETAILS[second]['title']}) · "
+                   f"두 유형 중 {res_code} 쪽 {ranking.top2_share()[0]:.0%}",
+                   help=f"내 점수를 {res_code}와 {second} 두 유형만 놓고 비교했을 때 {res_code} 쪽으로 기운 정도예요. "
+                        "50%면 두 유형의 경계, 100%에 가까울수록 뚜렷하게 " + res_code + " 유형이에요.")
+        boundary = get_type_similarity().boundary_axes(axis_avg)[0]
+        near = [part.axis_name for part, close in zip(QN.parts, boundary) if close]
+        if near:
+            st.warning(f"⚖️ {', '.join(near)} 점수가 경계(5점)에 가까워요. {second} 유형의 설명도 함께 읽어 보세요.")
+        
+        n_skipped = st.session_state.answers.count(scoring.NO_ANSWER)
+        if n_skipped:
+            st.caption(f"⏩ 유형이 이미 정해진 축의 {n_skipped}개 문항은 건너뛰었어요. (점수는 답한 문항의 평균)")
         
     with col_share:
         st.subheader("📢 공유하기")
-        st.info("결과를 캡처해서 친구들과 나눠보세요!")
-        st.code(f"https://faithcheck.streamlit.app/", language="none")
+        st.info("아래 링크를 보내면 친구도 바로 내 결과를 볼 수 있어요!")
+        st.code(links.result_url(share_params), language="none")
         st.caption("👆 위 링크를 복사하세요")
+        
+        share_card = get_share_cards(QN.version).get(res_code)
+        if share_card:
+            fmt = sharecards.DEFAULT_FORMAT
+            st.download_button("🖼️ 결과 카드 이미지 저장", data=share_card[1], file_name=f"faithcheck_{res_code}.{fmt}",
+                               mime=sharecards.FORMATS[fmt]["mime"], use_container_width=True)
 
     st.divider()
     
     if st.button("🔄 처음부터 다시 하기", type="secondary"):
         st.session_state.step = 1
-        st.session_state.answers = {}
-        st.rerun()
\ No newline at end of file
+        st.session_state.block = 0
+        st.session_state.last_block = {}
+        st.session_state.content_version = get_content_store().current().version  # 다시 할 때는 최신 질문지로
+        st.session_state.pop("answers", None)
+        st.session_state.result_saved = False
+        st.session_state.reruns = 0
+        st.query_params.clear()
+        st.rerun()
+
+# st.rerun() 으로 중단된 실행은 여기까지 오지 않으므로 rerun 시간에서 빠진다 (단계 이동 카운터로 확인)
+metrics.RERUN_SECONDS.observe(time.perf_counter() - RUN_STARTED)
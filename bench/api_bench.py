@@ -0,0 +1,190 @@
+"""채점 API(cbti/api.py) 처리량 벤치마크.
+
+API 서버를 별도 프로세스 하나(= 코어 하나)로 띄우고, 클라이언트 프로세스들이 keep-alive 연결 여러 개로
+정해진 시간 동안 POST /score 를 보낸다. 응답 한 건씩 보내는 경우와 묶음(--batch)으로 보내는 경우를
+각각 재고, 초당 요청 수/응답 수와 요청 지연 시간, HTTP 없이 ScoringService 만 돌렸을 때의 비용을 리포트한다.
+
+    python bench/api_bench.py --duration 5 --connections 64 --clients 2 -o api_bench.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from loadtest import REPO_DIR, _git_commit, _git_dirty, summarize
+
+sys.path.insert(0, REPO_DIR)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_body(n, seed=0):
+    """무작위 응답 n 건의 요청 본문 (n == 1 이면 단건 형식). 라벨과 인덱스를 섞는다."""
+    from cbti.content_store import default_store
+
+    qn = default_store().current()
+    rng = random.Random(seed)
+
+    def answers():
+        return [rng.choice(qn.options) if rng.random() < 0.5 else rng.randrange(len(qn.options))
+                for _ in range(qn.n_questions)]
+
+    if n == 1:
+        payload = {"id": "bench", "answers": answers()}
+    else:
+        payload = {"responses": [{"id": i, "answers": answers()} for i in range(n)]}
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _request(port, body):
+    return (f"POST /score HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+async def _connection(port, request, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode("latin-1"))
+    finally:
+        writer.close()
+
+
+def _run_client(port, body, connections, duration):
+    """클라이언트 프로세스 하나: connections 개의 연결로 duration 초 동안 요청 (지연 시간 목록, 오류)"""
+    request = _request(port, body)
+    latencies, errors = [], []
+
+    async def run():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_connection(port, request, deadline, latencies, errors) for _ in range(connections)))
+
+    asyncio.run(run())
+    return latencies, errors[:10]
+
+
+def measure(port, batch, connections, clients, duration):
+    body = make_body(batch)
+    shares = [connections // clients + (1 if c < connections % clients else 0) for c in range(clients)]
+    args = [(port, body, n, duration) for n in shares if n]
+    started = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(len(args)) as pool:
+        results = pool.starmap(_run_client, args)
+    wall = time.perf_counter() - started
+    latencies = [v * 1000 for r in results for v in r[0]]
+    errors = [e for r in results for e in r[1]]
+    # 프로세스 시작 시간을 빼기 위해 요청 수는 측정 구간(duration) 기준으로 나눈다
+    return {
+        "batch": batch,
+        "request_bytes": len(body),
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / duration, 1),
+        "responses_per_s": round(len(latencies) * batch / duration, 1),
+        "latency_ms": summarize(latencies),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+    }
+
+
+def measure_service(batch, repeat):
+    """HTTP 없이 json 파싱 + 채점 + 직렬화만 (요청 하나당 마이크로초)"""
+    from cbti import api
+
+    service = api.ScoringService()
+    body = make_body(batch)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        api._json(service.score(json.loads(body)))
+    return round((time.perf_counter() - started) / repeat * 1e6, 1)
+
+
+def wait_ready(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"API server exited with code {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as s:
+                s.sendall(b"GET /healthz HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+                if s.recv(64).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="C-BTI 채점 API 처리량 벤치마크")
+    parser.add_argument("--duration", type=float, default=5, help="측정 구간 길이(초)")
+    parser.add_argument("--connections", type=int, default=64, help="동시 keep-alive 연결 수 (전체)")
+    parser.add_argument("--clients", type=int, default=2, help="클라이언트 프로세스 수")
+    parser.add_argument("--batch", type=int, default=100, help="묶음 요청 하나에 넣는 응답 수")
+    parser.add_argument("--uvloop", action="store_true", help="서버에서 uvloop 사용 (설치된 경우)")
+    parser.add_argument("-o", "--output", help="리포트 JSON 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    command = [sys.executable, "-m", "cbti.api", "--host", "127.0.0.1", "--port", str(port)]
+    if not args.uvloop:
+        command.append("--no-uvloop")
+    proc = subprocess.Popen(command, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, proc)
+        single = measure(port, 1, args.connections, args.clients, args.duration)
+        batched = measure(port, args.batch, args.connections, args.clients, args.duration)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "dirty": _git_dirty(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "duration_s": args.duration,
+            "connections": args.connections,
+            "clients": args.clients,
+            "uvloop": args.uvloop,
+        },
+        "single": single,
+        "batched": batched,
+        "service_us": {"single": measure_service(1, 2000), f"batch_{args.batch}": measure_service(args.batch, 200)},
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 1 if single["errors"] or batched["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
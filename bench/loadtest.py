@@ -0,0 +1,343 @@
+"""app.py 헤드리스 부하 테스트 / 지연 시간 벤치마크 (Streamlit AppTest).
+
+가상 응답자 세션 여러 개를 한 프로세스 안에서 번갈아(rerun 단위 round-robin) 진행해 동시 접속을 흉내 내고,
+--workers 로 프로세스를 늘릴 수 있다. (AppTest 는 실행마다 Runtime/st.secrets 전역을 바꾸므로 스레드로
+동시에 돌리면 서로 간섭한다.) 각 세션은 실제 사용자처럼
+  - 라디오를 하나씩 고르고 (폼 밖의 라디오는 클릭마다 rerun)
+  - "다음 ➡️" / "결과 보기 🚀" 로 넘어가고, 두 번째 페이지에서 한 번 "⬅️ 이전" 으로 돌아갔다가
+  - 결과 화면을 본 뒤 "🔄 처음부터 다시 하기" 를 누른다.
+rerun 별 소요 시간, 결과 화면 렌더링 시간, 세션당 rerun 수, 최대 메모리를 JSON 리포트로 남긴다.
+
+    python bench/loadtest.py --sessions 40 --concurrency 8 --workers 2 -o bench_output.json
+    python bench/loadtest.py --compare bench/baseline.json
+    python bench/loadtest.py --save-baseline            # bench/baseline.json 갱신 (커밋된 트리에서만)
+
+리포트의 meta 에는 커밋과 함께 작업 트리에 커밋하지 않은 변경이 있었는지(dirty)를 남긴다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+APP_PATH = os.path.join(REPO_DIR, "app.py")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+sys.path.insert(0, REPO_DIR)
+
+# 리포트에서 비교하는 지표 (값이 작을수록 좋음)
+COMPARED_METRICS = [
+    ("rerun_ms", "p50"), ("rerun_ms", "p95"), ("result_render_ms", "p50"), ("result_render_ms", "p95"),
+    ("session_s", "p50"), ("reruns_per_session", "mean"), ("peak_rss_mb", None),
+]
+
+
+class SessionError(Exception):
+    pass
+
+
+class Session:
+    """AppTest 하나로 한 명의 응답자를 흉내 낸다."""
+
+    def __init__(self, seed, secrets, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        for key, value in secrets.items():
+            self.at.secrets[key] = value
+        self.rerun_ms = []
+        self.result_render_ms = None
+        self.answered = 0
+
+    def run(self):
+        started = time.perf_counter()
+        self.at.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.rerun_ms.append(elapsed)
+        if self.at.exception:
+            raise SessionError(self.at.exception[0].message)
+        return elapsed
+
+    def find_button(self, *texts):
+        for button in self.at.button:
+            if any(t in button.label for t in texts):
+                return button
+        return None
+
+    def click(self, *texts):
+        button = self.find_button(*texts)
+        if button is None:
+            raise SessionError(f"button {texts} not found")
+        button.click()
+        return self.run()
+
+    def answer_page(self):
+        """아직 선택되지 않은 라디오를 하나씩 고른다. 폼 밖의 라디오는 브라우저처럼 클릭마다 rerun."""
+        for i in range(len(self.at.radio)):
+            radio = self.at.radio[i]
+            if radio.value is not None:
+                continue
+            radio.set_value(_option_value(radio, self.rng.randrange(len(radio.options))))
+            self.answered += 1
+            if not getattr(radio.proto, "form_id", ""):
+                self.run()
+                yield
+
+    def play(self, max_pages=50):
+        """rerun 한 번마다 yield 하는 제너레이터 (여러 세션을 번갈아 진행하기 위함)"""
+        self.run()
+        yield
+        went_back = False
+        for page in range(max_pages):
+            if self.find_button("처음부터"):
+                break
+            yield from self.answer_page()
+            if page == 1 and not went_back:
+                went_back = True
+                self.click("이전")
+                yield
+                if any(r.value is None for r in self.at.radio):
+                    raise SessionError("answers were lost after going back")
+                continue
+            elapsed = self.click("다음", "결과 보기")
+            if self.find_button("처음부터"):
+                self.result_render_ms = elapsed
+            yield
+        else:
+            raise SessionError("result page was never reached")
+        self.click("처음부터")
+
+
+def _option_value(radio, i):
+    # 라디오 값이 선택지 인덱스(format_func 로 라벨 표시)인지 라벨 자체인지에 맞춰 값을 고른다
+    label = radio.options[i]
+    try:
+        if radio.format_func(i) == label:
+            return i
+    except Exception:
+        pass
+    return label
+
+
+def summarize(values):
+    if not values:
+        return None
+    arr = np.asarray(values, dtype=float)
+    return {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p90": round(float(np.percentile(arr, 90)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _git_dirty():
+    """추적 중인 파일에 커밋하지 않은 변경이 있으면 True (git 이 없으면 None)"""
+    try:
+        status = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                                         text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return bool(status.strip())
+
+
+def _isolate_side_effects(tmp_dir):
+    """벤치마크 결과가 실제 결과 저장소/통계 파일에 섞이지 않도록 임시 디렉터리로 돌린다."""
+    from cbti import persistence, stats
+
+    persistence.DEFAULT_SQLITE_PATH = os.path.join(tmp_dir, "results.sqlite3")
+    persistence.DEFAULT_FALLBACK_PATH = os.path.join(tmp_dir, "unsent_results.jsonl")
+    stats.DEFAULT_PATH = os.path.join(tmp_dir, "population_stats.json")
+    return {"results": {"sink": "jsonl", "path": os.path.join(tmp_dir, "results.jsonl")}}
+
+
+def _run_worker(worker_id, sessions, concurrency, seed, timeout, trace_memory, tmp_dir, adaptive=False):
+    """한 프로세스에서 sessions 개의 세션을 concurrency 개씩 번갈아 진행하고 원시 측정값을 돌려준다."""
+    secrets = _isolate_side_effects(tmp_dir)
+    if adaptive:
+        secrets["questionnaire"] = {"adaptive": True}
+    base_seed = seed + worker_id * 1_000_000
+
+    # 첫 세션(캐시 워밍업: 질문지 컴파일, 이미지 빌드 등)은 측정에서 뺀다
+    for _ in Session(base_seed - 1, secrets, timeout).play():
+        pass
+
+    if trace_memory:
+        tracemalloc.start()
+    worker_started = time.perf_counter()
+    raw = {"rerun_ms": [], "result_render_ms": [], "session_s": [], "reruns": [], "answered": [], "errors": []}
+
+    pending = iter(range(sessions))
+    active = []  # (i, session, generator, started)
+
+    def start_next():
+        i = next(pending, None)
+        if i is not None:
+            session = Session(base_seed + i, secrets, timeout)
+            active.append((i, session, session.play(), time.perf_counter()))
+
+    for _ in range(concurrency):
+        start_next()
+    while active:
+        for entry in list(active):
+            i, session, steps, started = entry
+            try:
+                next(steps)
+                continue
+            except StopIteration:
+                raw["rerun_ms"].extend(session.rerun_ms)
+                raw["reruns"].append(len(session.rerun_ms))
+                raw["answered"].append(session.answered)
+                raw["session_s"].append(time.perf_counter() - started)
+                if session.result_render_ms is not None:
+                    raw["result_render_ms"].append(session.result_render_ms)
+            except Exception as e:  # 세션 하나의 실패가 전체 벤치마크를 멈추지 않게
+                raw["errors"].append(f"worker {worker_id} session {i}: {type(e).__name__}: {e}")
+            active.remove(entry)
+            start_next()
+
+    raw["wall_s"] = time.perf_counter() - worker_started
+    raw["traced_peak"] = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    # ru_maxrss 는 Linux 에서 KB 단위
+    raw["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return raw
+
+
+def run_benchmark(sessions, concurrency, workers=1, seed=0, timeout=60, trace_memory=False, adaptive=False):
+    tmp_dir = tempfile.mkdtemp(prefix="cbti-bench-")
+    shares = [sessions // workers + (1 if w < sessions % workers else 0) for w in range(workers)]
+    args = [(w, n, concurrency, seed, timeout, trace_memory, tmp_dir, adaptive) for w, n in enumerate(shares)]
+
+    if workers == 1:
+        results = [_run_worker(*args[0])]
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers) as pool:
+            results = pool.starmap(_run_worker, args)
+    # 워밍업을 뺀 측정 구간 (워커들이 병렬로 도므로 가장 긴 워커 기준)
+    wall = max(r["wall_s"] for r in results)
+
+    merged = {k: [v for r in results for v in r[k]]
+              for k in ("rerun_ms", "result_render_ms", "session_s", "reruns", "answered", "errors")}
+    traced = [r["traced_peak"] for r in results if r["traced_peak"] is not None]
+
+    import streamlit
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "dirty": _git_dirty(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "workers": workers,
+            "seed": seed,
+            "adaptive": adaptive,
+        },
+        "completed_sessions": len(merged["session_s"]),
+        "errors": merged["errors"],
+        "wall_s": round(wall, 3),
+        "sessions_per_s": round(len(merged["session_s"]) / wall, 3) if wall else None,
+        "rerun_ms": summarize(merged["rerun_ms"]),
+        "result_render_ms": summarize(merged["result_render_ms"]),
+        "session_s": summarize(merged["session_s"]),
+        "reruns_per_session": summarize(merged["reruns"]),
+        "questions_per_session": summarize(merged["answered"]),
+        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in results), 1),
+        "traced_peak_mb": round(max(traced) / 2**20, 1) if traced else None,
+    }
+
+
+def _metric(report, name, stat):
+    value = report.get(name)
+    if stat is not None:
+        value = (value or {}).get(stat)
+    return value
+
+
+def compare(report, baseline, max_regression=None):
+    """지표별 변화율을 출력한다. max_regression 을 넘게 나빠진 지표 목록을 돌려준다."""
+    regressions = []
+    meta = baseline.get("meta", {})
+    print(f"baseline: commit {meta.get('commit')}{' (dirty)' if meta.get('dirty') else ''}, {meta.get('timestamp')}")
+    print(f"{'metric':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, stat in COMPARED_METRICS:
+        base, cur = _metric(baseline, name, stat), _metric(report, name, stat)
+        label = f"{name}.{stat}" if stat else name
+        if base is None or cur is None:
+            print(f"{label:<28}{str(base):>12}{str(cur):>12}{'n/a':>10}")
+            continue
+        change = (cur - base) / base if base else 0.0
+        print(f"{label:<28}{base:>12.2f}{cur:>12.2f}{change:>+10.1%}")
+        if max_regression is not None and change > max_regression:
+            regressions.append(label)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="C-BTI app.py 부하 테스트 (Streamlit AppTest)")
+    parser.add_argument("--sessions", type=int, default=40, help="총 가상 세션 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="프로세스당 동시에 진행하는 세션 수")
+    parser.add_argument("--workers", type=int, default=1, help="워커 프로세스 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60, help="rerun 한 번의 타임아웃(초)")
+    parser.add_argument("--adaptive", action="store_true", help="적응형 진행(파트 조기 종료)을 켜고 측정")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc 으로 Python 할당 최대치도 측정 (느려짐)")
+    parser.add_argument("-o", "--output", help="리포트 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument("--compare", metavar="BASELINE", help="기준 리포트와 비교")
+    parser.add_argument("--max-regression", type=float, help="이 비율보다 나빠진 지표가 있으면 종료 코드 1 (예: 0.2)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 {os.path.relpath(BASELINE_PATH, REPO_DIR)} 로 저장")
+    args = parser.parse_args(argv)
+    if args.save_baseline and _git_dirty():
+        parser.error("기준 리포트는 커밋된 트리에서만 저장합니다 (커밋하지 않은 변경이 있음)")
+
+    report = run_benchmark(args.sessions, args.concurrency, args.workers, args.seed, args.timeout, args.trace_memory,
+                           args.adaptive)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    output = BASELINE_PATH if args.save_baseline else args.output
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"report written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if report["errors"]:
+        print(f"{len(report['errors'])} session(s) failed, e.g. {report['errors'][0]}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print(f"regressed: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# C-BTI 앱에서 공통으로 쓰는 모듈 모음 (Streamlit 의존성 없음)
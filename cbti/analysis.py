@@ -0,0 +1,283 @@
+"""문항 분석 (오프라인, 청크 스트리밍).
+
+응답 파일을 청크 단위로 읽으며 역채점까지 반영한 문항 점수의 n, 합, 교차곱(45x45)만 누적한다.
+메모리는 응답 수와 무관하게 일정하고, 부분 통계는 더하기만 하면 합쳐지므로(merge) 파일별로
+나눠 병렬 처리할 수 있다. 누적이 끝나면 공분산 행렬 하나로 다음을 계산한다.
+
+  - 파트별 Cronbach's alpha, 문항 제거 시 alpha
+  - 교정된 문항-총점 상관 (문항을 뺀 나머지 합과의 상관). 음수면 reverse 설정이 의심스럽다.
+  - 파트별 첫 주성분 적재량 (상관 행렬의 첫 고유벡터 x sqrt(고유값))
+  - 상관이 매우 높은 문항 쌍(중복 의심)과 문장이 거의 같은 문항 쌍
+  - 모든 응답자가 같은 답을 한 문항(분산 0)은 "constant" 로 표시하고 위 계산에서 뺀다
+
+    python -m cbti.analysis responses.csv [more.jsonl ...] [--workers 4] [--json report.json]
+
+입력 형식은 cbti.scoring CLI 와 같다. 모든 문항에 답한 응답만 사용한다.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from cbti import content_store, scoring
+
+# 누적 전에 빼는 값 (점수 0~10 의 중앙). 교차곱의 자릿수 손실을 줄인다.
+SHIFT = 5.0
+MISKEY_R = 0.0  # 교정 문항-총점 상관이 이보다 작으면 역채점 의심
+WEAK_LOADING = 0.3
+REDUNDANT_R = 0.8
+SIMILAR_TEXT = 0.35  # 글자 bigram 겹침 비율 (짧은 쪽 기준)
+CONSTANT_VAR = 1e-12  # 분산이 이 이하면 상수 문항 (누적 오차로 정확히 0 이 아닐 수 있다)
+
+
+class ItemStats:
+    """역채점 반영 문항 점수의 합쳐지는(mergeable) 1, 2차 누적 통계"""
+
+    def __init__(self, n_items):
+        self.n_items = n_items
+        self.n = 0
+        self.skipped = 0
+        self.sums = np.zeros(n_items)
+        self.cross = np.zeros((n_items, n_items))
+
+    def update(self, keyed, complete=None):
+        """keyed: (N, n_items) 점수 행렬. complete 가 주어지면 그 행만 반영한다."""
+        if complete is not None:
+            self.skipped += int((~complete).sum())
+            keyed = keyed[complete]
+        x = keyed - SHIFT
+        self.n += len(x)
+        self.sums += x.sum(axis=0)
+        self.cross += x.T @ x
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.skipped += other.skipped
+        self.sums += other.sums
+        self.cross += other.cross
+        return self
+
+    def mean(self):
+        return self.sums / self.n + SHIFT
+
+    def covariance(self):
+        """표본 공분산 (n - 1)"""
+        m = self.sums / self.n
+        return (self.cross - self.n * np.outer(m, m)) / (self.n - 1)
+
+    def correlation(self):
+        """상관 행렬. 분산이 0 인 문항의 행/열은 NaN"""
+        cov = self.covariance()
+        constant = np.diag(cov) <= CONSTANT_VAR
+        sd = np.sqrt(np.where(constant, 1.0, np.diag(cov)))
+        corr = cov / np.outer(sd, sd)
+        corr[constant, :] = np.nan
+        corr[:, constant] = np.nan
+        return corr
+
+    def to_dict(self):
+        return {"n": self.n, "skipped": self.skipped, "sums": self.sums.tolist(), "cross": self.cross.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(len(data["sums"]))
+        stats.n, stats.skipped = data["n"], data["skipped"]
+        stats.sums = np.array(data["sums"], dtype=np.float64)
+        stats.cross = np.array(data["cross"], dtype=np.float64)
+        return stats
+
+
+def keyed_scores(answers, scorer):
+    """선택지 인덱스 (N, 45) -> (역채점 반영 점수, 모든 문항 응답 여부)"""
+    a = np.asarray(answers)
+    complete = ((a >= 0) & (a < len(scorer.options))).all(axis=1)
+    values = scorer.keyed[np.where(complete[:, None], a, 0), np.arange(scorer.n_questions)]
+    return values, complete
+
+
+def accumulate_file(path, id_column="id", chunksize=200_000, scorer=None):
+    scorer = scorer or scoring.default_scorer()
+    reader = scoring._read_jsonl_chunks if path.endswith(".jsonl") else scoring._read_csv_chunks
+    stats = ItemStats(scorer.n_questions)
+    for _, answers in reader(path, id_column, scorer, chunksize):
+        stats.update(*keyed_scores(answers, scorer))
+    return stats
+
+
+def accumulate(paths, workers=1, id_column="id", chunksize=200_000):
+    """여러 파일의 부분 통계를 (선택적으로 프로세스 풀에서) 만들어 합친다."""
+    if workers > 1 and len(paths) > 1:
+        import multiprocessing as mp
+        from functools import partial
+
+        with mp.get_context("spawn").Pool(min(workers, len(paths))) as pool:
+            parts = pool.map(partial(accumulate_file, id_column=id_column, chunksize=chunksize), paths)
+    else:
+        parts = [accumulate_file(p, id_column, chunksize) for p in paths]
+    total = parts[0]
+    for other in parts[1:]:
+        total.merge(other)
+    return total
+
+
+# -----------------------------------------------------------------------------
+# 지표 계산 (공분산 행렬만 사용)
+# -----------------------------------------------------------------------------
+def part_report(cov, cols):
+    """한 파트의 alpha, 문항 제거 시 alpha, 교정 문항-총점 상관, 첫 주성분 적재량.
+
+    분산이 0 인 문항(constant)은 상관을 정의할 수 없으므로 빼고 계산하고, 그 문항의 값은 NaN 이다.
+    """
+    constant = np.diag(cov)[cols] <= CONSTANT_VAR
+    alpha_if_deleted, item_rest_r, loadings = (np.full(len(cols), np.nan) for _ in range(3))
+    keep = np.flatnonzero(~constant)
+    sub = cov[np.ix_(np.asarray(cols)[keep], np.asarray(cols)[keep])]
+    k = len(keep)
+    alpha = explained = np.nan
+    if k >= 2:
+        var_items = np.diag(sub)
+        var_total = sub.sum()
+        alpha = k / (k - 1) * (1 - var_items.sum() / var_total)
+
+        cov_with_total = sub.sum(axis=1)
+        var_rest = var_total - 2 * cov_with_total + var_items
+        with np.errstate(invalid="ignore", divide="ignore"):
+            item_rest_r[keep] = (cov_with_total - var_items) / np.sqrt(var_items * var_rest)
+            if k > 2:
+                alpha_if_deleted[keep] = (k - 1) / (k - 2) * (1 - (var_items.sum() - var_items) / var_rest)
+
+        sd = np.sqrt(var_items)
+        corr = sub / np.outer(sd, sd)
+        eigvals, eigvecs = np.linalg.eigh(corr)
+        first = eigvecs[:, -1] * np.sqrt(eigvals[-1])
+        if first.sum() < 0:  # 고유벡터 부호는 임의이므로 대부분이 양수가 되도록 맞춘다
+            first = -first
+        loadings[keep] = first
+        explained = eigvals[-1] / k
+    return {
+        "alpha": float(alpha),
+        "explained": float(explained),
+        "alpha_if_deleted": alpha_if_deleted,
+        "item_rest_r": item_rest_r,
+        "loadings": loadings,
+        "constant": constant,
+    }
+
+
+def similar_texts(questions, threshold=SIMILAR_TEXT):
+    """문장이 비슷한 문항 쌍 [(i, j, 유사도)] (데이터 없이 질문지만으로).
+
+    한국어는 조사가 붙어 단어 단위 비교가 잘 안 맞으므로 공백을 뺀 글자 bigram 집합의 겹침 비율을 쓴다.
+    """
+    texts = [q["text"].replace(" ", "") for q in questions]
+    grams = [{t[k:k + 2] for k in range(len(t) - 1)} for t in texts]
+    pairs = []
+    for i in range(len(grams)):
+        for j in range(i + 1, len(grams)):
+            ratio = len(grams[i] & grams[j]) / max(1, min(len(grams[i]), len(grams[j])))
+            if ratio >= threshold:
+                pairs.append((i, j, ratio))
+    return pairs
+
+
+def analyze(stats, questionnaire=None):
+    """누적 통계로 파트별 신뢰도와 문항 경고를 담은 보고서(dict)를 만든다 (기본: 현재 콘텐츠 버전)."""
+    questionnaire = questionnaire or content_store.default_store().current()
+    questions, scorer = questionnaire.questions, questionnaire.scorer
+    if stats.n < 3:
+        raise ValueError(f"need at least 3 complete responses, got {stats.n}")
+    cov = stats.covariance()
+    corr = stats.correlation()
+    mean = stats.mean()
+
+    items, parts, flags = [], {}, []
+    for p, cols in enumerate(scorer.part_columns):
+        part = scorer.parts[p]
+        rep = part_report(cov, cols)
+        parts[part] = {"items": len(cols), "alpha": rep["alpha"], "explained": rep["explained"]}
+        for pos, i in enumerate(cols):
+            item = {
+                "item": int(i) + 1,
+                "part": part,
+                "reverse": bool(scorer.reverse[i]),
+                "mean": float(mean[i]),
+                "sd": float(np.sqrt(cov[i, i])),
+                "item_rest_r": float(rep["item_rest_r"][pos]),
+                "alpha_if_deleted": float(rep["alpha_if_deleted"][pos]),
+                "loading": float(rep["loadings"][pos]),
+                "text": questions[i]["text"],
+            }
+            items.append(item)
+            if rep["constant"][pos]:
+                flags.append({"item": item["item"], "issue": "constant",
+                              "detail": f"every respondent scored {item['mean']:.1f}"})
+            elif item["item_rest_r"] < MISKEY_R:
+                flags.append({"item": item["item"], "issue": "miskeyed",
+                              "detail": f"item-rest r={item['item_rest_r']:.2f} (reverse={item['reverse']})"})
+            elif abs(item["loading"]) < WEAK_LOADING:
+                flags.append({"item": item["item"], "issue": "weak", "detail": f"loading={item['loading']:.2f}"})
+            if item["alpha_if_deleted"] > rep["alpha"]:
+                flags.append({"item": item["item"], "issue": "lowers_alpha",
+                              "detail": f"alpha {rep['alpha']:.3f} -> {item['alpha_if_deleted']:.3f} without it"})
+
+    redundant = []
+    upper = np.triu_indices(len(corr), k=1)
+    for i, j in zip(*upper):
+        r = corr[i, j]
+        if abs(r) >= REDUNDANT_R:
+            redundant.append({"items": [int(i) + 1, int(j) + 1], "r": float(r),
+                              "same_part": bool(scorer.part_idx[i] == scorer.part_idx[j])})
+    texts = [{"items": [i + 1, j + 1], "similarity": round(ratio, 3),
+              "r": float(corr[i, j]), "reverse": [bool(scorer.reverse[i]), bool(scorer.reverse[j])]}
+             for i, j, ratio in similar_texts(questions)]
+
+    return {"n": stats.n, "skipped": stats.skipped, "parts": parts, "items": items, "flags": flags,
+            "redundant_pairs": redundant, "similar_texts": texts}
+
+
+def _or_none(rows):
+    return rows or ["  none"]
+
+
+def format_report(report):
+    lines = [f"complete responses: {report['n']:,} (skipped {report['skipped']:,} incomplete)", ""]
+    for part, p in report["parts"].items():
+        lines.append(f"{part:<9} items={p['items']:>2}  alpha={p['alpha']:.3f}  first PC explains {p['explained']:.0%}")
+    lines += ["", f"{'item':>4} {'part':<9} {'rev':<3} {'mean':>5} {'r_rest':>6} {'a_del':>6} {'load':>6}"]
+    for it in report["items"]:
+        lines.append(f"{it['item']:>4} {it['part']:<9} {'R' if it['reverse'] else '':<3} {it['mean']:>5.2f} "
+                     f"{it['item_rest_r']:>6.2f} {it['alpha_if_deleted']:>6.3f} {it['loading']:>6.2f}")
+    lines += ["", "flags:"] + _or_none([f"  Q{f['item']}: {f['issue']} ({f['detail']})" for f in report["flags"]])
+    lines += ["", f"redundant pairs (|r| >= {REDUNDANT_R}):"]
+    lines += _or_none([f"  Q{a}-Q{b}: r={p['r']:.2f}{'' if p['same_part'] else ' (different parts)'}"
+                       for p in report["redundant_pairs"] for a, b in [p["items"]]])
+    lines += ["", f"near-duplicate wording (similarity >= {SIMILAR_TEXT}):"]
+    lines += _or_none([f"  Q{a}-Q{b}: similarity={p['similarity']:.2f} r={p['r']:.2f} reverse={p['reverse']}"
+                       for p in report["similar_texts"] for a, b in [p["items"]]])
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="C-BTI 문항 분석 (alpha, 문항-총점 상관, 역채점 점검, 적재량)")
+    parser.add_argument("inputs", nargs="+", help="응답 파일 (.csv / .jsonl, cbti.scoring 과 같은 형식)")
+    parser.add_argument("--workers", type=int, default=1, help="파일별 병렬 처리 프로세스 수")
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--json", help="보고서를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = accumulate(args.inputs, workers=args.workers, id_column=args.id_column, chunksize=args.chunksize)
+    report = analyze(stats)
+    print(format_report(report))
+    print(f"\n{stats.n + stats.skipped:,} responses in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
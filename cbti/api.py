@@ -0,0 +1,282 @@
+"""헤드리스 채점 API (asyncio, 표준 라이브러리만 사용).
+
+행사용 종이 설문이나 키오스크 응답을 Streamlit 화면 없이 HTTP JSON 으로 채점한다.
+결과 화면과 같은 Scorer(cbti/scoring.py)와 현재 콘텐츠 버전(cbti/content_store.py)을 쓴다.
+
+    python -m cbti.api --port 8502
+
+    POST /score
+      {"answers": [...45개]}                                   -> 결과 하나
+      {"responses": [{"id": "a1", "answers": [...]}, [...]]}   -> {"version": ..., "results": [...]}
+    답은 OPTIONS 라벨("매우 그렇다" ...), 선택지 인덱스(0~3), 또는 null(미응답).
+    파트(축)마다 한 문항 이상은 답해야 한다 (모두 null 인 파트가 있으면 400).
+    결과: {"res_code", "title", "slogan", "averages": {파트: 평균}, "version"} (+ 요청에 있던 "id")
+
+    GET /healthz, GET /metrics (Prometheus), GET /metrics.json
+
+HTTP/1.1 keep-alive 를 지원하고 요청을 하나씩 읽어 바로 답한다 (chunked 본문은 받지 않음).
+묶음 요청은 한 번의 행렬 연산으로 채점하므로 대량 제출은 묶어서 보내는 편이 훨씬 빠르다.
+본문이 OFFLOAD_BYTES 보다 큰 요청은 스레드 풀에서 처리해 그동안 다른 연결의 요청이 기다리지 않게 한다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from itertools import chain
+
+import numpy as np
+
+from cbti import content_store, metrics
+from cbti.scoring import UNANSWERED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8502
+# 요청 본문 최대 크기 / 묶음 최대 응답 수
+MAX_BODY = 8 * 2**20
+MAX_BATCH = 10_000
+# 이보다 큰 본문은 이벤트 루프 밖(기본 스레드 풀)에서 파싱/채점한다 (응답 약 100건)
+OFFLOAD_BYTES = 64 * 2**10
+# 요청 헤더 최대 크기 (asyncio StreamReader limit)
+MAX_HEADER = 16 * 2**10
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+API_REQUESTS = metrics.REGISTRY.counter("cbti_api_requests_total", "Scoring API requests by path and status")
+API_SCORED = metrics.REGISTRY.counter("cbti_api_scored_total", "Responses scored through the API")
+
+
+class RequestError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """JSON 요청 -> 채점 결과. HTTP 와 무관하게 쓸 수 있다 (벤치마크/테스트)."""
+
+    def __init__(self, store=None):
+        self.store = store or content_store.default_store()
+        self._version = None
+        self._lookup = None
+
+    def _answer_lookup(self, qn):
+        # 버전이 바뀔 때만 다시 만든다: 라벨/인덱스 -> 선택지 인덱스
+        if qn.version != self._version:
+            lookup = {label: i for i, label in enumerate(qn.options)}
+            lookup.update({i: i for i in range(len(qn.options))})
+            lookup[None] = UNANSWERED
+            self._lookup, self._version = lookup, qn.version
+        return self._lookup
+
+    def encode(self, qn, rows):
+        """응답 목록 -> (N, 문항 수) 선택지 인덱스 배열. 알 수 없는 값은 RequestError.
+
+        모든 답을 한 줄로 이어 붙여 C 수준의 map 한 번으로 변환한다 (값마다 파이썬 루프를 돌지 않음).
+        잘못된 값이 있을 때만 느린 경로로 위치를 찾는다.
+        """
+        n = qn.n_questions
+        for r, row in enumerate(rows):
+            if not isinstance(row, list) or len(row) != n:
+                raise RequestError(f"response {r}: expected a list of {n} answers")
+        lookup = self._answer_lookup(qn)
+        flat = list(chain.from_iterable(rows))
+        if bool not in map(type, flat):  # JSON true == 1 이므로 dict 조회를 통과해 버린다
+            try:
+                return np.fromiter(map(lookup.__getitem__, flat), dtype=np.int8, count=len(flat)).reshape(-1, n)
+            except (KeyError, TypeError):
+                pass
+        for r, row in enumerate(rows):
+            bad = next((i for i, v in enumerate(row) if type(v) is bool or not _hashable(v) or v not in lookup), None)
+            if bad is not None:
+                raise RequestError(f"response {r}: answer {bad + 1} must be one of {list(qn.options)}, "
+                                   f"0-{len(qn.options) - 1} or null")
+        raise AssertionError("unreachable")
+
+    def score(self, payload):
+        """{"answers": [...]} 또는 {"responses": [...]} 를 채점해 JSON 으로 돌려줄 dict 를 만든다."""
+        if not isinstance(payload, dict) or ("answers" in payload) == ("responses" in payload):
+            raise RequestError('body must be an object with either "answers" or "responses"')
+        qn = self.store.current()
+        single = "answers" in payload
+        if single:
+            ids, rows = [payload.get("id")], [payload["answers"]]
+        else:
+            responses = payload["responses"]
+            if not isinstance(responses, list) or not responses:
+                raise RequestError('"responses" must be a non-empty list')
+            if len(responses) > MAX_BATCH:
+                raise RequestError(f"at most {MAX_BATCH} responses per request", 413)
+            ids = [r.get("id") if isinstance(r, dict) else None for r in responses]
+            rows = [r.get("answers") if isinstance(r, dict) else r for r in responses]
+
+        encoded = self.encode(qn, rows)
+        # 한 파트를 통째로 건너뛰면 평균이 0 이 되어 근거 없는 유형이 나오므로 받지 않는다
+        answered = (encoded >= 0).astype(np.int32) @ qn.scorer.part_matrix
+        empty = np.argwhere(answered == 0)
+        if len(empty):
+            r, p = empty[0]
+            raise RequestError(f"response {r}: no answers for part {qn.scorer.parts[p]}")
+        result = qn.scorer.score(encoded)
+        averages = np.round(result.averages, 4).tolist()
+        results = []
+        for i, (code, avg) in enumerate(zip(result.codes.tolist(), averages)):
+            details = qn.type_details[code]
+            item = {"res_code": code, "title": details["title"], "slogan": details["slogan"],
+                    "averages": dict(zip(qn.scorer.parts, avg))}
+            if ids[i] is not None:
+                item["id"] = ids[i]
+            results.append(item)
+        API_SCORED.inc(len(results))
+        if single:
+            return {**results[0], "version": qn.version}
+        return {"version": qn.version, "results": results}
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+# -----------------------------------------------------------------------------
+# HTTP
+# -----------------------------------------------------------------------------
+def _response(status, body, content_type="application/json", keep_alive=True):
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ScoringServer:
+    def __init__(self, service=None):
+        self.service = service or ScoringService()
+
+    def dispatch(self, method, path, body):
+        """(status, body bytes, content type)"""
+        if path == "/score":
+            if method != "POST":
+                return 405, _json({"error": "use POST"}), "application/json"
+            try:
+                payload = json.loads(body)
+            except ValueError as e:
+                return 400, _json({"error": f"invalid JSON: {e}"}), "application/json"
+            try:
+                return 200, _json(self.service.score(payload)), "application/json"
+            except RequestError as e:
+                return e.status, _json({"error": str(e)}), "application/json"
+        if method != "GET":
+            return 405, _json({"error": "use GET"}), "application/json"
+        if path == "/healthz":
+            return 200, _json({"status": "ok", "version": self.service.store.current().version}), "application/json"
+        if path == "/metrics":
+            return 200, metrics.REGISTRY.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        if path == "/metrics.json":
+            return 200, _json(metrics.REGISTRY.to_dict()), "application/json"
+        return 404, _json({"error": "not found"}), "application/json"
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(431, _json({"error": "headers too large"}), keep_alive=False))
+                    break
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    writer.write(_response(400, _json({"error": "bad request line"}), keep_alive=False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                if "transfer-encoding" in headers:
+                    status, body, content_type, keep_alive = 411, _json({"error": "send Content-Length"}), \
+                        "application/json", False
+                else:
+                    try:
+                        length = int(headers.get("content-length") or 0)
+                    except ValueError:
+                        length = -1
+                    if length < 0 or length > MAX_BODY:
+                        status, body, content_type, keep_alive = 413, _json({"error": "body too large"}), \
+                            "application/json", False
+                    else:
+                        try:
+                            data = await reader.readexactly(length) if length else b""
+                        except (asyncio.IncompleteReadError, ConnectionError):
+                            break
+                        path = target.split("?", 1)[0]
+                        try:
+                            if length > OFFLOAD_BYTES:
+                                status, body, content_type = await asyncio.get_running_loop().run_in_executor(
+                                    None, self.dispatch, method, path, data)
+                            else:
+                                status, body, content_type = self.dispatch(method, path, data)
+                        except Exception:
+                            # 채점 중 예상하지 못한 오류: 응답 없이 끊지 않고 500 을 보낸 뒤 연결을 닫는다
+                            logger.exception("scoring API request failed: %s %s", method, path)
+                            status, body, content_type, keep_alive = 500, _json({"error": "internal server error"}), \
+                                "application/json", False
+                        API_REQUESTS.inc(path=path if status != 404 else "other", status=status)
+                writer.write(_response(status, body, content_type, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except Exception:
+            logger.exception("scoring API connection failed")
+        finally:
+            writer.close()
+
+    async def serve(self, host="0.0.0.0", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER, backlog=1024)
+        logger.info("scoring API listening on %s:%s", host, port)
+        return server
+
+
+async def _serve_forever(host, port):
+    server = await ScoringServer().serve(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="C-BTI 채점 JSON API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-uvloop", action="store_true", help="uvloop 이 설치되어 있어도 기본 이벤트 루프 사용")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if not args.no_uvloop:
+        try:
+            import uvloop
+
+            uvloop.install()
+        except ImportError:
+            pass
+    try:
+        asyncio.run(_serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""롤모델 이미지 에셋 파이프라인.
+
+images/ 의 원본 JPG를 화면 표시 크기(썸네일)로 줄이고 WebP/JPEG로 재압축해
+static/images/ 에 미리 만들어 둔다. 원본 내용(해시)이 바뀐 파일만 다시 빌드한다.
+빌드 결과는 저장소에 커밋하고, 앱은 Streamlit 정적 파일(app/static/images/...) URL 로 보여준다
+(요청 처리 중에는 빌드하지 않는다). 원본 이미지를 바꾸면 배포 전에 다시 빌드한다.
+
+    python -m cbti.assets          # 변경된 이미지만 빌드
+    python -m cbti.assets --force  # 전부 다시 빌드
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(BASE_DIR, "images")
+BUILD_DIR = os.path.join(BASE_DIR, "static", "images")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+# Streamlit 정적 파일 서빙 경로 (페이지 기준 상대 경로)
+URL_PREFIX = "app/static/images/"
+
+# 결과 화면은 centered 레이아웃의 4열(약 160px)에 이미지를 보여준다. (2배수는 레티나용)
+DISPLAY_WIDTHS = (160, 320)
+DEFAULT_WIDTH = 320
+DEFAULT_FORMAT = "webp"
+PEOPLE_PER_TYPE = 4
+
+FORMATS = {
+    "webp": {"format": "WEBP", "mime": "image/webp", "save": {"quality": 80, "method": 6}},
+    "jpg": {"format": "JPEG", "mime": "image/jpeg", "save": {"quality": 82, "optimize": True, "progressive": True}},
+}
+
+# 파이프라인 규칙이 바뀌면 올려서 기존 빌드를 무효화한다.
+PIPELINE_VERSION = 1
+
+
+def output_name(stem, width, fmt):
+    return f"{stem}_{width}.{fmt}"
+
+
+def output_path(stem, width, fmt):
+    return os.path.join(BUILD_DIR, output_name(stem, width, fmt))
+
+
+def write_atomic(path, data):
+    """path 에 data(bytes)를 원자적으로 쓴다 (pid 가 붙은 임시 파일 + os.replace)"""
+    # 다른 워커/배포가 동시에 빌드해도 읽는 쪽이 반쯤 쓴 파일을 보지 않도록
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def digest(path):
+    """파일 내용의 sha256 (16진수)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != PIPELINE_VERSION:
+        return {}
+    return manifest.get("images", {})
+
+
+def _save_manifest(images):
+    data = json.dumps({"version": PIPELINE_VERSION, "images": images}, ensure_ascii=False, indent=2, sort_keys=True)
+    write_atomic(MANIFEST_PATH, (data + "\n").encode("utf-8"))
+
+
+def render_variants(path, widths=DISPLAY_WIDTHS, formats=tuple(FORMATS)):
+    """원본 한 장을 {(width, fmt): bytes} 로 변환 (원본보다 크게 늘리지는 않음)"""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as src:
+        image = ImageOps.exif_transpose(src).convert("RGB")
+
+    variants = {}
+    for width in widths:
+        resized = image.copy()
+        resized.thumbnail((width, width * 10), Image.LANCZOS)
+        for fmt in formats:
+            spec = FORMATS[fmt]
+            buf = io.BytesIO()
+            resized.save(buf, spec["format"], **spec["save"])
+            variants[(width, fmt)] = buf.getvalue()
+    return variants
+
+
+def _is_fresh(entry, sha256, stem):
+    if not entry or entry.get("sha256") != sha256:
+        return False
+    return all(os.path.exists(output_path(stem, w, fmt)) for w in DISPLAY_WIDTHS for fmt in FORMATS)
+
+
+def build_all(force=False, log=None):
+    """images/*.jpg 전체를 빌드하고 manifest를 돌려준다. 바뀐 원본만 다시 만든다."""
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    manifest = {} if force else load_manifest()
+    current = {}
+
+    for name in sorted(os.listdir(IMAGE_DIR)):
+        if not name.lower().endswith(".jpg"):
+            continue
+        path = os.path.join(IMAGE_DIR, name)
+        stem = os.path.splitext(name)[0]
+        sha256 = digest(path)
+
+        entry = manifest.get(stem)
+        if not _is_fresh(entry, sha256, stem):
+            try:
+                variants = render_variants(path)
+            except Exception as e:  # 깨진 원본 하나가 전체 빌드를 멈추지 않게 (이전 빌드가 있으면 그대로 둔다)
+                logger.warning("could not convert %s: %s", name, e)
+                if log:
+                    log(f"skipped {stem}: {e}")
+                if entry and all(os.path.exists(output_path(stem, w, fmt)) for w in DISPLAY_WIDTHS for fmt in FORMATS):
+                    current[stem] = entry
+                continue
+            outputs = {}
+            for (width, fmt), data in variants.items():
+                write_atomic(output_path(stem, width, fmt), data)
+                outputs[f"{width}.{fmt}"] = len(data)
+            entry = {"sha256": sha256, "source_bytes": os.path.getsize(path), "outputs": outputs}
+            if log:
+                log(f"built {stem}: {entry['source_bytes']:,}B -> {outputs}")
+        current[stem] = entry
+
+    # 원본이 지워진 빌드 결과물 정리
+    for stem in set(manifest) - set(current):
+        for w in DISPLAY_WIDTHS:
+            for fmt in FORMATS:
+                try:
+                    os.remove(output_path(stem, w, fmt))
+                except OSError:
+                    pass
+
+    if current != manifest:
+        _save_manifest(current)
+    return current
+
+
+def role_model_images(codes, manifest=None):
+    """16개 유형의 롤모델 이미지 빌드 정보를 한 번에 확인한다 (빌드는 하지 않음).
+
+    {res_code: [(stem, sha256) 또는 None] * PEOPLE_PER_TYPE} 를 돌려준다. 빌드된 이미지가 없는 자리는 None.
+    앱에서는 프로세스 단위로 캐시해서 사용한다 (app.py의 get_role_model_images).
+    """
+    if manifest is None:
+        manifest = load_manifest()
+    images = {}
+    for code in codes:
+        row = []
+        for i in range(PEOPLE_PER_TYPE):
+            stem = f"{code}_{i + 1}"
+            entry = manifest.get(stem)
+            row.append((stem, entry["sha256"]) if entry else None)
+        images[code] = row
+    return images
+
+
+def image_url(stem, width, fmt, digest="", url_prefix=URL_PREFIX):
+    # 원본이 바뀌면 주소도 바뀌도록 해시를 붙인다 (브라우저 캐시 무효화)
+    return f"{url_prefix}{output_name(stem, width, fmt)}" + (f"?v={digest[:8]}" if digest else "")
+
+
+def to_img_tag(stem, digest="", alt="", url_prefix=URL_PREFIX):
+    """정적 파일 URL 을 가리키는 <picture> 태그 (WebP + JPEG 대체, 1x/2x srcset).
+
+    이미지 bytes 를 페이지에 싣지 않으므로 rerun 마다 다시 보내지 않고 브라우저가 캐시한다.
+    """
+    def srcset(fmt):
+        return ", ".join(f"{image_url(stem, w, fmt, digest, url_prefix)} {w}w" for w in DISPLAY_WIDTHS)
+
+    sizes = f"(max-width: 640px) 45vw, {DISPLAY_WIDTHS[0]}px"
+    return (
+        f'<picture><source type="{FORMATS["webp"]["mime"]}" srcset="{srcset("webp")}" sizes="{sizes}">'
+        f'<img src="{image_url(stem, DEFAULT_WIDTH, "jpg", digest, url_prefix)}" srcset="{srcset("jpg")}" '
+        f'sizes="{sizes}" alt="{html.escape(alt)}" loading="lazy" '
+        f'style="width:100%; height:auto; border-radius:8px; margin-bottom:10px;"></picture>'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="롤모델 이미지 썸네일/WebP 빌드")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 전부 다시 빌드")
+    args = parser.parse_args(argv)
+
+    manifest = build_all(force=args.force, log=print)
+    src_total = sum(e["source_bytes"] for e in manifest.values())
+    out_total = sum(e["outputs"][f"{DEFAULT_WIDTH}.{DEFAULT_FORMAT}"] for e in manifest.values())
+    print(f"{len(manifest)} images: {src_total:,}B originals -> {out_total:,}B ({DEFAULT_WIDTH}px {DEFAULT_FORMAT})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""C-BTI 콘텐츠 데이터: 16가지 유형 정의, 질문지, 선택지/점수표.
+
+내용은 data/content.json 에 있고, 여기서는 읽고 검증만 한다. 문구 수정은 JSON 파일만 고치면 된다.
+import 시점의 내용을 모듈 상수로 들고 있지 않는다. 실행 중에 파일이 바뀔 수 있으므로(핫 리로드)
+질문지는 cbti.content_store.default_store() 의 현재 버전(또는 세션이 고정한 버전)에서 꺼내 쓴다.
+"""
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT_PATH = os.path.join(BASE_DIR, "data", "content.json")
+
+REQUIRED_KEYS = ("options", "score_map", "parts", "axis_names", "types", "questions")
+
+
+def load_content(path=CONTENT_PATH):
+    """콘텐츠 JSON을 읽고 기본적인 일관성을 확인한다."""
+    with open(path, encoding="utf-8") as f:
+        return validate_content(json.load(f), path)
+
+
+def validate_content(content, path="content"):
+    missing = [k for k in REQUIRED_KEYS if k not in content]
+    if missing:
+        raise ValueError(f"{path}: missing keys {missing}")
+    unknown_options = set(content["options"]) - set(content["score_map"])
+    if unknown_options:
+        raise ValueError(f"{path}: options without score {sorted(unknown_options)}")
+    for i, q in enumerate(content["questions"]):
+        if q.get("part") not in content["parts"]:
+            raise ValueError(f"{path}: question {i + 1} has unknown part {q.get('part')!r}")
+    return content
@@ -0,0 +1,177 @@
+"""버전이 있는 콘텐츠 저장소 (무중단 문구 수정).
+
+data/content.json 을 고치면 재배포 없이 반영한다. 버전은 파일 내용의 해시이고,
+  - current() 는 check_interval 마다 한 번만 파일의 mtime/크기를 stat 으로 확인한다 (rerun 당 비용 없음).
+  - 바뀌었으면 백그라운드 스레드가 읽고 검증/컴파일한 뒤 참조 하나를 바꿔 끼운다. 그동안 rerun 은
+    기존 버전을 그대로 쓰고 기다리지 않는다. 잘못된 파일이면 로그만 남기고 기존 버전을 유지한다.
+  - 컴파일한 버전은 archive_dir 에 <버전>.json 으로 남긴다. 이전 질문지로 시작한 세션은 get(버전) 으로
+    자기 버전을 계속 쓰므로 답안 인덱스가 어긋나지 않는다 (메모리에서 밀려나면 아카이브에서 다시 컴파일).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from cbti import assets
+from cbti.content import BASE_DIR, CONTENT_PATH, validate_content
+from cbti.questionnaire import compile_questionnaire
+
+logger = logging.getLogger(__name__)
+
+_default = None
+_default_lock = threading.Lock()
+
+ARCHIVE_DIR = os.path.join(BASE_DIR, "data", "content_versions")
+CHECK_INTERVAL = 2.0
+# 메모리에 들고 있는 버전 수 (현재 버전은 항상 유지)
+KEEP_VERSIONS = 8
+
+
+def content_version(raw):
+    return hashlib.sha256(raw).hexdigest()[:12]
+
+
+def compile_raw(raw, source="content"):
+    """파일 bytes -> Questionnaire (version 포함)"""
+    content = validate_content(json.loads(raw.decode("utf-8")), source)
+    return compile_questionnaire(content, version=content_version(raw))
+
+
+class ContentStore:
+    def __init__(self, path=CONTENT_PATH, archive_dir=ARCHIVE_DIR, check_interval=CHECK_INTERVAL,
+                 keep=KEEP_VERSIONS, background=True):
+        self.path = path
+        self.archive_dir = archive_dir
+        self.check_interval = check_interval
+        self.keep = keep
+        self.background = background
+
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()  # version -> Questionnaire (LRU)
+        self._reloading = False
+        self._last_check = 0.0
+        self._stat = None
+        self._current = None
+        self.reload()
+        if self._current is None:
+            raise RuntimeError(f"could not load content from {path}")
+
+    # -- 조회 ----------------------------------------------------------------
+    def current(self):
+        """최신 질문지. 필요하면 백그라운드 재컴파일을 시작하지만 기다리지 않는다."""
+        self._maybe_reload()
+        return self._current
+
+    def get(self, version):
+        """특정 버전의 질문지 (없으면 None)"""
+        if not version:
+            return None
+        with self._lock:
+            qn = self._versions.get(version)
+            if qn is not None:
+                self._versions.move_to_end(version)
+                return qn
+        try:
+            with open(os.path.join(self.archive_dir, f"{version}.json"), "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if content_version(raw) != version:
+            logger.warning("archived content %s does not match its hash", version)
+            return None
+        qn = compile_raw(raw, version)
+        self._remember(qn)
+        return qn
+
+    def versions(self):
+        with self._lock:
+            return list(self._versions)
+
+    # -- 갱신 ----------------------------------------------------------------
+    def _file_stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        try:
+            stat = self._file_stat()
+        except OSError:
+            return
+        if stat == self._stat:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        if self.background:
+            threading.Thread(target=self.reload, name="cbti-content-reload", daemon=True).start()
+        else:
+            self.reload()
+
+    def reload(self):
+        """파일을 읽어 내용이 바뀌었으면 새 버전으로 교체한다. 새 버전을 돌려준다 (실패하면 None)."""
+        try:
+            stat = self._file_stat()
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            version = content_version(raw)
+            if self._current is not None and version == self._current.version:
+                self._stat = stat
+                return self._current
+            qn = self.get(version) or compile_raw(raw, self.path)
+            self._archive(version, raw)
+            self._current = qn  # 참조 하나만 바꾸므로 읽는 쪽은 잠금 없이 옛 버전이나 새 버전 중 하나를 본다
+            self._remember(qn)
+            self._stat = stat
+            logger.info("content version %s loaded from %s", version, self.path)
+            return qn
+        except Exception:
+            logger.exception("could not load content from %s, keeping version %s", self.path,
+                             self._current.version if self._current else None)
+            # 같은 잘못된 파일을 계속 다시 읽지 않도록 stat 은 기록한다
+            try:
+                self._stat = self._file_stat()
+            except OSError:
+                pass
+            return None
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def _remember(self, qn):
+        with self._lock:
+            self._versions[qn.version] = qn
+            self._versions.move_to_end(qn.version)
+            while len(self._versions) > self.keep:
+                oldest = next(iter(self._versions))
+                if self._current is not None and oldest == self._current.version:
+                    self._versions.move_to_end(oldest)
+                    continue
+                del self._versions[oldest]
+
+    def _archive(self, version, raw):
+        path = os.path.join(self.archive_dir, f"{version}.json")
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            assets.write_atomic(path, raw)  # 여러 워커가 같은 버전을 동시에 보관해도 서로의 임시 파일을 덮지 않는다
+        except OSError:
+            logger.exception("could not archive content version %s", version)
+
+
+def default_store():
+    """프로세스 전체에서 공유하는 data/content.json 저장소 (앱, API, CLI 공용)"""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = ContentStore()
+    return _default
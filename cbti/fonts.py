@@ -0,0 +1,238 @@
+"""웹폰트 서브셋 빌드.
+
+Noto Sans KR 원본(NotoSansKR*.ttf|otf, 가변 폰트 또는 굵기별 파일) 또는 Noto Sans CJK 원본
+(NotoSansCJK*.ttc 안의 KR 글꼴, NotoSansCJK*.otf)에서 실제로 화면에 나오는 글자(data/content.json 의
+질문/유형/선택지, app.py 와 결과 화면 템플릿의 UI 문자열, ASCII)만 남긴 woff2 를 static/fonts/ 에 만든다.
+파일 이름은 글자 집합과 원본 폰트의 해시라서 내용이 바뀌면 새 파일이 생기고, 같으면 다시 만들지 않는다.
+
+원본 폰트는 용량이 커서 저장소에 두지 않는다. 배포 전에 빌드해서 static/fonts/ 를 커밋하고, 앱은
+manifest 만 읽는다 (요청 경로에서 빌드하지 않음). 문구에 새 글자가 생겼는데 다시 빌드하지 않았으면
+경고 로그만 남기고, 빠진 글자는 브라우저가 대체 글꼴로 그린다. 서브셋이 없으면 Google Fonts 를 불러온다.
+
+    python -m cbti.fonts --source "NotoSansKR[wght].ttf"  # 가변 폰트 하나로 모든 굵기
+    python -m cbti.fonts --source NotoSansCJK-Regular.ttc --source NotoSansCJKkr-Bold.otf
+
+굵기마다 원본을 따로 줄 때는 모두 KR 글꼴이어야 한다. TC/SC/JP 글꼴은 한글은 같아도 따옴표(“ ” ‘ ’)가
+전각(1em)이라서 굵은 글씨에서만 간격이 벌어진다.
+    python -m cbti.fonts --check  # 커밋된 서브셋이 지금 문구의 글자를 모두 담고 있는지
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+
+from cbti import assets
+from cbti.content import BASE_DIR, CONTENT_PATH
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = os.path.join(BASE_DIR, "fonts")
+SOURCE_PATTERNS = ("NotoSansKR*.ttf", "NotoSansKR*.otf", "NotoSansCJK*.ttc", "NotoSansCJK*.otf")
+OUTPUT_DIR = os.path.join(BASE_DIR, "static", "fonts")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+# Streamlit 정적 파일 서빙 경로 (페이지 기준 상대 경로)
+URL_PREFIX = "app/static/fonts/"
+
+# 화면에 글자가 나오는 파일들
+TEXT_SOURCES = [CONTENT_PATH, os.path.join(BASE_DIR, "app.py"), os.path.join(BASE_DIR, "cbti", "render.py")]
+FAMILY = "CBTI Noto Sans KR"
+# 서브셋이 없거나 아직 로드되지 않았을 때 쓰는 글꼴
+FALLBACK_STACK = "'Noto Sans KR', 'Apple SD Gothic Neo', 'Malgun Gothic', 'Nanum Gothic', sans-serif"
+# 서브셋이 없을 때 불러오는 웹폰트 (서브셋 도입 전과 같은 요청)
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;700&display=swap"
+# 폰트 모음(TTC)에서 고를 글꼴: family 이름에 이 언어 표시가 있는 것 ("Noto Sans CJK KR")
+COLLECTION_LANGUAGE = "KR"
+# 빌드 규칙이 바뀌면 올려서 기존 서브셋을 무효화한다.
+BUILD_VERSION = 2
+
+
+def used_characters(paths=TEXT_SOURCES):
+    """서브셋에 넣을 글자 (ASCII 출력 문자 + 텍스트 파일에 나오는 비ASCII 글자)"""
+    chars = {chr(c) for c in range(0x20, 0x7F)}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            chars.update(ch for ch in f.read() if ord(ch) > 0x7F and ch.isprintable())
+    return "".join(sorted(chars))
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def find_sources(source_dir=SOURCE_DIR):
+    found = []
+    for pattern in SOURCE_PATTERNS:
+        found.extend(glob.glob(os.path.join(source_dir, pattern)))
+    return sorted(found)
+
+
+def _open_font(path):
+    """원본 폰트를 연다. TTC 는 family 이름에 COLLECTION_LANGUAGE 가 있는 글꼴을 고른다."""
+    from fontTools.ttLib import TTCollection, TTFont
+
+    if not path.lower().endswith(".ttc"):
+        return TTFont(path, recalcBBoxes=False)
+    collection = TTCollection(path, lazy=True)
+    try:
+        families = [font["name"].getDebugName(1) or "" for font in collection.fonts]
+    finally:
+        collection.close()
+    for number, family in enumerate(families):
+        if COLLECTION_LANGUAGE in family.split():
+            return TTFont(path, fontNumber=number, recalcBBoxes=False)
+    raise ValueError(f"{path}: no {COLLECTION_LANGUAGE} font in collection ({', '.join(families)})")
+
+
+def _output_stem(path, font):
+    # 모음 파일 이름에는 언어가 없으므로 PostScript 이름(NotoSansCJKkr-Regular)을 쓴다
+    if path.lower().endswith(".ttc"):
+        return font["name"].getDebugName(6)
+    return os.path.splitext(os.path.basename(path))[0].replace("[", "-").replace("]", "")
+
+
+def _css_weight(font):
+    """가변 폰트는 wght 축 범위("100 900"), 아니면 usWeightClass"""
+    if "fvar" in font:
+        axis = next((a for a in font["fvar"].axes if a.axisTag == "wght"), None)
+        if axis:
+            return f"{int(axis.minValue)} {int(axis.maxValue)}"
+    return str(font["OS/2"].usWeightClass)
+
+
+def subset_font(path, text):
+    """원본 폰트 하나를 text 글자만 남긴 woff2 bytes 로 만든다. (bytes, font-weight, 파일 이름 앞부분)"""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = [1, 2]
+    options.notdef_outline = True
+    options.drop_tables += ["TSI0", "TSI1", "TSI2", "TSI3", "TSI5"]  # VTT 힌팅 원본 (웹에서는 불필요)
+    font = _open_font(path)
+    weight, stem = _css_weight(font), _output_stem(path, font)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    font.flavor = "woff2"
+    font.save(buf)
+    return buf.getvalue(), weight, stem
+
+
+def build_digest(text, sources):
+    h = hashlib.sha256(f"{BUILD_VERSION}\n{text}".encode("utf-8"))
+    for path in sources:
+        h.update(os.path.basename(path).encode("utf-8"))
+        h.update(assets.digest(path).encode("ascii"))
+    return h.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != BUILD_VERSION:
+        return {}
+    if not all(os.path.exists(os.path.join(OUTPUT_DIR, face["file"])) for face in manifest.get("faces", [])):
+        return {}
+    return manifest
+
+
+def is_stale(manifest, text=None):
+    """서브셋을 만든 뒤 화면 문구의 글자 집합이 바뀌었는지"""
+    if text is None:
+        text = used_characters()
+    return manifest.get("text_sha256") != text_digest(text)
+
+
+def build(force=False, log=None, source_dir=SOURCE_DIR, sources=None):
+    """원본 폰트(sources, 없으면 source_dir)로 서브셋을 (필요할 때만) 만들고 manifest 를 돌려준다.
+    원본이 없으면 기존 manifest."""
+    sources = sorted(sources) if sources else find_sources(source_dir)
+    manifest = load_manifest()
+    if not sources:
+        if log:
+            log(f"no source fonts in {source_dir} ({', '.join(SOURCE_PATTERNS)})")
+        return manifest
+    text = used_characters()
+    digest = build_digest(text, sources)
+    if not force and manifest.get("sha256") == digest:
+        return manifest
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    faces = []
+    for path in sources:
+        data, weight, stem = subset_font(path, text)
+        name = f"{stem}-{digest[:12]}.woff2"
+        assets.write_atomic(os.path.join(OUTPUT_DIR, name), data)
+        faces.append({"file": name, "weight": weight, "bytes": len(data), "source_bytes": os.path.getsize(path)})
+        if log:
+            log(f"built {name}: {os.path.getsize(path):,}B -> {len(data):,}B (weight {weight})")
+
+    # 이전 해시의 서브셋 정리
+    keep = {face["file"] for face in faces}
+    for name in os.listdir(OUTPUT_DIR):
+        if name.endswith(".woff2") and name not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+
+    manifest = {"version": BUILD_VERSION, "sha256": digest, "text_sha256": text_digest(text), "glyphs": len(text),
+                "faces": faces}
+    assets.write_atomic(MANIFEST_PATH, (json.dumps(manifest, ensure_ascii=False, indent=2) + "\n").encode("utf-8"))
+    return manifest
+
+
+def font_face_css(manifest, url_prefix=URL_PREFIX):
+    """manifest 의 서브셋으로 @font-face 규칙과 font-family 값을 만든다. 서브셋이 없으면 Google Fonts @import."""
+    faces = manifest.get("faces", [])
+    if not faces:
+        return f"@import url('{GOOGLE_FONTS_CSS}');", FALLBACK_STACK
+    rules = [
+        f"@font-face {{ font-family: '{FAMILY}'; src: url('{url_prefix}{face['file']}') format('woff2'); "
+        f"font-weight: {face['weight']}; font-style: normal; font-display: swap; }}"
+        for face in faces
+    ]
+    return "\n".join(rules), f"'{FAMILY}', {FALLBACK_STACK}"
+
+
+def load_for_app():
+    """앱 시작 시 호출: 커밋된 manifest 만 읽는다 (빌드하지 않음). 최신이 아니면 경고만 남긴다."""
+    manifest = load_manifest()
+    if not manifest:
+        logger.warning("no font subsets in %s, using Google Fonts", OUTPUT_DIR)
+    elif is_stale(manifest):
+        logger.warning("font subsets in %s miss characters added to the text; rebuild with python -m cbti.fonts",
+                       OUTPUT_DIR)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Noto Sans KR 웹폰트 서브셋(woff2) 빌드")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 다시 빌드")
+    parser.add_argument("--source-dir", default=SOURCE_DIR, help="원본 폰트 폴더 (기본: fonts/)")
+    parser.add_argument("--source", action="append", help="원본 폰트 파일 (여러 번 지정, 주면 --source-dir 대신 사용)")
+    parser.add_argument("--check", action="store_true", help="빌드하지 않고 커밋된 서브셋이 최신인지만 확인")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        manifest = load_manifest()
+        if not manifest or is_stale(manifest):
+            print(f"font subsets in {OUTPUT_DIR} are missing or stale", file=sys.stderr)
+            return 1
+        print(f"{len(manifest['faces'])} faces, {manifest['glyphs']} glyphs: up to date")
+        return 0
+
+    manifest = build(force=args.force, log=print, source_dir=args.source_dir, sources=args.source)
+    total = sum(face["bytes"] for face in manifest.get("faces", []))
+    print(f"{len(manifest.get('faces', []))} faces, {manifest.get('glyphs', 0)} glyphs -> {OUTPUT_DIR} ({total:,}B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
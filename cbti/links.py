@@ -0,0 +1,70 @@
+"""결과 공유 링크 (쿼리 파라미터 인코딩).
+
+    https://faithcheck.streamlit.app/?type=TDPL&s=489,500,500,500
+
+type 은 유형 코드, s 는 PARTS_KEY 순서의 축 평균 × 100 (render.quantize 와 같은 자릿수)이다.
+링크를 연 사람은 설문 없이 바로 결과 화면을 보고, 같은 (유형, 점수) 조각은 렌더링 캐시에서 나온다.
+링크는 누구나 고칠 수 있으므로 s 에서 채점 규칙으로 다시 낸 글자가 type 과 다르면 받지 않는다.
+
+결과를 낸 본인의 주소창에는 OWNER_PARAM(?mine=1)을 더 붙인다. 새로고침해도 친구용 문구 대신
+내 결과로 보여 주기 위한 표시이고, 화면에 보여 주는 공유 링크(result_url)에는 넣지 않는다.
+"""
+from urllib.parse import urlencode
+
+from cbti.scoring import AXIS_LETTERS, THRESHOLD
+
+APP_URL = "https://faithcheck.streamlit.app/"
+SCALE = 100
+MAX_SCORE = 10
+OWNER_PARAM = "mine"
+
+
+def result_params(res_code, avg, parts):
+    return {"type": res_code, "s": ",".join(str(round(avg[p] * SCALE)) for p in parts)}
+
+
+def result_url(params, base=APP_URL):
+    return f"{base}?{urlencode(params, safe=',')}"
+
+
+def owner_params(params):
+    """결과를 낸 본인의 주소창에 쓰는 파라미터 (공유 파라미터 + OWNER_PARAM)"""
+    return {**params, OWNER_PARAM: "1"}
+
+
+def is_owner(params):
+    return OWNER_PARAM in params
+
+
+def matches_code(code, raw, letters=AXIS_LETTERS, threshold=THRESHOLD):
+    """정수 점수(× SCALE)로 채점 규칙의 글자를 다시 내어 code 와 맞는지.
+    반올림으로 경계(5.00)에 걸린 축은 두 글자 모두 인정한다."""
+    for letter, value, (low, high) in zip(code, raw, letters):
+        diff = value - threshold * SCALE
+        if abs(diff) <= 0.5:
+            ok = letter in (low, high)
+        else:
+            ok = letter == (high if diff > 0 else low)
+        if not ok:
+            return False
+    return True
+
+
+def parse_result_params(params, codes, n_axes=len(AXIS_LETTERS)):
+    """쿼리 파라미터에서 (유형 코드, 점수 튜플 또는 None) 을 꺼낸다. 공유 링크가 아니거나 잘못됐으면 None.
+
+    점수가 없거나 형식이 틀리면 유형 페이지만 보여 주도록 점수는 None 으로 돌려준다.
+    점수가 유형 코드와 맞지 않으면 (손으로 고친 링크) 공유 링크로 보지 않는다.
+    """
+    code = str(params.get("type", "")).upper()
+    if code not in codes:
+        return None
+    try:
+        raw = [int(v) for v in str(params.get("s", "")).split(",")]
+    except ValueError:
+        return code, None
+    if len(raw) != n_axes or not all(0 <= v <= MAX_SCORE * SCALE for v in raw):
+        return code, None
+    if not matches_code(code, raw):
+        return None
+    return code, tuple(v / SCALE for v in raw)
@@ -0,0 +1,225 @@
+"""프로세스 내 계측 (타이머, 카운터).
+
+app.py 의 주요 구간(CSS, 질문 렌더링, 채점, 롤모델 이미지, 차트)과 rerun 전체 시간을 잰다.
+rerun 수, 단계 이동, 미응답 경고, 유형별 완료 수도 센다. 관측값은 라벨별로 최근 WINDOW 개만
+보관하고(rolling), 분위수는 내보낼 때만 계산하므로 기록 비용은 append 한 번이다.
+
+내보내기: REGISTRY.to_prometheus() (Prometheus text 0.0.4) / REGISTRY.to_dict() (JSON)
+    serve(9108)  # 백그라운드 스레드에서 /metrics, /metrics.json 제공
+"""
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(text, quote=True):
+    # Prometheus text 형식: 라벨 값은 \, ", 줄바꿈 / HELP 는 \, 줄바꿈을 이스케이프한다
+    text = str(text).replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quote else text
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    # 정수는 그대로, 실수는 repr (반올림 없이 왕복 가능한 가장 짧은 표현)
+    if isinstance(value, int):
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _quantile(sorted_values, q):
+    # nearest-rank
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, key, v) for key, v in items]
+
+    def to_dict(self):
+        with self._lock:
+            return {_format_labels(key) or "total": v for key, v in sorted(self._values.items())}
+
+
+class Summary:
+    """누적 count/sum 과 최근 window 개 관측값의 분위수"""
+    kind = "summary"
+
+    def __init__(self, name, help, window=WINDOW):
+        self.name = name
+        self.help = help
+        self.window = window
+        self._series = {}  # labels -> [count, sum, deque]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0, 0.0, deque(maxlen=self.window)]
+            series[0] += 1
+            series[1] += value
+            series[2].append(value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        """{labels: (count, sum, 정렬된 최근 관측값)}"""
+        with self._lock:
+            items = [(key, s[0], s[1], list(s[2])) for key, s in self._series.items()]
+        return {key: (count, total, sorted(recent)) for key, count, total, recent in sorted(items)}
+
+    def samples(self):
+        out = []
+        for key, (count, total, recent) in self.snapshot().items():
+            for q in QUANTILES:
+                out.append((self.name, key + (("quantile", q),), _quantile(recent, q)))
+            out.append((self.name + "_sum", key, total))
+            out.append((self.name + "_count", key, count))
+        return out
+
+    def to_dict(self):
+        out = {}
+        for key, (count, total, recent) in self.snapshot().items():
+            out[_format_labels(key) or "total"] = {
+                "count": count,
+                "sum": total,
+                "window": len(recent),
+                **{f"p{round(q * 100)}": _quantile(recent, q) for q in QUANTILES},
+            }
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name!r} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def summary(self, name, help="", window=WINDOW):
+        return self._get(Summary, name, help, window=window)
+
+    def to_prometheus(self):
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {_escape(metric.help, quote=False)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, key, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        return {name: metric.to_dict() for name, metric in sorted(self._metrics.items())}
+
+
+# 프로세스 전체에서 하나를 쓴다 (모든 세션 공유)
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.summary("cbti_phase_seconds", "Time spent in a phase of one script run")
+RERUN_SECONDS = REGISTRY.summary("cbti_rerun_seconds", "Wall time of a completed script run")
+SESSION_RERUNS = REGISTRY.summary("cbti_session_reruns", "Script runs a session needed to reach its result")
+RERUNS = REGISTRY.counter("cbti_reruns_total", "Script runs")
+STEP_TRANSITIONS = REGISTRY.counter("cbti_step_transitions_total", "Questionnaire page changes")
+UNANSWERED_WARNINGS = REGISTRY.counter("cbti_unanswered_warnings_total", "Submits with unanswered questions")
+COMPLETIONS = REGISTRY.counter("cbti_completions_total", "Completed questionnaires by result type")
+SKIPPED_QUESTIONS = REGISTRY.counter("cbti_skipped_questions_total", "Questions skipped by adaptive mode, by part")
+SHARED_VIEWS = REGISTRY.counter("cbti_shared_views_total", "Result pages opened from a shared link")
+
+
+def phase(name, **labels):
+    """with phase("css"): ... — 구간 시간을 PHASE_SECONDS 에 기록"""
+    return PHASE_SECONDS.time(phase=name, **labels)
+
+
+# -----------------------------------------------------------------------------
+# HTTP 노출 (선택)
+# -----------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, content_type = self.registry.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(self.registry.to_dict(), ensure_ascii=False), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics %s", format % args)
+
+
+def serve(port, host="0.0.0.0", registry=REGISTRY):
+    """/metrics 와 /metrics.json 을 데몬 스레드에서 제공하고 서버를 돌려준다."""
+    handler = type("Handler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="cbti-metrics", daemon=True).start()
+    return server
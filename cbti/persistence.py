@@ -0,0 +1,256 @@
+"""완료된 결과의 비동기 일괄 저장 (write-behind).
+
+결과 화면은 submit() 으로 큐에 넣기만 하고 바로 렌더링을 계속한다. 백그라운드 스레드가
+모아서 sink.write(rows) 한 번으로 내보내고(Google Sheets 는 append_rows), 실패하면 지수 백오프로
+재시도한다. 프로세스 종료 시(atexit) 남은 큐를 비우고, 끝내 못 보낸 결과는 fallback 파일에 남긴다.
+
+sink 설정 (make_sink):
+    {"sink": "gsheets", "spreadsheet": "<key 또는 URL>", "worksheet": "results", "service_account": {...}}
+    {"sink": "sqlite", "path": "data/results.sqlite3"}
+    {"sink": "jsonl", "path": "data/results.jsonl"}
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from cbti.content import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = os.path.join(BASE_DIR, "data", "results.sqlite3")
+DEFAULT_FALLBACK_PATH = os.path.join(BASE_DIR, "data", "unsent_results.jsonl")
+
+COLUMNS = ["timestamp", "res_code", "theology", "drive", "society", "culture", "answers"]
+
+
+def make_record(answers, avg, res_code, parts):
+    """결과 한 건을 저장용 dict 로 만든다. answers 는 선택지 인덱스를 이은 문자열 (미응답은 '-')."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "res_code": res_code,
+        **{part.lower(): round(avg[part], 4) for part in parts},
+        "answers": "".join(str(a) if a < 10 else "-" for a in answers),
+    }
+
+
+def to_row(record):
+    return [record.get(c, "") for c in COLUMNS]
+
+
+# -----------------------------------------------------------------------------
+# Sinks: write(records) 는 한 번의 배치 쓰기. 실패하면 예외를 던진다 (재시도는 writer 담당).
+# -----------------------------------------------------------------------------
+class ResultSink:
+    # 연속 호출 사이의 최소 간격(초). Sheets 쓰기 할당량(분당 60회)을 넘지 않도록 한다.
+    min_interval = 0.0
+
+    def write(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class GoogleSheetsSink(ResultSink):
+    min_interval = 1.1
+
+    def __init__(self, spreadsheet, worksheet="results", service_account=None):
+        import gspread
+
+        client = gspread.service_account_from_dict(service_account) if service_account else gspread.service_account()
+        book = client.open_by_url(spreadsheet) if spreadsheet.startswith("http") else client.open_by_key(spreadsheet)
+        try:
+            self.worksheet = book.worksheet(worksheet)
+        except gspread.WorksheetNotFound:
+            self.worksheet = book.add_worksheet(worksheet, rows=1000, cols=len(COLUMNS))
+            self.worksheet.append_row(COLUMNS)
+
+    def write(self, records):
+        self.worksheet.append_rows([to_row(r) for r in records], value_input_option="RAW")
+
+
+class SQLiteSink(ResultSink):
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # writer 스레드에서만 쓰므로 check_same_thread 는 끈다
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS results ({', '.join(COLUMNS)})")
+        self.conn.commit()
+
+    def write(self, records):
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO results VALUES ({', '.join('?' * len(COLUMNS))})",
+                [to_row(r) for r in records],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+
+    def write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def make_sink(config):
+    config = dict(config or {})
+    kind = config.pop("sink", "sqlite")
+    if kind == "gsheets":
+        return GoogleSheetsSink(config["spreadsheet"], config.get("worksheet", "results"), config.get("service_account"))
+    if kind == "sqlite":
+        return SQLiteSink(config.get("path", DEFAULT_SQLITE_PATH))
+    if kind == "jsonl":
+        return JsonlSink(config["path"])
+    raise ValueError(f"unknown result sink {kind!r}")
+
+
+# -----------------------------------------------------------------------------
+# Write-behind writer
+# -----------------------------------------------------------------------------
+class WriteBehindWriter:
+    """결과를 큐에 모았다가 백그라운드 스레드에서 배치로 sink 에 쓴다.
+
+    - batch_size 개가 모이거나 flush_interval 초가 지나면 한 번에 쓴다.
+    - 실패하면 backoff_base * 2^n (최대 backoff_max, 지터 포함) 만큼 쉬고 같은 배치를 다시 쓴다.
+    - close() 는 남은 큐를 모두 쓰고, 그래도 실패한 배치는 fallback sink(JSONL)에 남긴다.
+      제한 시간 안에 스레드가 끝나지 않으면 쓰는 중이던 배치도 fallback 에 남긴다. 이때 그 배치는 sink 와
+      fallback 양쪽에 들어갈 수 있다 (유실 대신 중복을 택함). sink 는 스레드가 멈춘 뒤에만 닫는다.
+    """
+
+    def __init__(self, sink, batch_size=200, flush_interval=5.0, backoff_base=1.0, backoff_max=60.0,
+                 shutdown_attempts=3, fallback=None):
+        self.sink = sink
+        self.fallback = fallback or JsonlSink(DEFAULT_FALLBACK_PATH)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.shutdown_attempts = shutdown_attempts
+
+        self.queue = queue.Queue()
+        self.stats = {"submitted": 0, "written": 0, "batches": 0, "retries": 0, "spilled": 0}
+        self._lock = threading.Lock()  # stats 와 _inflight 보호 (세션 스레드, writer 스레드, close 가 함께 씀)
+        self._inflight = None  # writer 스레드가 쓰고 있는 배치 (close 가 가져가면 None)
+        self._stop = threading.Event()
+        self._last_call = 0.0
+        self._thread = threading.Thread(target=self._run, name="cbti-result-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        """결과 한 건을 큐에 넣는다. 네트워크를 기다리지 않는다."""
+        self._count("submitted", 1)
+        self.queue.put_nowait(record)
+
+    def _count(self, key, n):
+        with self._lock:
+            self.stats[key] += n
+
+    def _owns(self, batch):
+        # close() 가 이 배치를 가져가 fallback 에 남겼으면 False
+        with self._lock:
+            return self._inflight is batch
+
+    def _next_batch(self):
+        # 첫 건은 종료 신호를 확인하며 기다리고, 그 뒤 flush_interval 동안 batch_size 개까지 모은다
+        batch = []
+        while not batch:
+            try:
+                batch.append(self.queue.get(timeout=0.5))
+            except queue.Empty:
+                if self._stop.is_set():
+                    return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = 0 if self._stop.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=min(remaining, 0.5)) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                if remaining <= 0:
+                    break
+        return batch
+
+    def _write(self, batch):
+        attempt = 0
+        while True:
+            wait = self.sink.min_interval - (time.monotonic() - self._last_call)
+            if wait > 0:
+                time.sleep(wait)
+            if not self._owns(batch):
+                return True
+            self._last_call = time.monotonic()
+            try:
+                self.sink.write(batch)
+                self._count("written", len(batch))
+                self._count("batches", 1)
+                return True
+            except Exception:
+                attempt += 1
+                self._count("retries", 1)
+                logger.warning("result sink write failed (attempt %d, %d rows)", attempt, len(batch), exc_info=True)
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                if self._stop.is_set():
+                    # 종료 중에는 짧게 몇 번만 더 시도하고 fallback 으로 넘긴다
+                    if attempt >= self.shutdown_attempts:
+                        return False
+                    time.sleep(min(delay, 0.5))
+                else:
+                    self._stop.wait(delay)
+
+    def _spill(self, batch):
+        try:
+            self.fallback.write(batch)
+            self._count("spilled", len(batch))
+        except Exception:
+            logger.exception("could not spill %d results to fallback", len(batch))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                with self._lock:
+                    self._inflight = batch
+                ok = self._write(batch)
+                with self._lock:
+                    mine = self._inflight is batch
+                    self._inflight = None
+                if not ok and mine:
+                    self._spill(batch)
+            if self._stop.is_set() and self.queue.empty():
+                return
+
+    def close(self, timeout=30.0):
+        """남은 큐를 모두 내보내고 스레드를 멈춘다 (여러 번 불러도 안전)."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        # 스레드가 시간 안에 못 끝낸 나머지(쓰는 중이던 배치 포함)는 파일로 남긴다
+        with self._lock:
+            rest, self._inflight = list(self._inflight or ()), None
+        while True:
+            try:
+                rest.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if rest:
+            self._spill(rest)
+        if self._thread.is_alive():
+            # sink.write 안에 있는 스레드와 동시에 닫지 않는다 (데몬 스레드라 프로세스 종료를 막지는 않음)
+            logger.warning("result writer did not stop within %.1fs, leaving the sink open", timeout)
+            return
+        self.sink.close()
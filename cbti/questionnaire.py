@@ -0,0 +1,120 @@
+"""미리 컴파일된 불변 질문지.
+
+Streamlit은 라디오를 누를 때마다 스크립트 전체를 다시 실행하므로, 파트별 문항 목록과 문항 번호를
+매번 questions_data 에서 다시 걸러내지 않도록 한 번만 만들어 세션 간에 공유한다.
+(앱에서는 st.cache_resource 로 프로세스당 한 번 생성)
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+from cbti.content import CONTENT_PATH, load_content
+from cbti.scoring import AXIS_LETTERS, Scorer
+
+
+@dataclass(frozen=True)
+class Part:
+    key: str  # PARTS_KEY 값 (예: "Theology")
+    axis_name: str  # 화면 표시용 축 이름 (예: "Theology (신학)")
+    start: int  # 전체 문항 중 이 파트의 시작 위치 (0부터)
+    stop: int
+    texts: tuple
+    numbers: tuple  # 화면에 보이는 전체 문항 번호 (1부터)
+    widget_keys: tuple  # 라디오 위젯 key
+    reverse: np.ndarray  # 역채점 여부 (읽기 전용)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def rows(self):
+        """(전체 인덱스, 문항 번호, 위젯 key, 문항 텍스트)"""
+        return zip(range(self.start, self.stop), self.numbers, self.widget_keys, self.texts)
+
+    def n_blocks(self, block_size=None):
+        """block_size 문항씩 나눈 페이지 수 (None 이면 파트 전체가 한 페이지)"""
+        return -(-len(self) // block_size) if block_size else 1
+
+    def block_rows(self, block, block_size=None):
+        """block 번째(0부터) 페이지의 rows()"""
+        if not block_size:
+            return self.rows()
+        lo, hi = block * block_size, min(len(self), (block + 1) * block_size)
+        return zip(range(self.start + lo, self.start + hi), self.numbers[lo:hi], self.widget_keys[lo:hi],
+                   self.texts[lo:hi])
+
+
+@dataclass(frozen=True)
+class Questionnaire:
+    parts: tuple
+    options: tuple
+    score_map: MappingProxyType
+    type_details: MappingProxyType
+    questions: tuple
+    scorer: Scorer
+    version: str = ""  # 콘텐츠 버전 (content.json 내용 해시, cbti/content_store.py)
+
+    @property
+    def n_questions(self):
+        return len(self.questions)
+
+    def part(self, step):
+        """step(1부터)에 해당하는 Part"""
+        return self.parts[step - 1]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_questionnaire(content, version=""):
+    """load_content() 결과를 Questionnaire 로 컴파일한다.
+
+    같은 파트의 문항은 질문지에서 연속해 있어야 한다 (파트별 슬라이스로 관리).
+    """
+    questions = content["questions"]
+    part_keys = content["parts"]
+
+    parts = []
+    for part_no, (key, axis_name) in enumerate(zip(part_keys, content["axis_names"])):
+        idx = [i for i, q in enumerate(questions) if q["part"] == key]
+        if not idx:
+            raise ValueError(f"part {key!r} has no questions")
+        start, stop = idx[0], idx[-1] + 1
+        if idx != list(range(start, stop)):
+            raise ValueError(f"questions of part {key!r} must be contiguous")
+        if parts and start != parts[-1].stop:
+            raise ValueError(f"part {key!r} must follow {parts[-1].key!r}")
+
+        reverse = np.array([bool(questions[i]["reverse"]) for i in idx])
+        reverse.flags.writeable = False
+        parts.append(Part(
+            key=key,
+            axis_name=axis_name,
+            start=start,
+            stop=stop,
+            texts=tuple(questions[i]["text"] for i in idx),
+            numbers=tuple(i + 1 for i in idx),
+            widget_keys=tuple(f"q_{key}_{n}" for n in range(len(idx))),
+            reverse=reverse,
+        ))
+    if parts[-1].stop != len(questions):
+        raise ValueError("every question must belong to one of the parts")
+
+    return Questionnaire(
+        parts=tuple(parts),
+        options=tuple(content["options"]),
+        score_map=_freeze(content["score_map"]),
+        type_details=_freeze(content["types"]),
+        questions=_freeze(questions),
+        scorer=Scorer(questions, content["options"], content["score_map"], part_keys, AXIS_LETTERS),
+        version=version,
+    )
+
+
+def load_questionnaire(path=CONTENT_PATH):
+    return compile_questionnaire(load_content(path))
@@ -0,0 +1,115 @@
+"""결과 화면 조각(HTML, 차트 스펙) 메모이제이션.
+
+결과 화면에서 사용자마다 달라지는 것은 유형 코드와 네 축 평균뿐이고, 평균은 (0/3.3/6.7/10 의 합) / 문항 수
+라서 가질 수 있는 값이 많지 않다. (res_code, 반올림한 평균) 을 키로 결과 카드, 롤모델 카드, Vega-Lite
+차트 스펙을 한 번만 만들고 LRU 캐시에서 돌려준다. pandas/Altair 객체는 만들지 않는다.
+"""
+import functools
+from typing import NamedTuple
+
+# 차트에 보이는 점수 자릿수 (캐시 키의 양자화 단위이기도 하다)
+SCORE_DECIMALS = 2
+CHART_LABELS = ["신학(T vs C)", "동력(D vs G)", "사회(P vs S)", "문화(L vs M)"]
+# [수정] 차트 색상 복구 (파랑, 빨강, 초록, 노랑)
+CHART_COLORS = ["#4B89DC", "#D9534F", "#5CB85C", "#F0AD4E"]
+
+PERSON_STYLES = {
+    "Bible": ("📖", "#e3f2fd"),
+    "Book": ("📚", "#f3e5f5"),
+    "Quote": ("💬", "#fff3e0"),
+}
+
+CARD_TEMPLATE = """<div class="result-card">
+    <h2 style='margin-bottom:0px; color:#666; font-size:1.2em;'>당신의 영적 유형은</h2>
+    <h1 style="color: #4B89DC; font-size: 3.5em; margin-top:5px; margin-bottom:10px;">{code}</h1>
+    <h3 style='margin-top:0px; font-weight:700; font-size:1.8em;'>{title}</h3>
+    <div style="margin: 20px 0;">
+        <span style="font-size: 1.1em; font-weight: bold; color: #555; background-color:#f1f3f5; padding:8px 20px; border-radius:30px;">
+            ❝ {slogan} ❞
+        </span>
+    </div>
+    <hr style='border: 0; height: 1px; background: #e0e0e0; margin: 20px 0;'>
+    <p style='font-size:1.1em; line-height:1.7; color:#333;'>{desc}</p>
+</div>"""
+
+NO_IMAGE_TEMPLATE = """<div style="background-color:#f8f9fa; height:150px; display:flex; align-items:center; justify-content:center; border-radius:8px; border:1px dashed #ced4da; color:#adb5bd; font-size:0.8em; margin-bottom:10px;">
+    {name}<br>(이미지 없음)
+</div>"""
+
+PERSON_TEMPLATE = """<div style="text-align:center;">
+    <div style="font-weight:bold; font-size:1.1em; margin-bottom:8px; color:#2c3e50;">
+        {name}
+    </div>
+    <div style="font-size:0.85em; color:#495057; background-color:{bg_color}; padding:10px; border-radius:8px; line-height:1.4; min-height:80px; display:flex; align-items:center; justify-content:center;">
+        <span>{icon} {text}</span>
+    </div>
+</div>"""
+
+
+class ResultView(NamedTuple):
+    card_html: str
+    people_html: tuple  # 롤모델 4명의 카드 (이미지 포함)
+    chart_spec: dict  # st.vega_lite_chart 에 넘기는 Vega-Lite 스펙 (공유 객체이므로 수정 금지, 점수가 없으면 None)
+
+
+def quantize(avg, parts):
+    """평균 dict 를 캐시 키로 쓸 튜플로 바꾼다 (PARTS_KEY 순서, SCORE_DECIMALS 자리 반올림)."""
+    return tuple(round(avg[p], SCORE_DECIMALS) for p in parts)
+
+
+def card_html(code, info):
+    return CARD_TEMPLATE.format(code=code, title=info["title"], slogan=info["slogan"], desc=info["desc"])
+
+
+def person_html(person, img_tag=None):
+    icon, bg_color = PERSON_STYLES.get(person.get("type", "Quote"), PERSON_STYLES["Quote"])
+    image = img_tag or NO_IMAGE_TEMPLATE.format(name=person["name"])
+    return image + "\n" + PERSON_TEMPLATE.format(name=person["name"], bg_color=bg_color, icon=icon, text=person["text"])
+
+
+def chart_spec(scores):
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "data": {"values": [{"지표": label, "점수": score} for label, score in zip(CHART_LABELS, scores)]},
+        "mark": {"type": "bar"},
+        "encoding": {
+            "x": {"field": "지표", "type": "nominal", "sort": None},
+            "y": {"field": "점수", "type": "quantitative", "scale": {"domain": [0, 10]}},
+            "color": {"field": "지표", "type": "nominal", "scale": {"range": CHART_COLORS}, "legend": None},
+            "tooltip": [{"field": "지표", "type": "nominal"}, {"field": "점수", "type": "quantitative"}],
+        },
+        "height": 250,
+    }
+
+
+class ResultRenderer:
+    """유형 정의와 롤모델 이미지로 결과 화면 조각을 만들고 LRU 캐시에 담아 둔다 (프로세스당 하나)."""
+
+    def __init__(self, type_details, images=None, maxsize=1024, fallback_code="TDPL"):
+        self.type_details = type_details
+        self.images = images or {}
+        self.fallback_code = fallback_code
+        self.render = functools.lru_cache(maxsize=maxsize)(self._render)
+        # 유형별 카드는 16개뿐이므로 평균과 무관하게 따로 공유한다
+        self.type_fragments = functools.lru_cache(maxsize=None)(self._type_fragments)
+
+    def _type_fragments(self, code):
+        info = self.type_details.get(code, self.type_details[self.fallback_code])
+        images = self.images.get(code, [])
+        people = tuple(
+            person_html(person, images[i] if i < len(images) else None)
+            for i, person in enumerate(info["people_data"])
+        )
+        return card_html(code, info), people
+
+    def _render(self, code, scores):
+        card, people = self.type_fragments(code)
+        return ResultView(card, people, chart_spec(scores) if scores is not None else None)
+
+    def warm(self):
+        """16개 유형 페이지(점수 없는 공유 링크)를 미리 만들어 둔다."""
+        for code in self.type_details:
+            self.render(code, None)
+
+    def cache_info(self):
+        return self.render.cache_info()
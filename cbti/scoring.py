@@ -0,0 +1,251 @@
+"""C-BTI 채점 엔진 (Streamlit 의존성 없음).
+
+결과 화면과 같은 규칙으로 채점한다.
+  - 선택지 점수는 SCORE_MAP, reverse 문항은 10 - 점수
+  - 파트(PARTS_KEY)별 평균, 평균이 5 이하이면 앞 글자(T/D/P/L), 아니면 뒤 글자(C/G/S/M)
+
+응답 한 건(길이 45) 또는 N×45 행렬을 한 번에 채점한다. 답은 OPTIONS 의 인덱스(0~3)이고
+UNANSWERED(-1)는 평균에서 빠진다.
+
+    python -m cbti.scoring responses.csv -o scored.csv
+    python -m cbti.scoring responses.jsonl -o scored.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+
+UNANSWERED = -1
+# 세션 답안 저장 형식: 문항당 1바이트(bytearray), 미응답은 0xFF. score() 는 이 형식도 그대로 받는다.
+NO_ANSWER = 0xFF
+THRESHOLD = 5
+# 축별 (평균 <= 5, 평균 > 5) 글자
+AXIS_LETTERS = (("T", "C"), ("D", "G"), ("P", "S"), ("L", "M"))
+
+
+class Scores(NamedTuple):
+    averages: np.ndarray  # (N, 4) 파트별 평균, PARTS_KEY 순서
+    codes: np.ndarray  # (N,) 유형 코드 문자열
+
+
+def _all_codes(letters):
+    codes = [""]
+    for low, high in letters:
+        codes = [c + l for c in codes for l in (low, high)]
+    return codes
+
+
+class Scorer:
+    """질문지/점수표로부터 채점용 배열을 한 번 만들어 두고 재사용한다.
+
+    파트 합계는 결과 화면의 for 루프와 똑같이 문항 순서대로 하나씩 더한다 (np.cumsum).
+    3.3/6.7 같은 부동소수는 더하는 순서에 따라 평균이 5 경계에서 달라질 수 있으므로,
+    재채점 결과가 사용자가 실제로 본 유형과 비트 단위로 같도록 순서를 맞춘다.
+    """
+
+    def __init__(self, questions, options, score_map, parts, letters=AXIS_LETTERS, threshold=THRESHOLD):
+        self.parts = list(parts)
+        self.options = list(options)
+        self.n_questions = len(questions)
+        self.threshold = threshold
+
+        option_scores = np.array([score_map[o] for o in options], dtype=np.float64)
+        reverse = np.array([bool(q["reverse"]) for q in questions])
+        part_idx = np.array([self.parts.index(q["part"]) for q in questions])
+
+        # keyed[option, question]: reverse 까지 반영된 점수
+        self.keyed = np.where(reverse[None, :], 10 - option_scores[:, None], option_scores[:, None])
+        # part_matrix[question, part] = 1 (문항이 속한 파트)
+        self.part_matrix = np.zeros((self.n_questions, len(self.parts)), dtype=np.int32)
+        self.part_matrix[np.arange(self.n_questions), part_idx] = 1
+        self.part_columns = [np.flatnonzero(part_idx == p) for p in range(len(self.parts))]
+        self.part_idx = part_idx
+        self.reverse = reverse
+        # 문항별로 역채점 후 점수가 가장 낮은/높은 선택지 (남은 문항의 최악/최선 응답)
+        self.low_fill = self.keyed.argmin(axis=0)
+        self.high_fill = self.keyed.argmax(axis=0)
+
+        # 코드 인덱스 = 축별 (평균 > 5) 비트를 앞 축부터 이어 붙인 값
+        self.code_table = np.array(_all_codes(letters))
+        self.bit_weights = 1 << np.arange(len(self.parts) - 1, -1, -1)
+
+    def score(self, answers):
+        """answers: (N, 45) 또는 (45,) 의 선택지 인덱스 (세션 답안 bytearray 포함).
+
+        Scores 를 돌려준다 (항상 2차원). 범위를 벗어난 값(UNANSWERED, NO_ANSWER)은 미응답.
+        """
+        a = np.atleast_2d(np.asarray(answers))
+        if a.shape[1] != self.n_questions:
+            raise ValueError(f"expected {self.n_questions} answers per response, got {a.shape[1]}")
+
+        answered = (a >= 0) & (a < len(self.options))
+        values = np.where(answered, self.keyed[np.where(answered, a, 0), np.arange(self.n_questions)], 0.0)
+
+        sums = np.zeros((a.shape[0], len(self.parts)))
+        for p, cols in enumerate(self.part_columns):
+            if len(cols):
+                sums[:, p] = np.cumsum(values[:, cols], axis=1)[:, -1]
+        counts = answered.astype(np.int32) @ self.part_matrix
+        averages = np.divide(sums, counts, out=np.zeros(sums.shape), where=counts > 0)
+
+        high = averages > self.threshold
+        codes = self.code_table[high.astype(np.int32) @ self.bit_weights]
+        return Scores(averages, codes)
+
+    def decided(self, answers):
+        """(N, 파트) bool: 아직 답하지 않은 문항을 어떻게 답해도 그 축의 글자가 바뀌지 않으면 True.
+
+        미응답을 모두 최저 점수로 채운 경우와 최고 점수로 채운 경우를 같은 규칙으로 채점해 비교한다.
+        평균은 답한 문항만으로 내므로, 결정된 축은 남은 문항을 건너뛰어도 글자가 같다.
+        """
+        a = np.atleast_2d(np.asarray(answers)).astype(np.int16)
+        unanswered = (a < 0) | (a >= len(self.options))
+        low = self.score(np.where(unanswered, self.low_fill, a)).averages
+        high = self.score(np.where(unanswered, self.high_fill, a)).averages
+        return (low > self.threshold) == (high > self.threshold)
+
+    def score_one(self, answers):
+        """응답 한 건을 채점해 ({파트: 평균}, 유형 코드) 를 돌려준다."""
+        result = self.score(answers)
+        avg = {part: float(v) for part, v in zip(self.parts, result.averages[0])}
+        return avg, str(result.codes[0])
+
+    def encode_labels(self, values):
+        """선택지 라벨/인덱스가 섞인 2차원 값을 선택지 인덱스 배열(int8)로 바꾼다."""
+        import pandas as pd
+
+        # 라벨과 인덱스(숫자 또는 "2" 같은 문자열)를 한 번의 dict 조회로 바꾼다
+        lookup = {label: i for i, label in enumerate(self.options)}
+        lookup.update({str(i): i for i in range(len(self.options))})
+        frame = pd.DataFrame(values)
+        index = np.full(frame.shape, np.nan)
+        for j, col in enumerate(frame.columns):
+            series = frame[col]
+            if pd.api.types.is_numeric_dtype(series):
+                index[:, j] = series.to_numpy(dtype=float, na_value=np.nan)
+                continue
+            mapped = series.map(lookup)
+            rest = mapped.isna() & series.notna()
+            if rest.any():  # 라벨이 아닌 나머지 ("2.0" 같은 문자열, object 열에 섞인 숫자)
+                mapped[rest] = pd.to_numeric(series[rest].astype(str).str.strip(), errors="coerce")
+            index[:, j] = mapped.to_numpy(dtype=float, na_value=np.nan)
+        valid = (index >= 0) & (index < len(self.options)) & (index == np.floor(index))
+        return np.where(valid, index, UNANSWERED).astype(np.int8)
+
+
+def new_answer_sheet(n_questions=None):
+    """모든 문항이 미응답인 세션 답안 배열"""
+    if n_questions is None:
+        n_questions = default_scorer().n_questions
+    return bytearray([NO_ANSWER]) * n_questions
+
+
+def default_scorer():
+    """현재 콘텐츠 버전의 공용 Scorer (data/content.json 이 바뀌면 새 버전의 것을 돌려준다)"""
+    from cbti.content_store import default_store
+
+    return default_store().current().scorer
+
+
+def score(answers):
+    return default_scorer().score(answers)
+
+
+def score_one(answers):
+    return default_scorer().score_one(answers)
+
+
+# -----------------------------------------------------------------------------
+# 배치 채점 CLI
+# -----------------------------------------------------------------------------
+def _question_columns(columns, id_column, n_questions):
+    named = [f"q{i + 1}" for i in range(n_questions)]
+    if all(c in columns for c in named):
+        return named
+    cols = [c for c in columns if c != id_column]
+    if len(cols) != n_questions:
+        raise ValueError(f"expected q1..q{n_questions} columns or exactly {n_questions} answer columns, got {len(cols)}")
+    return cols
+
+
+def _read_csv_chunks(path, id_column, scorer, chunksize):
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        cols = _question_columns(list(chunk.columns), id_column, scorer.n_questions)
+        ids = chunk[id_column].to_numpy() if id_column in chunk.columns else None
+        yield ids, scorer.encode_labels(chunk[cols])
+
+
+def _read_jsonl_chunks(path, id_column, scorer, chunksize):
+    def flush(ids, rows):
+        has_ids = any(i is not None for i in ids)
+        return (np.array(ids, dtype=object) if has_ids else None), scorer.encode_labels(rows)
+
+    ids, rows = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                ids.append(record.get(id_column))
+                record = record["answers"]
+            else:
+                ids.append(None)
+            rows.append([UNANSWERED if v is None else v for v in record])
+            if len(rows) >= chunksize:
+                yield flush(ids, rows)
+                ids, rows = [], []
+    if rows:
+        yield flush(ids, rows)
+
+
+def score_file(in_path, out_path, id_column="id", chunksize=200_000, scorer=None):
+    """CSV/JSONL 응답 파일을 청크 단위로 채점해 CSV/JSONL 로 쓴다. 채점한 건수를 돌려준다."""
+    import pandas as pd
+
+    scorer = scorer or default_scorer()
+    reader = _read_jsonl_chunks if in_path.endswith(".jsonl") else _read_csv_chunks
+    out_jsonl = out_path.endswith(".jsonl")
+
+    total = 0
+    first = True
+    with open(out_path, "w", encoding="utf-8", newline="") as out:
+        for ids, answers in reader(in_path, id_column, scorer, chunksize):
+            result = scorer.score(answers)
+            frame = pd.DataFrame(np.round(result.averages, 4), columns=scorer.parts)
+            frame["res_code"] = result.codes
+            if ids is not None:
+                frame.insert(0, id_column, ids)
+            if out_jsonl:
+                frame.to_json(out, orient="records", lines=True, force_ascii=False)
+            else:
+                frame.to_csv(out, index=False, header=first)
+            first = False
+            total += len(frame)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="C-BTI 응답 일괄 채점 (CSV/JSONL)")
+    parser.add_argument("input", help="응답 파일 (.csv: q1..q45 열 / .jsonl: {\"id\":..., \"answers\": [...]} 또는 리스트)")
+    parser.add_argument("-o", "--output", help="결과 파일 (.csv 또는 .jsonl, 기본: <input>.scored.csv)")
+    parser.add_argument("--id-column", default="id", help="그대로 결과에 옮길 ID 열 이름 (기본: id)")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.input)[0] + ".scored.csv"
+    started = time.perf_counter()
+    total = score_file(args.input, output, id_column=args.id_column, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - started
+    print(f"scored {total:,} responses -> {output} ({elapsed:.2f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""진행 중인 설문 세션 저장소 (재개 토큰).
+
+st.session_state 는 프로세스 메모리에만 있어서 재시작하면 사라지고, 여러 워커/호스트로 나누면
+sticky session 이 필요하다. 진행 상태(단계, 답안)를 URL 의 재개 토큰(?t=...) 으로 찾는 외부 저장소에
+페이지를 넘길 때마다 한 번씩 쓰고(라디오 클릭마다가 아님), 새 세션이 토큰을 가지고 오면 복원한다.
+ttl 동안 저장이 없으면 버려진 세션으로 보고 지운다.
+
+저장소 설정 (make_store):
+    {"store": "memory"}                                  # 프로세스 내 (기본)
+    {"store": "sqlite", "path": "data/sessions.sqlite3"}  # 한 호스트의 여러 워커
+    {"store": "redis", "url": "redis://host:6379/0"}      # 여러 호스트 (pip install redis)
+    공통: "ttl" (초, 기본 7일)
+"""
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from cbti.content import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = os.path.join(BASE_DIR, "data", "sessions.sqlite3")
+DEFAULT_TTL = 7 * 24 * 3600
+# 만료 항목 정리 주기 (저장 횟수)
+PURGE_EVERY = 200
+
+
+def new_token():
+    return secrets.token_urlsafe(16)
+
+
+def dump_state(state, keys):
+    """session_state 에서 keys 만 JSON 으로 직렬화한다 (bytearray 는 hex 문자열)."""
+    data = {}
+    for key in keys:
+        if key in state:
+            value = state[key]
+            data[key] = {"hex": bytes(value).hex()} if isinstance(value, (bytes, bytearray)) else value
+    return json.dumps(data, separators=(",", ":"))
+
+
+def load_state(raw):
+    """dump_state 의 역. JSON 이 바꿔 놓은 dict 의 정수 key 도 되돌린다."""
+    data = json.loads(raw)
+    for key, value in data.items():
+        if isinstance(value, dict):
+            if set(value) == {"hex"}:
+                data[key] = bytearray.fromhex(value["hex"])
+            else:
+                data[key] = {int(k) if k.lstrip("-").isdigit() else k: v for k, v in value.items()}
+    return data
+
+
+# -----------------------------------------------------------------------------
+# Stores: load(token) -> 직렬화된 문자열 또는 None, save(token, raw), delete(token)
+# -----------------------------------------------------------------------------
+class SessionStore:
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+
+    def load(self, token):
+        raise NotImplementedError
+
+    def save(self, token, raw):
+        raise NotImplementedError
+
+    def delete(self, token):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryStore(SessionStore):
+    """프로세스 내 dict. 다른 워커와는 공유되지 않지만 브라우저 새로고침에는 살아남는다."""
+
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.time):
+        super().__init__(ttl)
+        self.clock = clock
+        self._items = {}
+        self._saves = 0
+        self._lock = threading.Lock()
+
+    def load(self, token):
+        with self._lock:
+            item = self._items.get(token)
+            if item is None:
+                return None
+            expires_at, raw = item
+            if expires_at <= self.clock():
+                del self._items[token]
+                return None
+            return raw
+
+    def save(self, token, raw):
+        now = self.clock()
+        with self._lock:
+            self._items[token] = (now + self.ttl, raw)
+            self._saves += 1
+            if self._saves % PURGE_EVERY == 0:
+                for key in [k for k, (exp, _) in self._items.items() if exp <= now]:
+                    del self._items[key]
+
+    def delete(self, token):
+        with self._lock:
+            self._items.pop(token, None)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SQLiteStore(SessionStore):
+    """로컬 SQLite 파일 (WAL). 같은 호스트의 여러 Streamlit 프로세스가 공유한다."""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, ttl=DEFAULT_TTL, clock=time.time):
+        super().__init__(ttl)
+        self.clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 스크립트는 세션마다 다른 스레드에서 돌므로 연결 하나를 잠금으로 보호해 공유한다
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sessions (token TEXT PRIMARY KEY, data TEXT, expires_at REAL)")
+        self.conn.commit()
+        self._saves = 0
+        self._lock = threading.Lock()
+
+    def load(self, token):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM sessions WHERE token = ? AND expires_at > ?", (token, self.clock())
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, token, raw):
+        now = self.clock()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?) "
+                "ON CONFLICT(token) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+                (token, raw, now + self.ttl),
+            )
+            self._saves += 1
+            if self._saves % PURGE_EVERY == 0:
+                self.conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    def delete(self, token):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def close(self):
+        self.conn.close()
+
+
+class RedisStore(SessionStore):
+    """Redis 호환 서버. 만료는 서버의 TTL(SET ... EX)에 맡긴다. client 는 redis.Redis 호환 객체."""
+
+    def __init__(self, client, ttl=DEFAULT_TTL, prefix="cbti:session:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+
+    def load(self, token):
+        raw = self.client.get(self.prefix + token)
+        return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+    def save(self, token, raw):
+        self.client.set(self.prefix + token, raw, ex=int(self.ttl))
+
+    def delete(self, token):
+        self.client.delete(self.prefix + token)
+
+    def close(self):
+        self.client.close()
+
+
+def make_store(config):
+    config = dict(config or {})
+    kind = config.pop("store", "memory")
+    ttl = config.get("ttl", DEFAULT_TTL)
+    if kind == "memory":
+        return MemoryStore(ttl)
+    if kind == "sqlite":
+        return SQLiteStore(config.get("path", DEFAULT_SQLITE_PATH), ttl)
+    if kind == "redis":
+        import redis
+
+        return RedisStore(redis.Redis.from_url(config["url"]), ttl, config.get("prefix", "cbti:session:"))
+    raise ValueError(f"unknown session store {kind!r}")
@@ -0,0 +1,296 @@
+"""유형별 공유 카드 이미지 빌드.
+
+16개 유형마다 코드, 이름, 슬로건, 롤모델 사진 4장을 합친 1200x630 JPEG 카드를 미리 만들어
+static/cards/ 에 둔다. 파일 이름은 입력(유형 문구, 사진, 폰트, 레이아웃 버전)의 해시라서
+내용이 바뀐 유형만 다시 만들고, manifest.json 에 콘텐츠 버전과 Open Graph 메타데이터를 함께 남긴다.
+
+카드는 배포 전에 빌드해서 저장소에 커밋한다 (앱은 빌드하지 않는다). data/content.json 을 고친 뒤에는
+다시 빌드해서 함께 커밋한다. 앱은 세션이 고정한 질문지 버전의 문구와 카드의 문구가 같을 때만
+내려받기 버튼을 보여 주므로, 문구만 먼저 바뀐 유형은 버튼이 잠시 숨겨질 뿐 옛 카드가 나가지 않는다.
+
+    python -m cbti.sharecards                      # 바뀐 카드만 빌드
+    python -m cbti.sharecards --font "NotoSansKR[wght].ttf" --force
+
+한글 폰트는 --font, CBTI_CARD_FONT 환경 변수, fonts/ 폴더, 시스템 폰트 순서로 찾는다. 가변 폰트는
+CARD_FONT_WEIGHT 굵기로 그린다. 웹폰트(cbti/fonts.py)와 같은 KR 원본을 쓰면 문장 부호 모양이 화면과 같다.
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+
+from cbti import assets, content_store
+from cbti.content import BASE_DIR
+from cbti.links import APP_URL
+
+CARD_DIR = os.path.join(BASE_DIR, "static", "cards")
+MANIFEST_PATH = os.path.join(CARD_DIR, "manifest.json")
+# Streamlit 정적 파일 서빙(enableStaticServing) 경로
+STATIC_URL = APP_URL + "app/static/cards/"
+
+CARD_SIZE = (1200, 630)  # Open Graph 권장 크기
+# 사진이 절반을 차지해서 PNG 는 장당 400KB 안팎이다. JPEG 는 100KB 안팎이고 모든 링크 미리보기가 읽는다.
+# 글자 가장자리가 번지지 않도록 색 정보를 줄이지 않는다 (subsampling=0, 4:4:4).
+FORMATS = {
+    "jpg": {"format": "JPEG", "mime": "image/jpeg",
+            "save": {"quality": 85, "optimize": True, "progressive": True, "subsampling": 0}},
+}
+DEFAULT_FORMAT = "jpg"
+# 레이아웃이 바뀌면 올려서 기존 카드를 무효화한다.
+LAYOUT_VERSION = 3
+# 가변 폰트(wght 축)로 그릴 때의 굵기
+CARD_FONT_WEIGHT = 700
+
+FONT_CANDIDATES = [
+    os.path.join(BASE_DIR, "fonts", "*.[ot]t[fc]"),
+    "/usr/share/fonts/**/NotoSansCJK*-Bold.ttc",
+    "/usr/share/fonts/**/NotoSansKR*.[ot]tf",
+    "/usr/share/fonts/**/NanumGothicBold.ttf",
+    "/usr/share/fonts/**/NanumGothic.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+]
+
+BG_COLOR = "#ffffff"
+ACCENT_COLOR = "#4B89DC"
+TEXT_COLOR = "#333333"
+MUTED_COLOR = "#666666"
+PLACEHOLDER_COLOR = "#f1f3f5"
+
+
+def find_font(path=None):
+    path = path or os.environ.get("CBTI_CARD_FONT")
+    if path:
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        return path
+    for pattern in FONT_CANDIDATES:
+        found = sorted(glob.glob(pattern, recursive=True))
+        if found:
+            return found[0]
+    raise FileNotFoundError("한글 폰트를 찾지 못했습니다. --font 또는 CBTI_CARD_FONT 로 지정하세요.")
+
+
+def _sha256_json(value):
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def text_digest(code, info):
+    """카드에 찍히는 문구(코드, 이름, 슬로건, 롤모델 이름)의 해시 — 앱이 질문지 버전과 맞는지 확인할 때 쓴다"""
+    return _sha256_json([code, info["title"], info["slogan"], [p["name"] for p in info["people_data"]]])
+
+
+def card_digest(code, info, font_digest, photo_digests):
+    """카드 한 장에 들어가는 입력 전체의 해시 (파일 이름에 쓴다)"""
+    return _sha256_json([LAYOUT_VERSION, text_digest(code, info), font_digest, photo_digests])
+
+
+def card_filename(code, digest, fmt):
+    return f"{code}-{digest[:12]}.{fmt}"
+
+
+def _wrap(draw, text, font, width):
+    """공백 기준으로 줄바꿈하고, 한 단어가 너무 길면 글자 단위로 자른다."""
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if draw.textlength(candidate, font=font) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        line = ""
+        for ch in word:
+            if draw.textlength(line + ch, font=font) > width and line:
+                lines.append(line)
+                line = ""
+            line += ch
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _load_font(path, size):
+    """폰트를 연다. 가변 폰트는 기본값이 가장 가는 굵기라서 wght 축을 CARD_FONT_WEIGHT 로 맞춘다."""
+    from PIL import ImageFont
+
+    font = ImageFont.truetype(path, size)
+    try:
+        axes = font.get_variation_axes()
+    except OSError:  # 가변 폰트가 아님
+        return font
+    font.set_variation_by_axes([CARD_FONT_WEIGHT if axis["name"] == b"Weight" else axis["default"] for axis in axes])
+    return font
+
+
+def _photo(path, size):
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as src:
+        return ImageOps.fit(src.convert("RGB"), size, Image.LANCZOS, centering=(0.5, 0.3))
+
+
+def compose_card(code, info, photo_paths, font_path):
+    """카드 한 장을 PIL Image 로 만든다. photo_paths 에서 None 인 자리는 빈 칸으로 둔다."""
+    from PIL import Image, ImageDraw
+
+    width, height = CARD_SIZE
+    card = Image.new("RGB", CARD_SIZE, BG_COLOR)
+    draw = ImageDraw.Draw(card)
+    fonts = {size: _load_font(font_path, size) for size in (24, 26, 32, 34, 54, 130)}
+
+    # 왼쪽: 문구
+    x, text_width = 60, 520
+    draw.text((x, 70), "나의 영적 유형은", font=fonts[34], fill=MUTED_COLOR)
+    draw.text((x, 115), code, font=fonts[130], fill=ACCENT_COLOR)
+    y = 275
+    for line in _wrap(draw, info["title"], fonts[54], text_width):
+        draw.text((x, y), line, font=fonts[54], fill=TEXT_COLOR)
+        y += 66
+    y += 14
+    for line in _wrap(draw, f"“{info['slogan']}”", fonts[32], text_width):
+        draw.text((x, y), line, font=fonts[32], fill=MUTED_COLOR)
+        y += 44
+    draw.text((x, height - 80), APP_URL.split("//", 1)[-1].rstrip("/"), font=fonts[26], fill=ACCENT_COLOR)
+
+    # 오른쪽: 롤모델 2x2
+    cell, gap, left, top = 260, 20, 640, 45
+    for i, (person, path) in enumerate(zip(info["people_data"], photo_paths)):
+        cx, cy = left + (i % 2) * (cell + gap), top + (i // 2) * (cell + gap)
+        if path:
+            card.paste(_photo(path, (cell, cell)), (cx, cy))
+        else:
+            draw.rectangle((cx, cy, cx + cell, cy + cell), fill=PLACEHOLDER_COLOR)
+        band = Image.new("RGBA", (cell, 44), (0, 0, 0, 140))
+        card.paste(band, (cx, cy + cell - 44), band)
+        draw.text((cx + cell // 2, cy + cell - 22), person["name"], font=fonts[24], fill="#ffffff", anchor="mm")
+    return card
+
+
+def encode(card, fmt):
+    spec = FORMATS[fmt]
+    buf = io.BytesIO()
+    card.save(buf, spec["format"], **spec["save"])
+    return buf.getvalue()
+
+
+def og_metadata(code, info, filename):
+    return {
+        "og:title": f"나의 영적 유형은 {code} - {info['title']}",
+        "og:description": info["slogan"],
+        "og:image": STATIC_URL + filename,
+        "og:image:type": FORMATS[DEFAULT_FORMAT]["mime"],
+        "og:image:width": CARD_SIZE[0],
+        "og:image:height": CARD_SIZE[1],
+        "og:url": f"{APP_URL}?type={code}",
+    }
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != LAYOUT_VERSION:
+        return {}
+    return manifest
+
+
+def load_manifest():
+    return _read_manifest().get("cards", {})
+
+
+def _save_manifest(cards, content_version):
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": LAYOUT_VERSION, "content_version": content_version, "cards": cards}, f,
+                  ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def build_all(questionnaire=None, font_path=None, force=False, log=None):
+    """16개 유형 카드를 빌드하고 manifest 를 돌려준다. 입력 해시가 바뀐 카드만 다시 만든다.
+
+    questionnaire 를 주지 않으면 현재 콘텐츠 버전(data/content.json)의 질문지를 쓴다.
+    """
+    if questionnaire is None:
+        questionnaire = content_store.default_store().current()
+    type_details = questionnaire.type_details
+    os.makedirs(CARD_DIR, exist_ok=True)
+    font_path = find_font(font_path)
+    font_digest = assets.digest(font_path)
+    photos = assets.build_all()
+    saved = _read_manifest()
+    manifest = {} if force else saved.get("cards", {})
+    cards = {}
+
+    for code, info in type_details.items():
+        stems = [f"{code}_{i + 1}" for i in range(assets.PEOPLE_PER_TYPE)]
+        digest = card_digest(code, info, font_digest, [photos.get(s, {}).get("sha256") for s in stems])
+        files = {fmt: card_filename(code, digest, fmt) for fmt in FORMATS}
+        entry = manifest.get(code)
+        fresh = entry and entry.get("sha256") == digest and all(
+            os.path.exists(os.path.join(CARD_DIR, name)) for name in files.values())
+        if not fresh:
+            photo_paths = [assets.output_path(s, assets.DEFAULT_WIDTH, "jpg") if s in photos else None for s in stems]
+            card = compose_card(code, info, photo_paths, font_path)
+            sizes = {}
+            for fmt, name in files.items():
+                data = encode(card, fmt)
+                assets.write_atomic(os.path.join(CARD_DIR, name), data)
+                sizes[fmt] = len(data)
+            entry = {"sha256": digest, "text": text_digest(code, info), "files": files, "bytes": sizes,
+                     "og": og_metadata(code, info, files[DEFAULT_FORMAT])}
+            if log:
+                log(f"built {code}: {sizes}")
+        cards[code] = entry
+
+    # 더 이상 manifest 에 없는 (이전 해시의) 카드 파일 정리
+    keep = {name for entry in cards.values() for name in entry["files"].values()}
+    for name in os.listdir(CARD_DIR):
+        if name != os.path.basename(MANIFEST_PATH) and name not in keep:
+            os.remove(os.path.join(CARD_DIR, name))
+
+    if cards != saved.get("cards") or saved.get("content_version") != questionnaire.version:
+        _save_manifest(cards, questionnaire.version)
+    return cards
+
+
+def load_cards(type_details=None, fmt=DEFAULT_FORMAT):
+    """{res_code: (파일 이름, bytes)} — 만들어 둔 카드만 읽는다 (빌드하지 않음).
+
+    type_details 를 주면 문구가 같은 카드만 돌려준다 (앱에서 질문지 버전마다 한 번 읽는다).
+    """
+    cards = {}
+    for code, entry in load_manifest().items():
+        if type_details is not None and (
+                code not in type_details or entry.get("text") != text_digest(code, type_details[code])):
+            continue
+        name = entry["files"].get(fmt)
+        try:
+            with open(os.path.join(CARD_DIR, name), "rb") as f:
+                cards[code] = (name, f.read())
+        except (OSError, TypeError):
+            continue
+    return cards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="유형별 공유 카드(JPEG) 빌드")
+    parser.add_argument("--font", help="한글 폰트 파일 (TTF/OTF/TTC)")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 전부 다시 빌드")
+    args = parser.parse_args(argv)
+
+    try:
+        cards = build_all(font_path=args.font, force=args.force, log=print)
+    except FileNotFoundError as e:
+        parser.error(f"폰트 파일 없음: {e}")
+    total = sum(e["bytes"][DEFAULT_FORMAT] for e in cards.values())
+    print(f"{len(cards)} cards -> {CARD_DIR} ({total:,}B {DEFAULT_FORMAT})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""16개 유형 원형(prototype)과의 연속 유사도.
+
+결과 화면은 축 평균 4개를 축마다 5점 기준으로 잘라 글자 하나로 만든다. 경계(5점) 바로 옆의 사용자는
+거의 맞지 않는 유형을 받으므로, 축 평균 벡터를 16개 원형과 한 번에 비교해 가까운 순서와 기운 정도를 낸다.
+
+  - 원형: 축마다 앞 글자(T/D/P/L)는 LOW(2.5), 뒤 글자(C/G/S/M)는 HIGH(7.5) — 각 쪽 구간의 가운데
+  - 거리: 유클리드 거리 (N, 16) 를 브로드캐스팅 한 번으로 계산한다 (응답 한 건 또는 N 건)
+  - 가중치: softmax(-d² / 2σ²), σ = 원형에서 경계까지의 거리(2.5). 축별 로지스틱의 곱과 같으므로
+    가장 가까운 원형은 항상 채점 규칙의 유형과 같다 (5점 동점은 앞 글자가 먼저).
+    16개로 나눠 가지므로 뚜렷한 응답도 1순위가 50% 안팎이고 경계 응답은 7%씩처럼 보여 그대로 보여 주지 않는다.
+  - 1·2순위 비중(top2_share): 두 유형만 놓고 본 1순위의 몫 (0.5~1). 두 유형은 가장 경계에 가까운 축 하나만
+    다르므로 그 축의 로지스틱과 같다 — 50% 는 경계, 100% 에 가까울수록 그 축이 뚜렷하다.
+
+원형 행렬은 TypeSimilarity 를 만들 때 한 번만 계산한다 (앱에서는 st.cache_resource).
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from cbti.scoring import AXIS_LETTERS, THRESHOLD, _all_codes
+
+LOW = 2.5
+HIGH = 7.5
+# 축 평균이 경계에서 이만큼 이내이면 경계 사용자로 본다
+BOUNDARY_MARGIN = 0.5
+
+
+class Ranking(NamedTuple):
+    codes: np.ndarray  # (N, k) 가까운 순서의 유형 코드
+    distances: np.ndarray  # (N, k) 원형까지의 거리
+    confidence: np.ndarray  # (N, k) 가중치 (16개 합이 1)
+
+    def top2_share(self):
+        """(N,) 1순위와 2순위 두 유형 중 1순위의 몫 (k >= 2 로 만든 Ranking)"""
+        return self.confidence[:, 0] / (self.confidence[:, 0] + self.confidence[:, 1])
+
+
+class TypeSimilarity:
+    def __init__(self, codes=None, letters=AXIS_LETTERS, low=LOW, high=HIGH, threshold=THRESHOLD):
+        n_axes = len(letters)
+        self.codes = np.array(list(codes) if codes is not None else _all_codes(letters))
+        self.threshold = threshold
+        high_letters = [h for _, h in letters]
+        # prototypes[code, axis]: 축 글자가 뒤 글자면 HIGH, 아니면 LOW
+        is_high = np.array([[code[a] == high_letters[a] for a in range(n_axes)] for code in self.codes])
+        self._is_high = is_high
+        self.prototypes = np.where(is_high, high, low).astype(np.float64)
+        self.prototypes.flags.writeable = False
+        self.sigma = min(threshold - low, high - threshold)
+        self.symmetric = np.isclose(threshold - low, high - threshold)
+
+    def distances(self, averages):
+        """(N, 4) 또는 (4,) 축 평균 -> (N, 16) 원형까지의 거리 (self.codes 순서)"""
+        a = np.atleast_2d(np.asarray(averages, dtype=np.float64))
+        return np.sqrt(((a[:, None, :] - self.prototypes[None, :, :]) ** 2).sum(axis=2))
+
+    def confidence(self, distances):
+        """거리 -> 가중치 (행마다 합 1)"""
+        logits = -(distances ** 2) / (2 * self.sigma ** 2)
+        logits -= logits.max(axis=1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def rank(self, averages, k=None):
+        """가까운 순서로 k 개 (기본 16개 전부). 1순위는 채점 규칙의 유형과 같다."""
+        a = np.atleast_2d(np.asarray(averages, dtype=np.float64))
+        d = self.distances(a)
+        conf = self.confidence(d)
+        if self.symmetric:
+            # 원형이 경계에 대칭이면 거리 순서 = 채점 규칙과 반대쪽인 축들의 |평균 - 5| 합의 순서.
+            # 제곱합은 5 바로 옆(5 + 1ulp)에서 차이를 잃으므로 이 값으로 정렬해 1순위를 채점 결과와 맞춘다.
+            side = a > self.threshold
+            key = ((side[:, None, :] != self._is_high[None, :, :]) * np.abs(a - self.threshold)[:, None, :]).sum(axis=2)
+        else:
+            key = d
+        order = np.argsort(key, axis=1, kind="stable")[:, :k]
+        return Ranking(self.codes[order], np.take_along_axis(d, order, axis=1),
+                       np.take_along_axis(conf, order, axis=1))
+
+    def boundary_axes(self, averages, margin=BOUNDARY_MARGIN):
+        """(N, 4) bool: 축 평균이 경계에서 margin 이내"""
+        a = np.atleast_2d(np.asarray(averages, dtype=np.float64))
+        return np.abs(a - self.threshold) <= margin
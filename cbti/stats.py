@@ -0,0 +1,248 @@
+"""전체 응답자 통계 (스트리밍 집계).
+
+결과가 하나 나올 때마다 record() 로 16개 유형 카운트와 축별 고정 구간 히스토그램, 그 누적합을 갱신한다
+(구간 수(BINS)에만 비례). 결과 화면이 rerun 마다 부르는 조회(type_share, percentile)는 상수 시간이다.
+
+dirty 상태는 백그라운드 스레드가 save_interval 마다 JSON 파일에 저장하고, 종료 시에도 저장한다.
+여러 워커 프로세스가 같은 파일을 쓸 수 있도록 저장할 때는 파일 잠금(.lock) 안에서 디스크의 값에
+마지막 저장 이후 이 프로세스가 센 증가분만 더해 쓰고, 합친 값을 다시 읽어 화면에 쓴다.
+(fcntl 이 없는 플랫폼에서는 잠금 없이 합치므로 저장이 겹치면 드물게 증가분이 빠질 수 있다.)
+디스크의 파일을 해석할 수 없으면 덮어쓰지 않고 <path>.<시각>.corrupt 로 옮겨 둔 뒤 새로 센다.
+읽기 자체가 실패하면(OSError) 저장을 미루고 증가분을 메모리에 남겨 둔다.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from cbti.content import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(BASE_DIR, "data", "population_stats.json")
+# 축 평균(0~10)을 0.1 단위 구간으로 나눈다
+BINS = 100
+MAX_SCORE = 10.0
+# 이보다 응답이 적으면 비교 수치를 보여주지 않는다
+MIN_POPULATION = 20
+
+
+def _bin(value):
+    return min(BINS - 1, max(0, int(value * BINS / MAX_SCORE)))
+
+
+def _cumulative(hist):
+    # cum[b] = 구간 b 보다 아래(0..b-1)의 응답 수
+    cum = [0] * (BINS + 1)
+    for b, n in enumerate(hist):
+        cum[b + 1] = cum[b] + n
+    return cum
+
+
+@contextmanager
+def _file_lock(path):
+    try:
+        import fcntl
+    except ImportError:  # Windows: 잠금 없이 진행
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class PopulationStats:
+    def __init__(self, codes, parts, path=None, save_interval=30.0):
+        self.codes = list(codes)
+        self.parts = list(parts)
+        self.path = path
+        self.save_interval = save_interval
+
+        self._code_index = {c: i for i, c in enumerate(self.codes)}
+        self.total = 0
+        self.code_counts = [0] * len(self.codes)
+        self.histograms = {p: [0] * BINS for p in self.parts}
+        self.cumulative = {p: [0] * (BINS + 1) for p in self.parts}
+        # 마지막으로 저장한 뒤 이 프로세스가 센 증가분 (저장할 때 디스크 값에 더한다)
+        self._pending = self._empty_counts()
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        if path:
+            self._load()
+            self._thread = threading.Thread(target=self._autosave, name="cbti-stats-saver", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _empty_counts(self):
+        return {"total": 0, "codes": [0] * len(self.codes), "histograms": {p: [0] * BINS for p in self.parts}}
+
+    # -- 갱신 / 조회 ---------------------------------------------------------
+    def record(self, res_code, avg):
+        """결과 한 건 반영 (축마다 누적합 갱신, O(BINS))"""
+        code = self._code_index[res_code]
+        with self._lock:
+            self.total += 1
+            self.code_counts[code] += 1
+            self._pending["total"] += 1
+            self._pending["codes"][code] += 1
+            for p in self.parts:
+                b = _bin(avg[p])
+                self.histograms[p][b] += 1
+                self._pending["histograms"][p][b] += 1
+                cum = self.cumulative[p]
+                for k in range(b + 1, BINS + 1):
+                    cum[k] += 1
+            self._dirty = True
+
+    def type_share(self, res_code):
+        """해당 유형의 비율 (0~1)"""
+        if not self.total:
+            return 0.0
+        return self.code_counts[self._code_index[res_code]] / self.total
+
+    def percentile(self, part, value):
+        """value 보다 낮은 응답자 비율(%). 같은 구간은 절반으로 센다 (mid-rank). 상수 시간."""
+        if not self.total:
+            return 50.0
+        b = _bin(value)
+        return 100.0 * (self.cumulative[part][b] + self.histograms[part][b] / 2) / self.total
+
+    def percentiles(self, avg):
+        return {p: self.percentile(p, avg[p]) for p in self.parts}
+
+    def distribution(self):
+        """{유형 코드: 응답 수}"""
+        return dict(zip(self.codes, self.code_counts))
+
+    # -- 저장 ----------------------------------------------------------------
+    def to_dict(self):
+        with self._lock:
+            return self._as_dict(self.total, self.code_counts, self.histograms)
+
+    def _as_dict(self, total, code_counts, histograms):
+        return {
+            "bins": BINS,
+            "total": total,
+            "codes": dict(zip(self.codes, code_counts)),
+            "histograms": {p: list(h) for p, h in histograms.items()},
+        }
+
+    def _read(self):
+        """디스크의 통계 (파일이 없으면 빈 값, 해석할 수 없으면 None). 읽기 실패(OSError)는 그대로 올린다."""
+        counts = self._empty_counts()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return counts
+        except ValueError:
+            logger.exception("population stats in %s are not valid JSON", self.path)
+            return None
+        try:
+            if data["bins"] != BINS:
+                raise ValueError(f"{data['bins']} bins (expected {BINS})")
+            counts["total"] = int(data["total"])
+            for code, n in data["codes"].items():
+                if code in self._code_index:
+                    counts["codes"][self._code_index[code]] = int(n)
+            for p, hist in data["histograms"].items():
+                if p in counts["histograms"]:
+                    if len(hist) != BINS:
+                        raise ValueError(f"{p} histogram has {len(hist)} bins (expected {BINS})")
+                    counts["histograms"][p] = [int(n) for n in hist]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.error("population stats in %s have an unexpected format: %r", self.path, e)
+            return None
+        return counts
+
+    def _set_aside(self):
+        """해석할 수 없는 통계 파일을 덮어쓰지 않도록 옆으로 옮긴다 (self.path 의 파일 잠금 안에서)."""
+        corrupt_path = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}.corrupt"
+        os.replace(self.path, corrupt_path)
+        logger.error("moved unreadable population stats %s to %s; counting again from zero", self.path,
+                     corrupt_path)
+
+    def _show(self, counts):
+        # 화면에 쓰는 값 = 디스크(모든 워커의 합) + 아직 저장하지 않은 이 프로세스의 증가분 (self._lock 안에서)
+        pending = self._pending
+        self.total = counts["total"] + pending["total"]
+        self.code_counts = [a + b for a, b in zip(counts["codes"], pending["codes"])]
+        self.histograms = {p: [a + b for a, b in zip(counts["histograms"][p], pending["histograms"][p])]
+                           for p in self.parts}
+        self.cumulative = {p: _cumulative(h) for p, h in self.histograms.items()}
+
+    def _load(self):
+        try:
+            counts = self._read()
+        except OSError:
+            logger.exception("could not read population stats from %s", self.path)
+            return
+        if counts is None:  # 다음 저장 때 옮겨 둔다. 그때까지는 이 프로세스가 센 값만 보인다
+            counts = self._empty_counts()
+        with self._lock:
+            self._show(counts)
+
+    def save(self):
+        """증가분을 디스크의 값에 더해 저장한다. 실패하면 증가분을 남겨 두고 다음에 다시 시도한다."""
+        if not self.path:
+            return
+        with _file_lock(self.path):
+            disk = self._read()  # 읽기 실패(OSError)면 증가분을 건드리기 전에 빠져나간다
+            if disk is None:
+                self._set_aside()
+                disk = self._empty_counts()
+            with self._lock:
+                delta, self._pending = self._pending, self._empty_counts()
+                self._dirty = False
+            merged = {
+                "total": disk["total"] + delta["total"],
+                "codes": [a + b for a, b in zip(disk["codes"], delta["codes"])],
+                "histograms": {p: [a + b for a, b in zip(disk["histograms"][p], delta["histograms"][p])]
+                               for p in self.parts},
+            }
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._as_dict(merged["total"], merged["codes"], merged["histograms"]), f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                with self._lock:  # 저장하지 못한 증가분을 되돌려 놓는다
+                    self._pending["total"] += delta["total"]
+                    self._pending["codes"] = [a + b for a, b in zip(self._pending["codes"], delta["codes"])]
+                    for p in self.parts:
+                        self._pending["histograms"][p] = [
+                            a + b for a, b in zip(self._pending["histograms"][p], delta["histograms"][p])]
+                    self._dirty = True
+                raise
+            with self._lock:
+                self._show(merged)
+
+    def _autosave(self):
+        while not self._stop.wait(self.save_interval):
+            try:
+                if self._dirty:
+                    self.save()
+                else:  # 다른 워커가 저장한 값도 반영
+                    self._load()
+            except OSError:
+                logger.exception("could not save population stats")
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._dirty:
+            try:
+                self.save()
+            except OSError:
+                logger.exception("could not save population stats")
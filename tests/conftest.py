@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트에서 `python -m pytest` 로 실행하지 않아도 cbti 를 import 할 수 있게
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
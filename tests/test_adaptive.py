@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from cbti.content_store import default_store
+from cbti.scoring import NO_ANSWER, UNANSWERED
+
+
+@pytest.fixture(scope="module")
+def qn():
+    return default_store().current()
+
+
+def random_partial_sheets(qn, n, max_missing=5, seed=0):
+    """파트마다 0~max_missing 개 문항을 비워 둔 답안 (비운 자리는 UNANSWERED 또는 NO_ANSWER)"""
+    rng = np.random.default_rng(seed)
+    sheets = rng.integers(0, len(qn.options), size=(n, qn.n_questions))
+    for row in sheets:
+        for cols in qn.scorer.part_columns:
+            missing = rng.choice(cols, size=rng.integers(0, max_missing + 1), replace=False)
+            row[missing] = rng.choice([UNANSWERED, NO_ANSWER])
+    return sheets
+
+
+def brute_force_decided(scorer, sheet):
+    """파트마다 남은 문항의 모든 응답 조합을 채점해 글자가 하나뿐인지"""
+    out = []
+    for p, cols in enumerate(scorer.part_columns):
+        missing = [i for i in cols if not 0 <= sheet[i] < len(scorer.options)]
+        fills = np.array(list(itertools.product(range(len(scorer.options)), repeat=len(missing))))
+        filled = np.repeat(sheet[None, :], len(fills), axis=0)
+        if missing:
+            filled[:, missing] = fills
+        letters = scorer.score(filled).averages[:, p] > scorer.threshold
+        out.append(letters.min() == letters.max())
+    return out
+
+
+def test_decided_matches_brute_force(qn):
+    sheets = random_partial_sheets(qn, 300)
+    decided = qn.scorer.decided(sheets)
+    for sheet, row in zip(sheets, decided):
+        assert row.tolist() == brute_force_decided(qn.scorer, sheet)
+    # 결정된 축과 아닌 축이 모두 충분히 나와야 의미 있는 비교다
+    assert 0.05 < decided.mean() < 0.95
+
+
+def test_complete_sheet_is_decided_and_empty_sheet_is_not(qn):
+    full = np.zeros(qn.n_questions, dtype=np.int8)
+    assert qn.scorer.decided(full).all()
+    empty = np.full(qn.n_questions, NO_ANSWER)
+    assert not qn.scorer.decided(empty).any()
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 4, 7, 100])
+def test_blocks_cover_each_part_in_order(qn, block_size):
+    for part in qn.parts:
+        n_blocks = part.n_blocks(block_size)
+        pages = [list(part.block_rows(b, block_size)) for b in range(n_blocks)]
+        assert n_blocks == -(-len(part) // block_size)
+        assert [row for page in pages for row in page] == list(part.rows())
+        assert all(len(page) == block_size for page in pages[:-1])
+        assert 1 <= len(pages[-1]) <= block_size  # 마지막 페이지는 짧을 수 있다
+
+
+@pytest.mark.parametrize("block_size", [0, None])
+def test_no_block_size_keeps_whole_part_on_one_page(qn, block_size):
+    for part in qn.parts:
+        assert part.n_blocks(block_size) == 1
+        assert list(part.block_rows(0, block_size)) == list(part.rows())
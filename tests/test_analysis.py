@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from cbti import analysis
+from cbti.content_store import default_store
+
+
+def fixed_matrix():
+    # 응답 8명 x 문항 4개 (점수 0~10)
+    return np.array([
+        [10, 6.7, 10, 3.3],
+        [6.7, 6.7, 10, 0],
+        [3.3, 0, 3.3, 6.7],
+        [0, 3.3, 0, 10],
+        [6.7, 10, 6.7, 3.3],
+        [3.3, 3.3, 6.7, 6.7],
+        [10, 10, 6.7, 0],
+        [0, 0, 3.3, 10],
+    ])
+
+
+def direct_alpha(x):
+    k = x.shape[1]
+    return k / (k - 1) * (1 - x.var(axis=0, ddof=1).sum() / x.sum(axis=1).var(ddof=1))
+
+
+def simulated_keyed(n, seed=0):
+    """파트마다 잠재 성향 하나에 잡음을 더한 역채점 반영 점수 (N, 문항 수)"""
+    scorer = default_store().current().scorer
+    rng = np.random.default_rng(seed)
+    trait = rng.normal(0, 2, size=(n, len(scorer.parts)))
+    keyed = 5 + trait[:, scorer.part_idx] + rng.normal(0, 1.5, size=(n, scorer.n_questions))
+    return np.clip(keyed, 0, 10)
+
+
+def test_merge_of_halves_equals_single_pass():
+    keyed = simulated_keyed(1000)
+    complete = np.random.default_rng(1).random(1000) > 0.1
+    whole = analysis.ItemStats(keyed.shape[1]).update(keyed, complete)
+    first = analysis.ItemStats(keyed.shape[1]).update(keyed[:400], complete[:400])
+    second = analysis.ItemStats(keyed.shape[1]).update(keyed[400:], complete[400:])
+    merged = analysis.ItemStats.from_dict(first.to_dict()).merge(second)
+    assert (merged.n, merged.skipped) == (whole.n, whole.skipped)
+    assert np.allclose(merged.covariance(), whole.covariance())
+    assert np.allclose(merged.mean(), whole.mean())
+
+
+def test_part_report_matches_direct_computation():
+    x = fixed_matrix()
+    x[:, 3] = 10 - x[:, 3]  # 반대 방향 문항을 역채점한 상태로
+    cov = analysis.ItemStats(4).update(x).covariance()
+    assert np.allclose(cov, np.cov(x, rowvar=False))
+    rep = analysis.part_report(cov, np.arange(4))
+
+    assert rep["alpha"] == pytest.approx(direct_alpha(x))
+    for i in range(4):
+        rest = np.delete(x, i, axis=1)
+        assert rep["alpha_if_deleted"][i] == pytest.approx(direct_alpha(rest))
+        assert rep["item_rest_r"][i] == pytest.approx(np.corrcoef(x[:, i], rest.sum(axis=1))[0, 1])
+    eigvals = np.linalg.eigvalsh(np.corrcoef(x, rowvar=False))
+    assert rep["explained"] == pytest.approx(eigvals[-1] / 4)
+    assert (rep["loadings"] > 0).all()
+    assert not rep["constant"].any()
+
+
+def test_constant_item_is_left_out():
+    x = fixed_matrix()
+    x[:, 3] = 10 - x[:, 3]
+    with_constant = np.column_stack([x, np.full(len(x), 6.7)])
+    stats = analysis.ItemStats(5).update(with_constant)
+    rep = analysis.part_report(stats.covariance(), np.arange(5))
+    assert rep["constant"].tolist() == [False, False, False, False, True]
+    assert rep["alpha"] == pytest.approx(direct_alpha(x))
+    assert np.isnan(rep["loadings"][4]) and np.isfinite(rep["loadings"][:4]).all()
+    assert np.isnan(stats.correlation()[4]).all()
+
+
+def test_flipped_reverse_flag_is_flagged_as_miskeyed():
+    qn = default_store().current()
+    keyed = simulated_keyed(3000)
+    flipped = int(qn.scorer.part_columns[1][2])
+    keyed[:, flipped] = 10 - keyed[:, flipped]  # reverse 설정이 반대로 된 문항
+    constant = int(qn.scorer.part_columns[3][0])
+    keyed[:, constant] = 10.0
+    report = analysis.analyze(analysis.ItemStats(qn.n_questions).update(keyed), qn)
+
+    miskeyed = {f["item"] for f in report["flags"] if f["issue"] == "miskeyed"}
+    assert miskeyed == {flipped + 1}
+    assert {"item": constant + 1, "issue": "constant"} in [
+        {k: f[k] for k in ("item", "issue")} for f in report["flags"]]
+    assert all(np.isfinite(p["alpha"]) for p in report["parts"].values())
+    analysis.format_report(report)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import random
+
+import numpy as np
+import pytest
+
+from cbti import api
+from cbti.scoring import UNANSWERED
+
+
+@pytest.fixture(scope="module")
+def service():
+    return api.ScoringService()
+
+
+def random_rows(qn, n, seed=0):
+    rng = random.Random(seed)
+    choices = list(qn.options) + list(range(len(qn.options))) + [None]
+    return [[rng.choice(choices) for _ in range(qn.n_questions)] for _ in range(n)]
+
+
+def post_score(service, body, extra_headers=""):
+    """서버를 띄워 POST /score 를 한 번 보내고, 서버가 연결을 닫을 때까지 받은 응답을 돌려준다."""
+    async def run():
+        server = await api.ScoringServer(service).serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /score HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n"
+                         f"{extra_headers}\r\n".encode("latin-1") + body)
+            response = await asyncio.wait_for(reader.read(), timeout=10)
+            writer.close()
+        return response
+
+    return asyncio.run(run())
+
+
+def test_encode_matches_per_answer_lookup(service):
+    qn = service.store.current()
+    rows = random_rows(qn, 500)
+    index = {label: i for i, label in enumerate(qn.options)}
+    expected = [[UNANSWERED if v is None else index.get(v, v) for v in row] for row in rows]
+    assert np.array_equal(service.encode(qn, rows), np.array(expected, dtype=np.int8))
+
+
+@pytest.mark.parametrize("bad", [True, "maybe", 4, [1], {"a": 1}])
+def test_encode_rejects_unknown_answers(service, bad):
+    qn = service.store.current()
+    rows = random_rows(qn, 3)
+    rows[2][7] = bad
+    with pytest.raises(api.RequestError, match="response 2: answer 8 "):
+        service.encode(qn, rows)
+
+
+def test_rejects_response_with_an_unanswered_part(service):
+    qn = service.store.current()
+    with pytest.raises(api.RequestError, match="response 0: no answers for part"):
+        service.score({"answers": [None] * qn.n_questions})
+    row = [0] * qn.n_questions
+    for i in qn.scorer.part_columns[2]:
+        row[i] = None
+    with pytest.raises(api.RequestError, match=f"response 1: no answers for part {qn.scorer.parts[2]}"):
+        service.score({"responses": [[0] * qn.n_questions, row]})
+    # 파트마다 하나씩만 답해도 채점한다
+    row = [None] * qn.n_questions
+    for cols in qn.scorer.part_columns:
+        row[cols[0]] = 0
+    assert service.score({"answers": row})["res_code"]
+
+
+def test_large_batches_are_scored_off_the_event_loop(service):
+    qn = service.store.current()
+    body = json.dumps({"responses": random_rows(qn, 2000, seed=1)}).encode("utf-8")
+    assert len(body) > api.OFFLOAD_BYTES
+    for row in json.loads(body)["responses"]:  # 모든 파트에 답이 있는 응답만 있도록
+        assert all(any(row[i] is not None for i in cols) for cols in qn.scorer.part_columns)
+
+    head, _, payload = post_score(service, body, "Connection: close\r\n").partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert len(json.loads(payload)["results"]) == 2000
+
+
+class BrokenService(api.ScoringService):
+    def score(self, payload):
+        raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize("padding", [0, api.OFFLOAD_BYTES], ids=["inline", "offloaded"])
+def test_unexpected_error_returns_500_and_closes(service, padding, caplog):
+    body = json.dumps({"answers": [], "padding": "x" * padding}).encode("utf-8")
+    # keep-alive 요청이어도 500 뒤에는 서버가 연결을 닫는다 (닫지 않으면 read() 가 끝나지 않는다)
+    head, _, payload = post_score(BrokenService(service.store), body).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 500 Internal Server Error")
+    assert b"Connection: close" in head
+    assert json.loads(payload) == {"error": "internal server error"}
+    assert "boom" in caplog.text
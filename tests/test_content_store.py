@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+from cbti import content_store
+from cbti.content import CONTENT_PATH
+
+
+@pytest.fixture
+def content_file(tmp_path):
+    path = tmp_path / "content.json"
+    with open(CONTENT_PATH, encoding="utf-8") as f:
+        path.write_text(f.read(), encoding="utf-8")
+    return path
+
+
+def edit(path, slogan):
+    """첫 유형의 슬로건을 바꿔 새 버전을 만든다 (같은 크기여도 바뀌었다고 보도록 mtime 도 올린다)"""
+    content = json.loads(path.read_text(encoding="utf-8"))
+    code = sorted(content["types"])[0]
+    content["types"][code]["slogan"] = slogan
+    stat = path.stat()
+    path.write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    return code
+
+
+def make_store(content_file, tmp_path, **kwargs):
+    return content_store.ContentStore(str(content_file), archive_dir=str(tmp_path / "versions"), background=False,
+                                      check_interval=0, **kwargs)
+
+
+def test_hot_reload_and_old_version_stays_available(content_file, tmp_path):
+    store = make_store(content_file, tmp_path)
+    first = store.current()
+    assert store.current() is first  # 파일이 그대로면 다시 읽지 않는다
+
+    code = edit(content_file, "새 슬로건")
+    second = store.current()
+    assert second.version != first.version
+    assert second.type_details[code]["slogan"] == "새 슬로건"
+    assert store.get(first.version) is first
+    assert sorted(os.listdir(tmp_path / "versions")) == sorted(f"{v}.json" for v in (first.version, second.version))
+
+
+def test_broken_edit_keeps_serving_previous_version(content_file, tmp_path):
+    store = make_store(content_file, tmp_path)
+    first = store.current()
+    stat = content_file.stat()
+    content_file.write_text('{"QUESTIONS": [', encoding="utf-8")
+    os.utime(content_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert store.current() is first
+
+    content = json.loads(open(CONTENT_PATH, encoding="utf-8").read())
+    del content["types"]  # JSON 은 맞지만 검증에 실패하는 파일
+    content_file.write_text(json.dumps(content), encoding="utf-8")
+    os.utime(content_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    assert store.current() is first
+
+
+def test_eviction_keeps_current_and_archive_restores_pinned(content_file, tmp_path):
+    keep = 3
+    store = make_store(content_file, tmp_path, keep=keep)
+    pinned = store.current().version
+    versions = [pinned]
+    for i in range(keep + 2):
+        edit(content_file, f"슬로건 {i}")
+        versions.append(store.current().version)
+    current = store.current()
+    assert len(set(versions)) == keep + 3
+    assert pinned not in store.versions()
+    assert current.version in store.versions()
+
+    # 아카이브에서 다시 컴파일하고, 옛 버전을 잔뜩 불러와도 현재 버전은 밀려나지 않는다
+    for version in versions[:-1]:
+        qn = store.get(version)
+        assert qn.version == version
+        assert len(store.versions()) <= keep
+        assert current.version in store.versions()
+    assert store.get(pinned).n_questions == current.n_questions
+
+    # 새 프로세스(빈 메모리)도 아카이브에서 세션이 고정한 버전을 찾는다
+    other = make_store(content_file, tmp_path)
+    assert other.get(pinned).version == pinned
+    assert other.get("000000000000") is None
+
+
+def test_tampered_archive_is_rejected(content_file, tmp_path):
+    store = make_store(content_file, tmp_path)
+    version = store.current().version
+    (tmp_path / "versions" / f"{version}.json").write_text("{}", encoding="utf-8")
+    fresh = make_store(content_file, tmp_path / "elsewhere")
+    fresh.archive_dir = str(tmp_path / "versions")
+    fresh._versions.clear()
+    assert fresh.get(version) is None
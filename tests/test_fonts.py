@@ -0,0 +1,21 @@
+from cbti import fonts
+
+
+def test_committed_subsets_cover_the_current_text():
+    manifest = fonts.load_manifest()
+    assert manifest["faces"]
+    assert not fonts.is_stale(manifest)
+    assert fonts.is_stale(manifest, fonts.used_characters() + "햏")
+
+
+def test_font_face_rules_for_committed_subsets():
+    rules, family = fonts.font_face_css(fonts.load_manifest())
+    assert rules.count("@font-face") == len(fonts.load_manifest()["faces"])
+    assert "@import" not in rules
+    assert family.startswith(f"'{fonts.FAMILY}', ")
+
+
+def test_google_fonts_fallback_without_subsets():
+    rules, family = fonts.font_face_css({})
+    assert rules == f"@import url('{fonts.GOOGLE_FONTS_CSS}');"
+    assert family.startswith("'Noto Sans KR'")
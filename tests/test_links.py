@@ -0,0 +1,51 @@
+import pytest
+
+from cbti import links
+from cbti.content_store import default_store
+
+
+@pytest.fixture(scope="module")
+def qn():
+    return default_store().current()
+
+
+def test_round_trip_through_result_params(qn):
+    for scores in [(1.0, 9.99, 4.2, 6.0), (5.0, 5.004, 4.996, 10.0), (0.0, 0.0, 0.0, 0.0)]:
+        avg = dict(zip(qn.scorer.parts, scores))
+        code = "".join(high if v > qn.scorer.threshold else low for v, (low, high) in zip(scores, links.AXIS_LETTERS))
+        params = links.result_params(code, avg, qn.scorer.parts)
+        assert links.parse_result_params(params, qn.type_details) == (code, tuple(round(v * 100) / 100 for v in scores))
+        url = links.result_url(params)
+        assert url.startswith(links.APP_URL) and links.OWNER_PARAM not in url
+
+
+@pytest.mark.parametrize("params", [{}, {"type": "XXXX", "s": "100,100,100,100"}, {"type": ""}, {"type": "TDPLX"}])
+def test_unknown_code_is_not_a_shared_link(qn, params):
+    assert links.parse_result_params(params, qn.type_details) is None
+
+
+def test_code_is_case_insensitive(qn):
+    assert links.parse_result_params({"type": "tdpl"}, qn.type_details) == ("TDPL", None)
+
+
+@pytest.mark.parametrize("s", ["", "a,b,c,d", "1.5,100,100,100", "100,100,100", "100,100,100,100,100",
+                               "-1,100,100,100", "1001,100,100,100", "100,,100,100"])
+def test_bad_scores_fall_back_to_type_page(qn, s):
+    assert links.parse_result_params({"type": "TDPL", "s": s}, qn.type_details) == ("TDPL", None)
+
+
+@pytest.mark.parametrize("code, s", [("TDPL", "1000,0,0,0"), ("CGSM", "100,900,900,900"), ("TDPL", "501,100,100,100")])
+def test_scores_that_contradict_the_code_are_rejected(qn, code, s):
+    assert links.parse_result_params({"type": code, "s": s}, qn.type_details) is None
+
+
+def test_scores_rounded_onto_the_boundary_accept_either_letter(qn):
+    for code in ("TDPL", "CDPL"):
+        assert links.parse_result_params({"type": code, "s": "500,100,100,100"}, qn.type_details) == \
+            (code, (5.0, 1.0, 1.0, 1.0))
+
+
+def test_owner_marker():
+    params = links.owner_params({"type": "TDPL", "s": "100,100,100,100"})
+    assert links.is_owner(params)
+    assert not links.is_owner({"type": "TDPL"})
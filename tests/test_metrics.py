@@ -0,0 +1,25 @@
+from cbti import metrics
+
+
+def test_prometheus_values_keep_full_precision():
+    registry = metrics.Registry()
+    registry.counter("cbti_big_total").inc(123456789)
+    registry.summary("cbti_seconds").observe(0.123456789012)
+    text = registry.to_prometheus()
+    assert "cbti_big_total 123456789\n" in text
+    assert 'cbti_seconds{quantile="0.5"} 0.123456789012\n' in text
+    assert "cbti_seconds_count 1\n" in text
+
+
+def test_prometheus_escapes_label_values_and_help():
+    registry = metrics.Registry()
+    registry.counter("cbti_paths_total", "line one\nline two").inc(path='a"b\\c\nd')
+    text = registry.to_prometheus()
+    assert "# HELP cbti_paths_total line one\\nline two\n" in text
+    assert 'cbti_paths_total{path="a\\"b\\\\c\\nd"} 1\n' in text
+
+
+def test_non_finite_values():
+    assert metrics._format_value(float("inf")) == "+Inf"
+    assert metrics._format_value(float("-inf")) == "-Inf"
+    assert metrics._format_value(float("nan")) == "NaN"
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from cbti import persistence
+
+
+class MemorySink(persistence.ResultSink):
+    """실패 횟수와 지연을 조절할 수 있는 로컬 sink"""
+
+    def __init__(self, failures=0, block=None):
+        self.failures = failures
+        self.block = block  # 설정되면 write 가 이 Event 를 기다린다
+        self.entered = threading.Event()
+        self.rows = []
+        self.calls = 0
+        self.closed = False
+
+    def write(self, records):
+        self.calls += 1
+        self.entered.set()
+        if self.block is not None:
+            self.block.wait()
+        if self.closed:
+            raise RuntimeError("write on a closed sink")
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("temporary failure")
+        self.rows.extend(records)
+
+    def close(self):
+        self.closed = True
+
+
+def make_writer(sink, tmp_path, **kwargs):
+    fallback = persistence.JsonlSink(str(tmp_path / "unsent.jsonl"))
+    options = {"batch_size": 50, "flush_interval": 0.05, "backoff_base": 0.01, "backoff_max": 0.05}
+    options.update(kwargs)
+    return persistence.WriteBehindWriter(sink, fallback=fallback, **options), fallback
+
+
+def read_fallback(fallback):
+    import json
+
+    try:
+        with open(fallback.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def records(n):
+    return [{"res_code": "TDPL", "answers": str(i)} for i in range(n)]
+
+
+def test_batches_everything_before_close(tmp_path):
+    sink = MemorySink()
+    writer, fallback = make_writer(sink, tmp_path)
+    for r in records(180):
+        writer.submit(r)
+    writer.close()
+    assert sink.rows == records(180)
+    assert sink.calls < 180
+    assert writer.stats["submitted"] == writer.stats["written"] == 180
+    assert sink.closed
+    assert read_fallback(fallback) == []
+
+
+def test_retries_failed_batches(tmp_path):
+    sink = MemorySink(failures=2)
+    writer, fallback = make_writer(sink, tmp_path)
+    for r in records(10):
+        writer.submit(r)
+    writer.close()
+    assert sink.rows == records(10)
+    assert writer.stats["retries"] == 2
+    assert read_fallback(fallback) == []
+
+
+def test_spills_to_fallback_when_sink_keeps_failing(tmp_path):
+    sink = MemorySink(failures=10 ** 6)
+    writer, fallback = make_writer(sink, tmp_path, shutdown_attempts=2)
+    for r in records(120):
+        writer.submit(r)
+    writer.close()
+    assert sink.rows == []
+    assert sorted(read_fallback(fallback), key=lambda r: int(r["answers"])) == records(120)
+    assert writer.stats["spilled"] == 120
+
+
+def test_close_timeout_spills_inflight_batch_and_keeps_sink_open(tmp_path):
+    release = threading.Event()
+    sink = MemorySink(block=release)
+    writer, fallback = make_writer(sink, tmp_path)
+    for r in records(30):
+        writer.submit(r)
+    assert sink.entered.wait(5)  # writer 스레드가 첫 배치를 쓰는 중
+    for r in records(40)[30:]:
+        writer.submit(r)
+
+    writer.close(timeout=0.2)
+    # 쓰는 중이던 배치와 큐에 남은 결과가 모두 fallback 에 있다
+    spilled = read_fallback(fallback)
+    assert sorted(spilled, key=lambda r: int(r["answers"])) == records(40)
+    # 스레드가 아직 write 안에 있으므로 sink 를 닫지 않았다
+    assert not sink.closed
+
+    release.set()
+    writer._thread.join(5)
+    assert not writer._thread.is_alive()
+    # 늦게 끝난 쓰기는 중복일 수는 있어도 유실은 없다
+    assert {r["answers"] for r in sink.rows + spilled} == {r["answers"] for r in records(40)}
+
+
+def test_close_is_idempotent(tmp_path):
+    sink = MemorySink()
+    writer, _ = make_writer(sink, tmp_path)
+    writer.submit(records(1)[0])
+    writer.close()
+    writer.close()
+    assert sink.rows == records(1)
+
+
+def test_make_record_and_sqlite_sink(tmp_path):
+    record = persistence.make_record(bytearray([0, 3, 0xFF]), {"Theology": 4.123456, "Drive": 5, "Society": 6,
+                                                               "Culture": 7}, "TDSM",
+                                     ["Theology", "Drive", "Society", "Culture"])
+    assert record["answers"] == "03-"
+    assert record["theology"] == 4.1235
+    sink = persistence.SQLiteSink(str(tmp_path / "results.sqlite3"))
+    sink.write([record, record])
+    assert sink.conn.execute("SELECT COUNT(*), MIN(res_code) FROM results").fetchone() == (2, "TDSM")
+    sink.close()
+
+
+def test_unknown_sink():
+    with pytest.raises(ValueError):
+        persistence.make_sink({"sink": "ftp"})
@@ -0,0 +1,55 @@
+import pytest
+
+from cbti import render
+from cbti.content_store import default_store
+
+
+@pytest.fixture(scope="module")
+def qn():
+    return default_store().current()
+
+
+def test_equal_quantized_scores_share_one_view(qn):
+    renderer = render.ResultRenderer(qn.type_details)
+    parts = qn.scorer.parts
+    a = render.quantize(dict(zip(parts, (1.0, 9.994, 4.2, 6.0))), parts)
+    b = render.quantize(dict(zip(parts, (1.001, 9.99, 4.2, 6.0))), parts)
+    assert a == b
+    view = renderer.render("TDPL", a)
+    assert renderer.render("TDPL", b) is view
+    assert renderer.cache_info().hits == 1
+    assert [row["점수"] for row in view.chart_spec["data"]["values"]] == [1.0, 9.99, 4.2, 6.0]
+
+
+def test_different_scores_miss_but_share_type_fragments(qn):
+    renderer = render.ResultRenderer(qn.type_details)
+    first = renderer.render("TDPL", (1.0, 9.99, 4.2, 6.0))
+    second = renderer.render("TDPL", (1.0, 9.98, 4.2, 6.0))
+    assert second is not first
+    assert renderer.cache_info().misses == 2
+    assert second.card_html is first.card_html and second.people_html is first.people_html
+
+
+def test_warm_fills_one_entry_per_type(qn):
+    renderer = render.ResultRenderer(qn.type_details)
+    renderer.warm()
+    assert len(qn.type_details) == 16
+    assert renderer.cache_info().currsize == 16
+    view = renderer.render("CGSM", None)
+    assert view.chart_spec is None
+    assert renderer.cache_info().hits == 1
+
+
+def test_cache_is_bounded(qn):
+    renderer = render.ResultRenderer(qn.type_details, maxsize=4)
+    for i in range(10):
+        renderer.render("TDPL", (i / 10, 0.0, 0.0, 0.0))
+    assert renderer.cache_info().currsize == 4
+
+
+def test_unknown_code_falls_back_to_default_type(qn):
+    renderer = render.ResultRenderer(qn.type_details)
+    view = renderer.render("XXXX", None)
+    fallback = qn.type_details[renderer.fallback_code]
+    assert fallback["title"] in view.card_html
+    assert len(view.people_html) == len(fallback["people_data"])
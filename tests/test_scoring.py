@@ -0,0 +1,96 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cbti import scoring
+from cbti.content_store import default_store
+
+QN = default_store().current()
+OPTIONS, SCORE_MAP, PARTS_KEY, questions_data = QN.options, QN.score_map, QN.scorer.parts, QN.questions
+
+
+def baseline_score(row):
+    """리팩터링 전 결과 화면의 채점 루프 (답한 문항을 질문 순서대로 더함)"""
+    scores = {k: 0 for k in PARTS_KEY}
+    counts = {k: 0 for k in PARTS_KEY}
+    for q, a in zip(questions_data, row):
+        if a < 0:
+            continue
+        s = SCORE_MAP[OPTIONS[a]]
+        if q["reverse"]:
+            s = 10 - s
+        scores[q["part"]] += s
+        counts[q["part"]] += 1
+    avg = {k: (scores[k] / counts[k] if counts[k] > 0 else 0) for k in PARTS_KEY}
+    res_code = ""
+    res_code += "T" if avg["Theology"] <= 5 else "C"
+    res_code += "D" if avg["Drive"] <= 5 else "G"
+    res_code += "P" if avg["Society"] <= 5 else "S"
+    res_code += "L" if avg["Culture"] <= 5 else "M"
+    return [avg[k] for k in PARTS_KEY], res_code
+
+
+@pytest.fixture(scope="module")
+def responses():
+    rng = np.random.default_rng(0)
+    answers = rng.integers(0, len(OPTIONS), size=(50_000, len(questions_data)), dtype=np.int8)
+    # 일부는 미응답, 일부는 한 파트 전체 미응답
+    answers[rng.random(answers.shape) < 0.05] = scoring.UNANSWERED
+    answers[:100, :5] = scoring.UNANSWERED
+    return answers
+
+
+def test_matches_baseline_loop_bit_for_bit(responses):
+    result = scoring.default_scorer().score(responses)
+    for row, averages, code in zip(responses.tolist(), result.averages, result.codes):
+        expected_avg, expected_code = baseline_score(row)
+        assert averages.tolist() == expected_avg
+        assert code == expected_code
+
+
+def test_session_answer_sheet_matches_index_array(responses):
+    row = responses[7]
+    sheet = scoring.new_answer_sheet()
+    for i, a in enumerate(row.tolist()):
+        if a >= 0:
+            sheet[i] = a
+    avg, code = scoring.score_one(sheet)
+    expected_avg, expected_code = baseline_score(row.tolist())
+    assert [avg[k] for k in PARTS_KEY] == expected_avg
+    assert code == expected_code
+
+
+def test_rejects_wrong_length():
+    with pytest.raises(ValueError):
+        scoring.score([0] * (len(questions_data) - 1))
+
+
+def test_encode_labels_mixed_values_without_warnings():
+    n = len(questions_data)
+    row = [OPTIONS[0], "2", None, "모름", 3, " 1 ", "2.0", 2.5, "-"] + [OPTIONS[3]] * (n - 9)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        encoded = scoring.default_scorer().encode_labels([row])
+    assert encoded[0, :9].tolist() == [0, 2, -1, -1, 3, 1, 2, -1, -1]
+    assert (encoded[0, 9:] == 3).all()
+
+
+def test_encode_labels_numeric_frame():
+    n = len(questions_data)
+    frame = pd.DataFrame([[1.0, np.nan, 7] + [0] * (n - 3)])
+    assert scoring.default_scorer().encode_labels(frame)[0, :3].tolist() == [1, -1, -1]
+
+
+def test_score_file_csv_roundtrip(tmp_path, responses):
+    n = len(questions_data)
+    frame = pd.DataFrame(responses[:200], columns=[f"q{i + 1}" for i in range(n)])
+    frame = frame.replace(scoring.UNANSWERED, np.nan)
+    frame.insert(0, "id", range(200))
+    frame.to_csv(tmp_path / "in.csv", index=False)
+    assert scoring.score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), chunksize=64) == 200
+    out = pd.read_csv(tmp_path / "out.csv")
+    expected = [baseline_score(row)[1] for row in responses[:200].tolist()]
+    assert out["id"].tolist() == list(range(200))
+    assert out["res_code"].tolist() == expected
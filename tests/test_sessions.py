@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from cbti import sessions
+
+KEYS = ("content_version", "step", "block", "answers")
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def session_state():
+    return {"content_version": "abc123", "step": 2, "block": 3, "answers": bytearray([0, 3, 0xFF, 1]),
+            "unrelated": object()}
+
+
+def test_dump_and_load_state_round_trip():
+    raw = sessions.dump_state(session_state(), KEYS)
+    restored = sessions.load_state(raw)
+    assert restored == {k: v for k, v in session_state().items() if k in KEYS}
+    assert isinstance(restored["answers"], bytearray)
+    assert sessions.load_state(sessions.dump_state({"scores": {1: 2.5, -1: 0}}, ["scores"])) == \
+        {"scores": {1: 2.5, -1: 0}}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def local_store(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        store = sessions.MemoryStore(ttl=60, clock=clock)
+    else:
+        store = sessions.SQLiteStore(str(tmp_path / "sessions.sqlite3"), ttl=60, clock=clock)
+    yield store, clock
+    store.close()
+
+
+def test_save_resume_and_expire(local_store):
+    store, clock = local_store
+    token = sessions.new_token()
+    raw = sessions.dump_state(session_state(), KEYS)
+    assert store.load(token) is None
+
+    store.save(token, raw)
+    clock.now += 59
+    assert sessions.load_state(store.load(token))["answers"] == session_state()["answers"]
+
+    store.save(token, raw)  # 저장할 때마다 만료가 연장된다
+    clock.now += 59
+    assert store.load(token) == raw
+
+    clock.now += 2
+    assert store.load(token) is None
+
+
+def test_delete(local_store):
+    store, _ = local_store
+    store.save("t", "{}")
+    store.delete("t")
+    assert store.load("t") is None
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    clock = FakeClock()
+    a = sessions.SQLiteStore(path, ttl=60, clock=clock)
+    b = sessions.SQLiteStore(path, ttl=60, clock=clock)
+    a.save("t", '{"step": 4}')
+    assert b.load("t") == '{"step": 4}'
+    a.close()
+    b.close()
+
+
+def test_sqlite_store_purges_expired_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions, "PURGE_EVERY", 2)
+    clock = FakeClock()
+    store = sessions.SQLiteStore(str(tmp_path / "sessions.sqlite3"), ttl=60, clock=clock)
+    store.save("old", "{}")
+    clock.now += 61
+    store.save("new", "{}")
+    assert store.conn.execute("SELECT token FROM sessions").fetchall() == [("new",)]
+    store.close()
+
+
+def test_redis_store_save_resume_and_expire():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    store = sessions.RedisStore(client, ttl=1, prefix="test:")
+    raw = sessions.dump_state(session_state(), KEYS)
+
+    store.save("t", raw)
+    assert 0 < client.ttl("test:t") <= 1
+    assert store.load("t") == raw
+    assert sessions.load_state(store.load("t"))["step"] == 2
+
+    time.sleep(1.1)
+    assert store.load("t") is None
+
+    store.save("t", raw)
+    store.delete("t")
+    assert store.load("t") is None
+    store.close()
+
+
+def test_make_store(tmp_path):
+    assert isinstance(sessions.make_store(None), sessions.MemoryStore)
+    store = sessions.make_store({"store": "sqlite", "path": str(tmp_path / "s.sqlite3"), "ttl": 5})
+    assert isinstance(store, sessions.SQLiteStore) and store.ttl == 5
+    store.close()
+    with pytest.raises(ValueError):
+        sessions.make_store({"store": "memcached"})
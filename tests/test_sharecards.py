@@ -0,0 +1,53 @@
+import os
+import types
+
+import pytest
+
+from cbti import fonts, sharecards
+from cbti.content_store import default_store
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def card_dir(tmp_path, monkeypatch):
+    """카드를 tmp_path 에 빌드한다. 그림은 빈 카드로 대신하고 (폰트 원본은 저장소에 없음) 사진은 쓰지 않는다."""
+    composed = []
+
+    def compose(code, info, photo_paths, font_path):
+        composed.append(code)
+        return Image.new("RGB", sharecards.CARD_SIZE, sharecards.BG_COLOR)
+
+    monkeypatch.setattr(sharecards, "CARD_DIR", str(tmp_path))
+    monkeypatch.setattr(sharecards, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(sharecards, "compose_card", compose)
+    monkeypatch.setattr(sharecards.assets, "build_all", lambda: {})
+    return tmp_path, composed
+
+
+def questionnaire(type_details, version):
+    return types.SimpleNamespace(type_details=type_details, version=version)
+
+
+def test_only_the_edited_card_is_hidden_and_rebuilt(card_dir):
+    tmp_path, composed = card_dir
+    font = os.path.join(fonts.OUTPUT_DIR, fonts.load_manifest()["faces"][0]["file"])
+    original = dict(default_store().current().type_details)
+    cards = sharecards.build_all(questionnaire(original, "v1"), font_path=font)
+    assert len(cards) == len(composed) == 16
+
+    loaded = sharecards.load_cards(original)
+    assert set(loaded) == set(original)
+    name, data = loaded["CGSM"]
+    assert name.endswith("." + sharecards.DEFAULT_FORMAT) and data[:3] == b"\xff\xd8\xff"
+    assert cards["CGSM"]["og"]["og:image"].endswith(name)
+
+    edited = {**original, "CGSM": {**original["CGSM"], "slogan": "바뀐 슬로건"}}
+    assert set(sharecards.load_cards(edited)) == set(original) - {"CGSM"}
+
+    composed.clear()
+    sharecards.build_all(questionnaire(edited, "v2"), font_path=font)
+    assert composed == ["CGSM"]
+    assert not (tmp_path / name).exists()
+    assert set(sharecards.load_cards(edited)) == set(original)
+    assert set(sharecards.load_cards(original)) == set(original) - {"CGSM"}
@@ -0,0 +1,24 @@
+import numpy as np
+
+from cbti.content_store import default_store
+from cbti.similarity import TypeSimilarity
+
+
+def test_nearest_prototype_is_the_scored_type():
+    qn = default_store().current()
+    rng = np.random.default_rng(0)
+    answers = rng.integers(0, len(qn.options), size=(2000, qn.n_questions))
+    scores = qn.scorer.score(answers)
+    ranking = TypeSimilarity(qn.scorer.code_table).rank(scores.averages, k=2)
+    assert (ranking.codes[:, 0] == scores.codes).all()
+
+
+def test_top2_share_is_the_closest_axis_logistic():
+    sim = TypeSimilarity()
+    averages = np.array([[3, 7, 3, 7], [5.1, 5.1, 5.1, 5.1], [1, 9, 1, 9], [4, 6, 3, 7]], dtype=float)
+    share = sim.rank(averages, k=2).top2_share()
+    margin = np.abs(averages - sim.threshold).min(axis=1)
+    # 두 원형은 가장 경계에 가까운 축 하나만 다르다: 거리 제곱 차이 = 2 * (HIGH - LOW) * margin
+    expected = 1 / (1 + np.exp(-2 * (7.5 - 2.5) * margin / (2 * sim.sigma ** 2)))
+    assert np.allclose(share, expected)
+    assert share[1] < 0.55 < 0.8 < share[0] < share[2]
@@ -0,0 +1,127 @@
+import json
+import random
+
+import pytest
+
+from cbti import stats
+
+CODES = ["TDPL", "TDPM", "CGSM", "CGSL"]
+PARTS = ["Theology", "Drive", "Society", "Culture"]
+
+
+def make_stats(path=None):
+    return stats.PopulationStats(CODES, PARTS, path=str(path) if path else None, save_interval=3600)
+
+
+def random_results(n, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(CODES), {p: rng.uniform(0, 10) for p in PARTS}) for _ in range(n)]
+
+
+def test_percentile_matches_histogram_sum():
+    s = make_stats()
+    for code, avg in random_results(500):
+        s.record(code, avg)
+    for value in [0, 0.05, 2.5, 4.99, 5, 7.3, 9.99, 10]:
+        for p in PARTS:
+            hist = s.histograms[p]
+            b = stats._bin(value)
+            expected = 100.0 * (sum(hist[:b]) + hist[b] / 2) / s.total
+            assert s.percentile(p, value) == pytest.approx(expected)
+
+
+def test_save_merges_counts_from_other_workers(tmp_path):
+    path = tmp_path / "population_stats.json"
+    a, b = make_stats(path), make_stats(path)
+    results = random_results(30)
+    for code, avg in results[:10]:
+        a.record(code, avg)
+    for code, avg in results[10:]:
+        b.record(code, avg)
+    a.save()
+    b.save()
+    a.save()  # 증가분이 없으면 디스크 값을 다시 읽기만 한다
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["total"] == 30
+    assert sum(data["codes"].values()) == 30
+    assert b.total == 30 and a.total == 30
+    assert a.cumulative["Drive"][-1] == 30
+
+    c = make_stats(path)
+    assert c.distribution() == b.distribution()
+    for s in (a, b, c):
+        s.close()
+
+
+def test_failed_save_keeps_pending_counts(tmp_path, monkeypatch):
+    s = make_stats(tmp_path / "population_stats.json")
+    s.record("TDPL", {p: 1.0 for p in PARTS})
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(stats.os, "replace", fail)
+        with pytest.raises(OSError):
+            s.save()
+    assert s._dirty
+    assert s._pending["total"] == 1
+    assert s.total == 1
+
+    s.record("TDPL", {p: 9.0 for p in PARTS})
+    s.save()
+    assert not s._dirty
+    with open(s.path, encoding="utf-8") as f:
+        assert json.load(f)["codes"]["TDPL"] == 2
+    s.close()
+
+
+@pytest.mark.parametrize("content", [
+    '{"bins": 100, "total": 7, "codes": {"TDP',
+    '{"bins": 50, "total": 7}',
+    "[1, 2, 3]",
+    '{"bins": 100, "total": 7, "codes": {}, "histograms": {"Drive": [1, 2]}}',
+])
+def test_unreadable_file_is_set_aside_not_overwritten(tmp_path, content, caplog):
+    path = tmp_path / "population_stats.json"
+    path.write_text(content, encoding="utf-8")
+    s = make_stats(path)
+    assert s.total == 0
+    s.record("TDPL", {p: 1.0 for p in PARTS})
+    s.save()
+
+    corrupt = list(tmp_path.glob("population_stats.json.*.corrupt"))
+    assert len(corrupt) == 1 and corrupt[0].read_text(encoding="utf-8") == content
+    assert str(corrupt[0]) in caplog.text
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["total"] == 1
+    s.close()
+
+
+def test_read_error_keeps_file_and_pending_counts(tmp_path, monkeypatch):
+    path = tmp_path / "population_stats.json"
+    s = make_stats(path)
+    s.record("TDPL", {p: 1.0 for p in PARTS})
+    s.save()
+    s.record("CGSM", {p: 9.0 for p in PARTS})
+
+    def fail(file, *args, **kwargs):
+        if file == str(path):
+            raise OSError("I/O error")
+        return open(file, *args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(stats, "open", fail, raising=False)
+        with pytest.raises(OSError):
+            s.save()
+        s._load()
+    assert s._dirty and s._pending["total"] == 1
+    assert s.total == 2
+    assert not list(tmp_path.glob("*.corrupt"))
+
+    s.save()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["codes"] == {"TDPL": 1, "TDPM": 0, "CGSM": 1, "CGSL": 0}
+    s.close()